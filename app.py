@@ -1,6 +1,5 @@
 import streamlit as st
 import os
-import tempfile
 import pandas as pd
 from streamlit_lottie import st_lottie
 from streamlit_mic_recorder import mic_recorder
@@ -20,9 +19,9 @@ st.set_page_config(page_title="AI Career Prep Platform", page_icon="🚀", layou
 API_KEY = config.Config.get_api_key()
 
 # Initialize Handlers
-llm = LLMHandler(API_KEY)
-voice = VoiceHandler()
 db = DBHandler()
+llm = LLMHandler(API_KEY, db=db)
+voice = VoiceHandler()
 
 # Custom CSS
 # Custom CSS - Premium UI
@@ -112,16 +111,6 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def save_uploaded_file(uploaded_file):
-    try:
-        suffix = os.path.splitext(uploaded_file.name)[1]
-        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
-            return tmp_file.name
-    except Exception as e:
-        st.error(f"Error saving file: {e}")
-        return None
-
 # --- UI SECTIONS ---
 
 def render_dashboard():
@@ -237,7 +226,12 @@ def render_interview_mode(mode="Standard"):
                         st.session_state.questions = llm.generate_questions(st.session_state.resume_text, role, "Medium")
                     else:
                         qgen = QuestionGenerator(st.session_state.parsed_resume)
-                        st.session_state.questions = qgen.generate_all_questions("Medium")
+                        rid = st.session_state.get('resume_id')
+                        # Skip questions this candidate was asked in earlier sessions
+                        st.session_state.questions = qgen.sample("Medium", config.Config.OFFLINE_QUESTION_COUNT,
+                                                                 exclude=lambda q: llm.asked.is_duplicate(rid, q))
+                        for q in st.session_state.questions:
+                            llm.asked.add(rid, q['question'])
             st.rerun()
             
     # --- INTERVIEW LOOP ---
@@ -304,7 +298,8 @@ def render_interview_mode(mode="Standard"):
                         st.session_state.session_id, 
                         st.session_state.get('role', 'General'), 
                         "Medium", q_text, ans, feedback, rating, 
-                        q_item.get('type', mode)
+                        q_item.get('type', mode),
+                        candidate_id=st.session_state.get('resume_id')
                     )
                     
                     # Save to Session
@@ -351,10 +346,10 @@ def main():
         # File Upload Logic Here (Global)
         uploaded_file = st.file_uploader("📂 Update Resume", type=["pdf", "txt"])
         if uploaded_file:
-            path = save_uploaded_file(uploaded_file)
-            parser = ResumeParser(path)
+            parser = ResumeParser.load(uploaded_file.getvalue(), uploaded_file.name)
             st.session_state.parsed_resume = parser.parse()
             st.session_state.resume_text = parser.text
+            st.session_state.resume_id, _ = llm.build_resume_digest(parser.text, st.session_state.parsed_resume)
             st.session_state.role = parser.extract_role_based_info()
             
             # Quick Score
@@ -362,7 +357,8 @@ def main():
             st.session_state.resume_score = analysis['score']
             st.session_state.resume_feedback = analysis['feedback']
             st.success("Resume Loaded!")
-            os.unlink(path)
+            for warning in parser.warnings:
+                st.warning(warning)
 
     # Main Router
     if mode == "Dashboard":
@@ -1,10 +1,11 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
 import shutil
 import os
+import asyncio
 import sys
 from dotenv import load_dotenv
 
@@ -12,11 +13,12 @@ load_dotenv()
 
 # Add parent directory to path to import existing modules
 sys.path.append("..") 
-from resume_parser import ResumeParser
-from llm_handler import LLMHandler
+from llm_handler import AsyncLLMHandler
 from config import Config
 from db_handler import DBHandler
 from voice_handler import VoiceHandler
+from metrics import REGISTRY, CONTENT_TYPE, observe_request
+from uploads import parse_upload, read_upload
 
 app = FastAPI(title="AI Interview Assistant API")
 
@@ -28,12 +30,20 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.middleware("http")(observe_request)
 
 # Initialize Handlers
 API_KEY = Config.get_api_key()
-llm = LLMHandler(API_KEY)
-db = DBHandler()
+db = DBHandler(pool_size=Config.DB_POOL_SIZE, cache_kb=Config.DB_CACHE_KB)
+llm = AsyncLLMHandler(API_KEY, db=db)
 voice_handler = VoiceHandler()
+llm.register_metrics(REGISTRY)
+REGISTRY.register_collector("db_pool", db.stats)
+
+@app.on_event("shutdown")
+async def shutdown():
+    await llm.aclose()
+    db.close()
 
 # Models
 class QuestionRequest(BaseModel):
@@ -57,6 +67,7 @@ class NextQuestionRequest(BaseModel):
     resume_text: str
     history: List[Dict[str, Any]]
     last_answer: str
+    session_id: Optional[str] = None
 
 class QuizRequest(BaseModel):
     skills: List[str]
@@ -69,23 +80,24 @@ class ArenaRequest(BaseModel):
 def read_root():
     return {"status": "ok", "message": "AI Interview Assistant Backend Running"}
 
+@app.get("/metrics")
+async def metrics():
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
 @app.post("/api/upload")
 async def upload_resume(file: UploadFile = File(...)):
     print(f"Received file upload: {file.filename}")
+    content = await read_upload(file)
     try:
-        temp_file = f"temp_{file.filename}"
-        with open(temp_file, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        parser = ResumeParser(temp_file)
+        parser, parsed = await asyncio.to_thread(parse_upload, content, file.filename)
         data = {
             "text": parser.text,
-            "skills": parser.extract_skills(),
-            "experience": parser.extract_experience(),
-            "projects": parser.extract_projects()
+            "skills": parsed["skills"],
+            "experience": parsed["experience"],
+            "projects": parsed["projects"],
+            "warnings": parser.warnings
         }
-        
-        os.remove(temp_file)
+        data["resume_id"], _ = await llm.build_resume_digest(parser.text, parsed)
         return {"status": "success", "data": data}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -94,18 +106,18 @@ async def upload_resume(file: UploadFile = File(...)):
 async def generate_questions(req: QuestionRequest):
     if not llm.is_configured():
         raise HTTPException(status_code=500, detail="LLM not configured")
-    questions = llm.generate_questions(req.resume_text, req.role, req.difficulty, req.count)
+    questions = await llm.generate_questions(req.resume_text, req.role, req.difficulty, req.count)
     return {"questions": questions}
 
 @app.post("/api/evaluate")
 async def evaluate_answer(req: AnswerRequest):
     if not llm.is_configured():
         raise HTTPException(status_code=500, detail="LLM not configured")
-    return llm.evaluate_answer(req.question, req.user_answer)
+    return await llm.evaluate_answer(req.question, req.user_answer)
 
 @app.get("/api/dashboard")
 async def get_dashboard():
-    df = db.get_analytics()
+    df = await db.aget_analytics()
     if df.empty: return []
     return df.to_dict(orient="records")
 
@@ -137,7 +149,7 @@ async def start_interview_endpoint(req: StartInterviewRequest):
              "topic": "Introduction",
              "hints": ["Keep it brief"]
          }
-    response = llm.start_interview(req.resume_text, req.role)
+    response = await llm.start_interview(req.resume_text, req.role)
     if not response:
         raise HTTPException(status_code=500, detail="Failed to start interview")
     return response
@@ -146,7 +158,7 @@ async def start_interview_endpoint(req: StartInterviewRequest):
 async def next_question_endpoint(req: NextQuestionRequest):
     if not llm.is_configured():
         raise HTTPException(status_code=500, detail="LLM not configured")
-    response = llm.continue_interview(req.resume_text, req.history, req.last_answer)
+    response = await llm.continue_interview(req.resume_text, req.history, req.last_answer, req.session_id)
     if not response:
         raise HTTPException(status_code=500, detail="Failed to continue interview")
     return response
@@ -155,7 +167,7 @@ async def next_question_endpoint(req: NextQuestionRequest):
 async def generate_quiz_endpoint(req: QuizRequest):
     if not llm.is_configured():
         raise HTTPException(status_code=500, detail="LLM not configured")
-    return {"questions": llm.generate_quiz(req.skills)}
+    return {"questions": await llm.generate_quiz(req.skills)}
 
 class ProblemRequest(BaseModel):
     resume_text: str
@@ -170,10 +182,10 @@ async def generate_problem_endpoint(req: ProblemRequest):
              "difficulty": "Easy", 
              "starter_code": "def two_sum(nums, target): pass"
          }
-    return llm.generate_coding_problem(req.resume_text, req.role)
+    return await llm.generate_coding_problem(req.resume_text, req.role)
 
 @app.post("/api/arena/submit")
 async def submit_arena_code(req: ArenaRequest):
     if not llm.is_configured():
         raise HTTPException(status_code=500, detail="LLM not configured")
-    return llm.review_code(req.problem, req.code)
+    return await llm.review_code(req.problem, req.code)
@@ -1,9 +1,11 @@
 import os
 import sys
-import shutil
 import logging
+import asyncio
+import json
+import time
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import List, Optional
@@ -18,9 +20,16 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 # Import existing logic
 from resume_parser import ResumeParser
 from question_generator import QuestionGenerator
-from llm_handler import LLMHandler
+from llm_handler import AsyncLLMHandler
 from voice_handler import VoiceHandler
 from db_handler import DBHandler # Added
+from question_prefetcher import QuestionPrefetcher
+from question_retriever import QuestionRetriever
+from interaction_log import InteractionLog
+from quiz_bank import QuizBank
+from metrics import REGISTRY, CONTENT_TYPE, observe_request
+from resume_digest import resume_id as content_id
+from uploads import parse_upload, read_upload
 import config
 
 # Setup Logging
@@ -37,45 +46,108 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.middleware("http")(observe_request)
 
-# Initialize Handlers
+# Initialize Handlers (left as None when initialization fails part-way)
+API_KEY = llm = voice = prefetcher = quiz_bank = interaction_log = retriever = None
 try:
     API_KEY = config.Config.get_api_key()
-    llm = LLMHandler(API_KEY)
+    db = getattr(config, 'db', None) or DBHandler(pool_size=config.Config.DB_POOL_SIZE,
+                                                  cache_kb=config.Config.DB_CACHE_KB)
+    llm = AsyncLLMHandler(API_KEY, db=db)
     voice = VoiceHandler()
-    db = getattr(config, 'db', None) or DBHandler()
+    prefetcher = QuestionPrefetcher(llm) if config.Config.SPECULATIVE_PREFETCH else None
+    quiz_bank = QuizBank(
+        db, llm,
+        seed_skills=config.Config.QUIZ_BANK_SEED_SKILLS,
+        low_water=config.Config.QUIZ_BANK_LOW_WATER,
+        high_water=config.Config.QUIZ_BANK_HIGH_WATER,
+        max_skills=config.Config.QUIZ_BANK_MAX_SKILLS,
+        interval_s=config.Config.QUIZ_BANK_REFILL_INTERVAL_S
+    ) if config.Config.QUIZ_BANK_ENABLED else None
+    interaction_log = InteractionLog(db, batch_size=config.Config.INTERACTION_BATCH_SIZE,
+                                     flush_interval_s=config.Config.INTERACTION_FLUSH_INTERVAL_S,
+                                     max_queue=config.Config.INTERACTION_QUEUE_MAX)
+    retriever = QuestionRetriever(db, min_rating=config.Config.RETRIEVAL_MIN_RATING,
+                                  refresh_s=config.Config.RETRIEVAL_REFRESH_S)
+    llm.register_metrics(REGISTRY)
+    REGISTRY.register_collector("question_retrieval", retriever.stats)
+    REGISTRY.register_collector("db_pool", db.stats)
+    REGISTRY.register_collector("interaction_log", interaction_log.stats)
+    if prefetcher:
+        REGISTRY.register_collector("prefetch", prefetcher.stats)
+    if quiz_bank:
+        REGISTRY.register_collector("quiz_bank", quiz_bank.stats)
 except Exception as e:
     logger.error(f"Failed to initialize handlers: {e}")
+    # Nothing built on a half-initialized LLM handler is used; endpoints take their no-API-key paths
+    API_KEY = llm = prefetcher = quiz_bank = retriever = None
     db = DBHandler()
+    # Endpoints that only record or read interactions keep working
+    interaction_log = InteractionLog(db)
+
+@app.on_event("startup")
+async def startup():
+    if interaction_log:
+        interaction_log.start()
+    if quiz_bank:
+        quiz_bank.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Late evaluations and queued interactions are written before the process exits
+    if _background_tasks:
+        await asyncio.wait(set(_background_tasks), timeout=config.Config.LLM_TIMEOUT_S)
+    if interaction_log:
+        await interaction_log.stop()
+    if quiz_bank:
+        await quiz_bank.stop()
+    if llm:
+        await llm.aclose()
+    db.close()
 
 # Models
 class InterviewStartRequest(BaseModel):
-    resume_text: str
+    resume_text: str = ""
+    resume_id: Optional[str] = None
     role: str
+    session_id: Optional[str] = None
 
 class InterviewNextRequest(BaseModel):
-    resume_text: str
+    resume_text: str = ""
+    resume_id: Optional[str] = None
     history: List[dict]
     last_answer: str
     skipped: Optional[bool] = False
+    session_id: Optional[str] = None
 
 class ArenaProblemRequest(BaseModel):
-    resume_text: str
+    resume_text: str = ""
+    resume_id: Optional[str] = None
     role: str
 
 class ArenaSubmitRequest(BaseModel):
     problem: str
     code: str
 
-class QuizRequest(BaseModel):
-    skills: List[str]
-
 # Helpers
 import uuid
 SESSION_ID = str(uuid.uuid4()) # Simple session tracking for this run
 
 class QuizRequest(BaseModel):
     skills: List[str]
+    session_id: Optional[str] = None
+    resume_id: Optional[str] = None
+
+async def _resolve_resume(req):
+    """Clients may send the `resume_id` returned by /api/upload instead of the full resume text."""
+    if not req.resume_text and req.resume_id:
+        req.resume_text = (await asyncio.to_thread(llm.digests.text, req.resume_id) if llm else None) or ""
+        if not req.resume_text:
+            raise HTTPException(status_code=404, detail="Unknown resume_id; upload the resume again")
+    if req.resume_text and not req.resume_id:
+        # The resume id doubles as the candidate id for question history
+        req.resume_id = content_id(req.resume_text)
 
 # Endpoints
 
@@ -83,8 +155,12 @@ class QuizRequest(BaseModel):
 async def generate_quiz(req: QuizRequest):
     try:
         if API_KEY:
-            # Dynamic Generation
-            quiz_questions = llm.generate_quiz(req.skills)
+            # Served from the pre-generated bank; live generation only when it runs dry
+            if quiz_bank:
+                # Without a session id, the candidate (resume) is the unit of "no repeats"
+                quiz_questions = await quiz_bank.get_quiz(req.skills, session_id=req.session_id or req.resume_id)
+            else:
+                quiz_questions = await llm.generate_quiz(req.skills)
             return {"questions": quiz_questions}
         else:
             raise HTTPException(status_code=400, detail="API_KEY required for dynamic quiz")
@@ -94,29 +170,28 @@ async def generate_quiz(req: QuizRequest):
 
 @app.post("/api/upload")
 async def upload_resume(file: UploadFile = File(...)):
+    data = await read_upload(file)
     try:
-        temp_path = f"temp_{file.filename}"
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        parser = ResumeParser(temp_path)
-        parsed_data = parser.parse()
+        # Parsed in memory, off the event loop; no temp file
+        parser, parsed_data = await asyncio.to_thread(parse_upload, data, file.filename)
         text = parser.text
-        
-        # Clean up
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
             
-        # Auto-Detect Role
+        # Auto-Detect Role; the prompt digest is built alongside
         detected_role = "Software Engineer"
+        resume_id = None  # no stored digest: clients send the resume text instead
         if API_KEY:
-             detected_role = llm.detect_role_from_resume(text)
+             detected_role, (resume_id, _) = await asyncio.gather(
+                 llm.detect_role_from_resume(text), llm.build_resume_digest(text, parsed_data))
+        elif llm:
+             resume_id, _ = await llm.build_resume_digest(text, parsed_data)
         
         return {
             "data": {
                 "text": text, 
                 "parsed": parsed_data,
-                "detected_role": detected_role
+                "detected_role": detected_role,
+                "resume_id": resume_id,
+                "warnings": parser.warnings
             }
         }
     except Exception as e:
@@ -125,64 +200,250 @@ async def upload_resume(file: UploadFile = File(...)):
 
 @app.post("/api/interview/start")
 async def start_interview(req: InterviewStartRequest):
+    await _resolve_resume(req)
     try:
         # Generate initial question
+        questions = []
         if API_KEY:
-            questions = llm.generate_questions(req.resume_text, req.role, "Medium")
-            first_q = questions[0] if questions else {"question": "Tell me about yourself.", "type": "Intro", "topic": "General"}
-        else:
-            # Fallback
-            first_q = {"question": "Tell me about yourself.", "type": "Intro", "topic": "General"}
+            try:
+                questions = await asyncio.wait_for(llm.generate_questions(req.resume_text, req.role, "Medium"),
+                                                   config.Config.LLM_FALLBACK_DEADLINE_S)
+            except asyncio.TimeoutError:
+                logger.warning("generate_questions missed its deadline; serving an offline question")
+        # Fallback: a question the candidate has not been asked yet
+        first_q = questions[0] if questions else await asyncio.to_thread(_offline_question, req)
+
+        if prefetcher:
+            key = QuestionPrefetcher.turn_key(req.session_id, req.resume_text, 0)
+            prefetcher.schedule(key, req.resume_text, [], first_q)
             
         return first_q
     except Exception as e:
         logger.error(f"Start error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+FALLBACK_QUESTION = {"question": "Describe a challenging project you worked on.", "type": "Behavioral", "topic": "Project"}
+
+def _offline_question(req, history=(), default: dict = None) -> dict:
+    """
+    Next question without the LLM: the best-matching well-rated question from
+    past interviews, else one from the resume templates, else `default`. Skips
+    questions the candidate was already asked.
+    """
+    default = default or {"question": "Tell me about yourself.", "type": "Intro", "topic": "General"}
+    if not req.resume_text:
+        return default
+    asked = {turn.get("question") for turn in history}
+    exclude = lambda q: q in asked or (llm is not None and llm.asked.is_duplicate(req.resume_id, q))
+    parser = ResumeParser.load(req.resume_text.encode("utf-8"), "resume.txt")
+    question = retriever.retrieve_one(parser.keyword_hits["skills"], "Medium", exclude=exclude) if retriever else None
+    if question is None:
+        questions = QuestionGenerator(parser.parse()).sample("Medium", 1, exclude=exclude)
+        question = questions[0] if questions else default
+    if llm:
+        llm.asked.add(req.resume_id, question["question"])
+    return question
+
+# Shown while a turn's evaluation is still running after its next question was served offline
+PENDING_EVALUATION = {"feedback": "Your answer is still being evaluated; the result will appear in your report.",
+                      "rating": 0, "pending": True}
+
+_background_tasks = set()
+
+def _in_background(coro):
+    task = asyncio.ensure_future(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+async def _save_answer(req, question: str, evaluation: dict):
+    await interaction_log.enqueue(
+        session_id=SESSION_ID,
+        role="Software Engineer",
+        difficulty="Medium",
+        question=question,
+        answer=req.last_answer,
+        feedback=evaluation.get("feedback", ""),
+        rating=evaluation.get("rating", 0),
+        q_type="Interview",
+        candidate_id=req.resume_id
+    )
+
+async def _save_late_evaluation(req, question: str, call):
+    """Saves the answer once the LLM call that missed the deadline has evaluated it (or failed)."""
+    try:
+        result = await call
+    except Exception as e:
+        logger.error(f"Late evaluation error: {e}")
+        result = None
+    await _save_answer(req, question, (result or {}).get("evaluation") or {})
+
+async def _speculative_turn(req: InterviewNextRequest, key: str):
+    """
+    Serves the turn from prefetched follow-ups when they are ready: only the
+    (short) evaluation is on the critical path, and its rating picks the
+    deeper or the pivot follow-up. Returns (answered question, result or None).
+    """
+    question, candidates = prefetcher.take(key)
+    if not candidates:
+        return question, None
+    evaluation = await llm.evaluate_answer(question.get("question", ""), req.last_answer)
+    if not evaluation:
+        return question, None
+    try:
+        rating = float(evaluation.get("rating", 0))
+    except (TypeError, ValueError):
+        rating = 0
+    branch = "deeper" if rating >= config.Config.SPECULATIVE_DEEPER_MIN_RATING else "pivot"
+    next_q = candidates.get(branch) or candidates.get("deeper") or candidates.get("pivot")
+    return question, {"evaluation": evaluation, "next_question": next_q}
+
+@app.get("/api/interview/prefetch/stats")
+async def prefetch_stats():
+    return prefetcher.stats() if prefetcher else {"enabled": False}
+
+@app.get("/metrics")
+async def metrics():
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
+
+@app.get("/api/llm/routes")
+async def llm_routes():
+    return llm.router.stats() if llm else {"enabled": False}
+
 @app.post("/api/interview/next")
 async def next_question(req: InterviewNextRequest):
+    await _resolve_resume(req)
     try:
-        evaluation = {}
+        evaluation = {"feedback": "Skipped or API Error", "rating": 0}
+        turn_key = QuestionPrefetcher.turn_key(req.session_id, req.resume_text, len(req.history))
+        if prefetcher and req.skipped:
+            prefetcher.discard(turn_key)
         if not req.skipped and API_KEY:
-            # Optimized Flow: Single combined call for evaluation + adaptive next question
-            result = llm.continue_interview(req.resume_text, req.history, req.last_answer)
+            started = time.perf_counter()
+            answered, result = (await _speculative_turn(req, turn_key)) if prefetcher else (None, None)
+            hit = result is not None
+            if not hit:
+                # Optimized Flow: Single combined call for evaluation + adaptive next question
+                call = asyncio.ensure_future(
+                    llm.continue_interview(req.resume_text, req.history, req.last_answer, req.session_id))
+                done, _ = await asyncio.wait({call}, timeout=config.Config.LLM_FALLBACK_DEADLINE_S)
+                if done:
+                    result = call.result()
+                else:
+                    # Only the next question falls back; the call keeps running and its evaluation is saved
+                    logger.warning("continue_interview missed its deadline; serving an offline question")
+                    question = req.history[-1]['question'] if req.history else "Intro"
+                    _in_background(_save_late_evaluation(req, question, call))
+                    evaluation = PENDING_EVALUATION
+            if prefetcher:
+                prefetcher.record_latency(hit, (time.perf_counter() - started) * 1000)
             
             if result:
                 evaluation = result.get("evaluation", {})
                 next_q = result.get("next_question", None)
+                question = answered.get("question") if answered else (req.history[-1]['question'] if req.history else "Intro")
+
+                if hit and next_q:
+                    # Prefetched follow-ups bypass continue_interview, which records asked questions itself
+                    await asyncio.to_thread(llm.asked.add, req.resume_id, next_q.get("question", ""))
+                if prefetcher and next_q:
+                    turn = {"question": question, "answer": req.last_answer, "feedback": evaluation}
+                    prefetcher.schedule(QuestionPrefetcher.turn_key(req.session_id, req.resume_text, len(req.history) + 1),
+                                        req.resume_text, req.history + [turn], next_q)
                 
                 # Save to DB
-                db.save_interaction(
-                    session_id=SESSION_ID,
-                    role="Software Engineer",
-                    difficulty="Medium",
-                    question=req.history[-1]['question'] if req.history else "Intro",
-                    answer=req.last_answer,
-                    feedback=evaluation.get("feedback", ""),
-                    rating=evaluation.get("rating", 0),
-                    q_type="Interview"
-                )
+                await _save_answer(req, question, evaluation)
                 
                 return {
                     "evaluation": evaluation,
                     "next_question": next_q
                 }
         
-        # Fallback or Skip Logic
-        # ... existing fallback code if needed, but for now we rely on continue_interview
-        
+        # Fallback or Skip Logic: a retrieved question instead of waiting on the LLM
         return {
-            "evaluation": {"feedback": "Skipped or API Error", "rating": 0},
-            "next_question": {"question": "Describe a challenging project you worked on.", "type": "Behavioral", "topic": "Project"}
+            "evaluation": evaluation,
+            "next_question": await asyncio.to_thread(_offline_question, req, req.history, FALLBACK_QUESTION)
         }
     except Exception as e:
         logger.error(f"Next error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@app.post("/api/interview/next/stream")
+async def next_question_stream(req: InterviewNextRequest):
+    """
+    Server-Sent-Events variant of /api/interview/next. Emits an `evaluation`
+    event and a `next_question` event as soon as each is generated, then a
+    `done` event carrying time-to-first-field and total latency in ms. When
+    the LLM has not produced the next question by LLM_FALLBACK_DEADLINE_S, an
+    offline question is sent instead and the evaluation follows when ready.
+    """
+    await _resolve_resume(req)
+    async def events():
+        started = time.perf_counter()
+        first_field_ms = None
+        evaluation, next_q, offline = {}, None, False
+        if not req.skipped and API_KEY:
+            fields = asyncio.Queue()
+
+            async def produce():
+                try:
+                    async for item in llm.stream_continue_interview(req.resume_text, req.history, req.last_answer, req.session_id):
+                        await fields.put(item)
+                except Exception as e:
+                    logger.error(f"Stream error: {e}")
+                finally:
+                    await fields.put(None)
+
+            producer = asyncio.ensure_future(produce())
+            deadline = started + config.Config.LLM_FALLBACK_DEADLINE_S
+            try:
+                while not (offline and evaluation):
+                    try:
+                        item = await asyncio.wait_for(
+                            fields.get(), None if next_q else max(0.0, deadline - time.perf_counter()))
+                    except asyncio.TimeoutError:
+                        logger.warning("Streamed next question missed its deadline; serving an offline question")
+                        next_q, offline = await asyncio.to_thread(_offline_question, req, req.history, FALLBACK_QUESTION), True
+                        yield _sse("next_question", next_q)
+                        continue
+                    if item is None:
+                        break
+                    field, value = item
+                    if first_field_ms is None:
+                        first_field_ms = (time.perf_counter() - started) * 1000
+                    if field == "evaluation":
+                        evaluation = value
+                    elif field == "next_question":
+                        if offline:
+                            continue
+                        next_q = value
+                    yield _sse(field, value)
+            finally:
+                # Once an offline question went out, the rest of the completion is not needed
+                producer.cancel()
+        if evaluation or offline:
+            # After a missed deadline the answer is saved even if its evaluation failed, as /next does
+            await _save_answer(req, req.history[-1]['question'] if req.history else "Intro", evaluation)
+        if not evaluation:
+            yield _sse("evaluation", {"feedback": "Skipped or API Error", "rating": 0})
+        if not next_q:
+            yield _sse("next_question", await asyncio.to_thread(_offline_question, req, req.history, FALLBACK_QUESTION))
+
+        yield _sse("done", {
+            "first_field_ms": round(first_field_ms, 1) if first_field_ms is not None else None,
+            "total_ms": round((time.perf_counter() - started) * 1000, 1)
+        })
+
+    return StreamingResponse(events(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
 @app.get("/api/dashboard")
 async def get_dashboard_stats():
     try:
-        df = db.get_analytics()
+        await interaction_log.flush()
+        df = await db.aget_analytics()
         if df.empty:
             return []
         
@@ -229,16 +490,17 @@ async def speech_to_text(file: UploadFile = File(...)):
 # Arena Endpoints
 @app.post("/api/arena/problem")
 async def get_arena_problem(req: ArenaProblemRequest):
+    await _resolve_resume(req)
     if API_KEY:
-        return llm.generate_coding_problem(req.resume_text, req.role)
+        return await llm.generate_coding_problem(req.resume_text, req.role)
     raise HTTPException(status_code=400, detail="API_KEY required")
 
 @app.post("/api/arena/submit")
 async def submit_arena(req: ArenaSubmitRequest):
     if API_KEY:
-        review = llm.review_code(req.problem, req.code)
+        review = await llm.review_code(req.problem, req.code)
         # Save attempt to DB
-        db.save_interaction(
+        await interaction_log.enqueue(
             session_id=SESSION_ID,
             role="Dev",
             difficulty="Hard",
@@ -263,7 +525,7 @@ class LogRequest(BaseModel):
 @app.post("/api/log")
 async def log_interaction(req: LogRequest):
     try:
-        db.save_interaction(
+        await interaction_log.enqueue(
             session_id=SESSION_ID,
             role=req.role,
             difficulty=req.difficulty,
@@ -300,7 +562,8 @@ class PDF(FPDF):
 async def generate_pdf_report():
     try:
         # Fetch Data
-        df = db.get_analytics()
+        await interaction_log.flush()
+        df = await db.aget_analytics()
         if df.empty:
             raise HTTPException(status_code=404, detail="No data found for report")
 
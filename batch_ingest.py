@@ -0,0 +1,231 @@
+"""
+Bulk resume ingestion: extracts and parses every resume under the given
+directories (or listed in manifest files, one path per line) in a process
+pool and appends one JSON record per resume to a JSONL file.
+
+    python batch_ingest.py resumes/ --output parsed.jsonl --workers 8
+    python batch_ingest.py manifest.txt --output parsed.jsonl --parquet parsed.parquet
+
+Re-running with the same --output resumes an interrupted run: files whose
+content hash is already in the output are skipped. Failures go to
+<output>.errors.jsonl and are retried on the next run.
+
+Pool workers are the sandbox: PDFs are extracted in-process (no extra child
+per file), under the PDF_TIMEOUT_S and PDF_MAX_MEMORY_MB limits of the worker.
+"""
+import argparse
+import hashlib
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Set
+
+from config import Config
+from resume_parser import ResumeParser
+
+try:
+    import resource
+except ImportError:  # Windows: no RLIMIT_AS
+    resource = None
+
+RESUME_EXTENSIONS = (".pdf", ".txt")
+
+
+def iter_resume_paths(inputs: List[str]) -> Iterator[str]:
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, files in os.walk(item):
+                for name in sorted(files):
+                    if name.lower().endswith(RESUME_EXTENSIONS):
+                        yield os.path.join(root, name)
+        elif item.lower().endswith(RESUME_EXTENSIONS):
+            yield item
+        else:
+            # Manifest: one path per line, relative to the manifest's directory
+            base = os.path.dirname(os.path.abspath(item))
+            with open(item, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line and not line.startswith("#"):
+                        yield line if os.path.isabs(line) else os.path.join(base, line)
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def processed_hashes(output: str) -> Set[str]:
+    done = set()
+    if not os.path.exists(output):
+        return done
+    with open(output, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                done.add(json.loads(line)["sha256"])
+            except (ValueError, KeyError):
+                continue  # torn last line of an interrupted run
+    return done
+
+
+def init_worker(max_memory_mb: int):
+    """Pool initializer: caps the worker's address space and extracts PDFs without a further child process."""
+    Config.PDF_ISOLATED = False
+    if resource is not None and max_memory_mb:
+        limit = max_memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _timed_out(signum, frame):
+    raise TimeoutError("resume processing timed out")
+
+
+def process_resume(path: str, sha256: str, timeout_s: float = 0) -> Dict[str, Any]:
+    """Runs in a worker process; never raises so one bad file cannot stop the batch."""
+    started = time.perf_counter()
+    alarm = timeout_s and hasattr(signal, "SIGALRM")
+    if alarm:
+        signal.signal(signal.SIGALRM, _timed_out)
+        signal.setitimer(signal.ITIMER_REAL, timeout_s)
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        parser = ResumeParser(data, filename=path)
+        record = {
+            "path": path,
+            "sha256": sha256,
+            "bytes": len(data),
+            "text": parser.text,
+            "parsed": parser.parse(),
+            "quality": parser.analyze_quality(),
+            "warnings": parser.warnings,
+        }
+    except Exception as e:
+        record = {"path": path, "sha256": sha256, "error": f"{type(e).__name__}: {e}"}
+    finally:
+        if alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    record["elapsed_s"] = round(time.perf_counter() - started, 4)
+    return record
+
+
+def export_parquet(jsonl_path: str, parquet_path: str):
+    import pandas as pd
+
+    df = pd.read_json(jsonl_path, lines=True)
+    # Nested fields are kept as JSON strings so any Parquet engine can store them
+    for column in ("parsed", "quality"):
+        if column in df:
+            df[column] = df[column].map(json.dumps)
+    df.to_parquet(parquet_path, index=False)
+
+
+def run(inputs: List[str], output: str, workers: int = None, max_in_flight: int = None,
+        progress_every: int = 100, timeout_s: float = None, max_memory_mb: int = None) -> Dict[str, Any]:
+    errors_path = output + ".errors.jsonl"
+    done = processed_hashes(output)
+    workers = workers or os.cpu_count() or 1
+    max_in_flight = max_in_flight or workers * 4
+    timeout_s = Config.PDF_TIMEOUT_S if timeout_s is None else timeout_s
+    max_memory_mb = Config.PDF_MAX_MEMORY_MB if max_memory_mb is None else max_memory_mb
+
+    stats = {"seen": 0, "skipped": 0, "processed": 0, "failed": 0, "bytes": 0}
+    failures = []
+    started = time.perf_counter()
+
+    def report(final: bool = False):
+        elapsed = time.perf_counter() - started
+        rate = stats["processed"] / elapsed if elapsed else 0.0
+        mb_s = stats["bytes"] / 1e6 / elapsed if elapsed else 0.0
+        label = "Done" if final else "Progress"
+        print(f"{label}: {stats['processed']} parsed, {stats['failed']} failed, {stats['skipped']} skipped "
+              f"in {elapsed:.1f}s ({rate:.1f} resumes/s, {mb_s:.2f} MB/s)", file=sys.stderr)
+
+    if os.path.exists(output) and os.path.getsize(output):
+        with open(output, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")  # terminate a torn last line before appending
+
+    with open(output, "a", encoding="utf-8") as out, open(errors_path, "w", encoding="utf-8") as errors, \
+            ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(max_memory_mb,)) as pool:
+        pending = set()
+
+        def drain(block_until: int):
+            nonlocal pending
+            while len(pending) > block_until:
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    try:
+                        record = future.result()
+                    except Exception as e:  # worker process died (e.g. killed for memory)
+                        record = {"path": future.path, "sha256": future.sha256, "error": f"{type(e).__name__}: {e}"}
+                    if "error" in record:
+                        stats["failed"] += 1
+                        failures.append(record)
+                        errors.write(json.dumps(record) + "\n")
+                        continue
+                    stats["processed"] += 1
+                    stats["bytes"] += record["bytes"]
+                    out.write(json.dumps(record) + "\n")
+                    if stats["processed"] % progress_every == 0:
+                        out.flush()
+                        report()
+
+        for path in iter_resume_paths(inputs):
+            stats["seen"] += 1
+            try:
+                sha256 = file_sha256(path)
+            except OSError as e:
+                stats["failed"] += 1
+                record = {"path": path, "error": f"{type(e).__name__}: {e}"}
+                failures.append(record)
+                errors.write(json.dumps(record) + "\n")
+                continue
+            if sha256 in done:
+                stats["skipped"] += 1
+                continue
+            done.add(sha256)  # also de-duplicates identical files within this run
+            future = pool.submit(process_resume, path, sha256, timeout_s)
+            future.path, future.sha256 = path, sha256
+            pending.add(future)
+            drain(max_in_flight)
+        drain(0)
+
+    report(final=True)
+    stats["elapsed_s"] = round(time.perf_counter() - started, 3)
+    stats["failures"] = failures
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Parse resumes in bulk into JSONL (and optionally Parquet)")
+    parser.add_argument("inputs", nargs="+", help="resume files, directories or manifest files")
+    parser.add_argument("--output", default="parsed_resumes.jsonl", help="JSONL output; appended to and used to resume")
+    parser.add_argument("--parquet", help="also export all records in --output to this Parquet file")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--progress-every", type=int, default=100)
+    args = parser.parse_args()
+
+    stats = run(args.inputs, args.output, workers=args.workers, progress_every=args.progress_every)
+    for failure in stats["failures"][:20]:
+        print(f"  FAILED {failure['path']}: {failure['error']}", file=sys.stderr)
+    if len(stats["failures"]) > 20:
+        print(f"  ... {len(stats['failures']) - 20} more in {args.output}.errors.jsonl", file=sys.stderr)
+    if args.parquet:
+        try:
+            export_parquet(args.output, args.parquet)
+            print(f"Wrote {args.parquet}", file=sys.stderr)
+        except ImportError:
+            print(f"Parquet export needs pyarrow or fastparquet; records are in {args.output}", file=sys.stderr)
+    sys.exit(1 if stats["failed"] else 0)
+
+
+if __name__ == "__main__":
+    main()
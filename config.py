@@ -14,6 +14,155 @@ class Config:
     
     # Defaults
     DEFAULT_MODEL = "llama-3.3-70b-versatile"
+    FAST_MODEL = os.getenv("FAST_MODEL", "llama-3.1-8b-instant")
+
+    # Per-task model routing. `tier` is the primary model; with a `fallback`
+    # tier the router downgrades when the primary's p95 latency exceeds
+    # `p95_budget_ms` or a call's estimated cost exceeds `cost_budget_usd`.
+    MODEL_TIERS = {"large": DEFAULT_MODEL, "fast": FAST_MODEL}
+    MODEL_ROUTES = {
+        "start_interview": {"tier": "large", "fallback": "fast", "p95_budget_ms": 4000},
+        "continue_interview": {"tier": "large", "fallback": "fast", "p95_budget_ms": 6000},
+        "generate_questions": {"tier": "large", "fallback": "fast", "p95_budget_ms": 5000},
+        "evaluate_answer": {"tier": "large", "fallback": "fast", "p95_budget_ms": 4000},
+        "review_code": {"tier": "large", "fallback": "fast", "p95_budget_ms": 8000, "cost_budget_usd": 0.005},
+        "analyze_jd_gap": {"tier": "large", "fallback": "fast", "p95_budget_ms": 8000},
+        "analyze_star": {"tier": "fast"},
+        "detect_role": {"tier": "fast"},
+        "summarize_resume": {"tier": "large", "fallback": "fast", "p95_budget_ms": 8000},
+        "generate_quiz": {"tier": "fast"},
+        "refill_quiz": {"tier": "fast"},
+        "generate_coding_problem": {"tier": "large", "fallback": "fast", "p95_budget_ms": 8000},
+        "generate_follow_ups": {"tier": "fast"},
+    }
+    # Blended USD per 1M tokens
+    MODEL_PRICES = {DEFAULT_MODEL: 0.69, FAST_MODEL: 0.065}
+    MODEL_ROUTER_WINDOW = int(os.getenv("MODEL_ROUTER_WINDOW", "100"))
+    MODEL_ROUTER_MIN_SAMPLES = int(os.getenv("MODEL_ROUTER_MIN_SAMPLES", "20"))
+    MODEL_ROUTER_RECOVERY_S = float(os.getenv("MODEL_ROUTER_RECOVERY_S", "60"))
+
+    # Async LLM client (shared connection pool + in-flight request limit)
+    GROQ_BASE_URL = os.getenv("GROQ_BASE_URL")  # e.g. a local mock LLM for benchmarking
+    LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+    LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "64"))
+    LLM_TIMEOUT_S = float(os.getenv("LLM_TIMEOUT_S", "60"))
+    # Record/replay of raw completions for offline, deterministic runs: "record", "replay" or unset
+    LLM_CASSETTE_MODE = os.getenv("LLM_CASSETTE_MODE", "")
+    LLM_CASSETTE_PATH = os.getenv("LLM_CASSETTE_PATH", "cassettes/llm.jsonl")
+
+    # Response cache (in-memory LRU + SQLite) in front of LLMHandler._generate_json
+    LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "1") == "1"
+    LLM_CACHE_DB = os.getenv("LLM_CACHE_DB", "llm_cache.db")
+    LLM_CACHE_TTL_S = float(os.getenv("LLM_CACHE_TTL_S", str(7 * 24 * 3600)))
+    LLM_CACHE_MEMORY_ITEMS = int(os.getenv("LLM_CACHE_MEMORY_ITEMS", "512"))
+    LLM_CACHE_DISK_ITEMS = int(os.getenv("LLM_CACHE_DISK_ITEMS", "20000"))
+    # Question-generating tasks always ask the model by default: a replayed question
+    # would be a repeat (see QuestionIndex). Set to 1 to cache them as well.
+    LLM_CACHE_QUESTIONS = os.getenv("LLM_CACHE_QUESTIONS", "0") == "1"
+    LLM_CACHE_TASKS = {
+        "generate_questions": LLM_CACHE_QUESTIONS,
+        "start_interview": LLM_CACHE_QUESTIONS,
+        "continue_interview": LLM_CACHE_QUESTIONS,
+        "generate_quiz": LLM_CACHE_QUESTIONS,
+        "generate_coding_problem": LLM_CACHE_QUESTIONS,
+        "generate_follow_ups": LLM_CACHE_QUESTIONS,
+        "evaluate_answer": True,
+        "review_code": True,
+        "analyze_jd_gap": True,
+        "analyze_star": True,
+        "detect_role": True,
+        "summarize_resume": True,
+    }
+
+    # continue_interview history compaction
+    HISTORY_KEEP_TURNS = int(os.getenv("HISTORY_KEEP_TURNS", "4"))
+    HISTORY_TOKEN_BUDGET = int(os.getenv("HISTORY_TOKEN_BUDGET", "1500"))
+    HISTORY_MAX_SESSIONS = int(os.getenv("HISTORY_MAX_SESSIONS", "1000"))
+
+    # Resume uploads are read into memory in chunks; larger bodies get 413
+    MAX_UPLOAD_BYTES = int(os.getenv("MAX_UPLOAD_BYTES", str(5 * 1024 * 1024)))
+    UPLOAD_CHUNK_BYTES = 64 * 1024
+
+    # Limits for PDF text extraction (see pdf_extractor.PDFExtractor)
+    PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", "20"))
+    PDF_TIMEOUT_S = float(os.getenv("PDF_TIMEOUT_S", "10"))
+    PDF_MAX_MEMORY_MB = int(os.getenv("PDF_MAX_MEMORY_MB", "512"))
+    PDF_FAST_LAYOUT = os.getenv("PDF_FAST_LAYOUT", "1") == "1"
+    PDF_ISOLATED = os.getenv("PDF_ISOLATED", "1") == "1"
+
+    # Skill taxonomy data file (names, aliases, categories, parents); edits are picked up without a restart
+    SKILL_TAXONOMY_PATH = os.getenv("SKILL_TAXONOMY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skill_taxonomy.json"))
+    SKILL_TAXONOMY_CHECK_S = float(os.getenv("SKILL_TAXONOMY_CHECK_S", "5"))
+
+    # Estimated similarity (0-1) above which a question counts as already asked to the candidate
+    QUESTION_DEDUP_THRESHOLD = float(os.getenv("QUESTION_DEDUP_THRESHOLD", "0.5"))
+    # Candidates whose asked-question history is kept in memory (LRU; evicted ones reload from the DB)
+    QUESTION_DEDUP_MAX_CANDIDATES = int(os.getenv("QUESTION_DEDUP_MAX_CANDIDATES", "1000"))
+
+    # SQLite (interview.db): pooled connections per process, page cache per connection
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "4"))
+    DB_CACHE_KB = int(os.getenv("DB_CACHE_KB", "8192"))
+    # Interactions are written in batches of this size, or this long after the first is queued
+    INTERACTION_BATCH_SIZE = int(os.getenv("INTERACTION_BATCH_SIZE", "50"))
+    INTERACTION_FLUSH_INTERVAL_S = float(os.getenv("INTERACTION_FLUSH_INTERVAL_S", "1.0"))
+    INTERACTION_QUEUE_MAX = int(os.getenv("INTERACTION_QUEUE_MAX", "5000"))
+
+    # Offline fallback: well-rated past questions are served when the LLM has not produced the next
+    # question by this deadline. It only bounds the candidate's wait: the LLM call is not cancelled
+    # (it may still queue for LLM_QUEUE_TIMEOUT_S and retry), and its evaluation is saved when it lands
+    LLM_FALLBACK_DEADLINE_S = float(os.getenv("LLM_FALLBACK_DEADLINE_S", "8"))
+    RETRIEVAL_MIN_RATING = int(os.getenv("RETRIEVAL_MIN_RATING", "7"))
+    RETRIEVAL_REFRESH_S = float(os.getenv("RETRIEVAL_REFRESH_S", "30"))
+
+    # Questions drawn from QuestionGenerator when no LLM is available
+    OFFLINE_QUESTION_COUNT = int(os.getenv("OFFLINE_QUESTION_COUNT", "10"))
+
+    # Parsed resumes kept in memory, keyed by file content hash
+    RESUME_PARSE_CACHE_ITEMS = int(os.getenv("RESUME_PARSE_CACHE_ITEMS", "64"))
+
+    # Resume digest sent in place of raw resume text in every prompt
+    RESUME_DIGEST_TOKEN_BUDGET = int(os.getenv("RESUME_DIGEST_TOKEN_BUDGET", "500"))
+    RESUME_DIGEST_MAX_ITEMS = int(os.getenv("RESUME_DIGEST_MAX_ITEMS", "256"))
+
+    # Speculative prefetch of follow-up questions while the candidate answers
+    SPECULATIVE_PREFETCH = os.getenv("SPECULATIVE_PREFETCH", "0") == "1"
+    SPECULATIVE_DEEPER_MIN_RATING = int(os.getenv("SPECULATIVE_DEEPER_MIN_RATING", "6"))
+
+    # Pre-generated quiz question bank
+    QUIZ_BANK_ENABLED = os.getenv("QUIZ_BANK_ENABLED", "1") == "1"
+    QUIZ_BANK_LOW_WATER = int(os.getenv("QUIZ_BANK_LOW_WATER", "10"))
+    QUIZ_BANK_HIGH_WATER = int(os.getenv("QUIZ_BANK_HIGH_WATER", "30"))
+    QUIZ_BANK_MAX_SKILLS = int(os.getenv("QUIZ_BANK_MAX_SKILLS", "20"))
+    QUIZ_BANK_REFILL_INTERVAL_S = float(os.getenv("QUIZ_BANK_REFILL_INTERVAL_S", "60"))
+    # Opt-in: skills to pre-fill at startup (e.g. "python,sql,docker"); otherwise only requested skills are pooled
+    QUIZ_BANK_SEED_SKILLS = [s.strip() for s in os.getenv("QUIZ_BANK_SEED_SKILLS", "").split(",") if s.strip()]
+
+    # LLM call scheduler: quota (0 = unlimited), priorities, retries, circuit breaker
+    LLM_RPM = float(os.getenv("LLM_RPM", "0"))
+    LLM_TPM = float(os.getenv("LLM_TPM", "0"))
+    LLM_EXPECTED_COMPLETION_TOKENS = int(os.getenv("LLM_EXPECTED_COMPLETION_TOKENS", "400"))
+    LLM_QUEUE_TIMEOUT_S = float(os.getenv("LLM_QUEUE_TIMEOUT_S", "30"))
+    LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+    LLM_RETRY_BASE_S = float(os.getenv("LLM_RETRY_BASE_S", "0.5"))
+    LLM_RETRY_MAX_S = float(os.getenv("LLM_RETRY_MAX_S", "8"))
+    LLM_BREAKER_THRESHOLD = int(os.getenv("LLM_BREAKER_THRESHOLD", "5"))
+    LLM_BREAKER_COOLDOWN_S = float(os.getenv("LLM_BREAKER_COOLDOWN_S", "30"))
+    # Lower number = served first when quota is scarce
+    LLM_TASK_PRIORITY = {
+        "start_interview": 0,
+        "continue_interview": 0,
+        "generate_questions": 0,
+        "evaluate_answer": 0,
+        "detect_role": 1,
+        "summarize_resume": 1,
+        "review_code": 1,
+        "analyze_star": 1,
+        "analyze_jd_gap": 1,
+        "generate_quiz": 2,
+        "generate_coding_problem": 2,
+        "generate_follow_ups": 2,
+        "refill_quiz": 3,
+    }
     
     @staticmethod
     def get_api_key():
@@ -1,16 +1,96 @@
+"""
+SQLite storage for interactions, the quiz bank and resume digests.
+
+Benchmark (concurrent insert/read throughput against per-call connections):
+
+    python db_handler.py --threads 8
+"""
+import asyncio
 import sqlite3
+import json
 import datetime
+import queue
+import threading
+from contextlib import contextmanager
 import pandas as pd
 
 class DBHandler:
-    def __init__(self, db_name="interview.db"):
+    """
+    SQLite access for the app. Connections come from a pool shared by all
+    threads instead of being opened per call; the database runs in WAL mode,
+    so reads do not wait for a writer and a commit needs no extra fsync of a
+    rollback journal. Each connection keeps its prepared statements cached.
+    The `a`-prefixed methods run their blocking counterparts in a worker
+    thread for use from async code.
+    """
+    def __init__(self, db_name="interview.db", pool_size=4, cache_kb=8192, busy_timeout_s=5.0):
         self.db_name = db_name
+        # Every connection to ":memory:" would be a separate database
+        self.pool_size = 1 if db_name == ":memory:" else max(1, pool_size)
+        self.cache_kb = cache_kb
+        self.busy_timeout_s = busy_timeout_s
+        self._pool = queue.LifoQueue()
+        self._opened = 0
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.waits = 0
         self.init_db()
 
+    def _connect(self):
+        conn = sqlite3.connect(self.db_name, timeout=self.busy_timeout_s, check_same_thread=False,
+                               cached_statements=128)
+        # NORMAL is durable in WAL mode except for the last commits on power loss
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA cache_size=-{int(self.cache_kb)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    def _acquire(self):
+        try:
+            return self._pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._opened < self.pool_size:
+                self._opened += 1
+                return self._connect()
+            self.waits += 1
+        return self._pool.get()
+
+    @contextmanager
+    def connection(self):
+        """A pooled connection; the block runs in one transaction, committed on success."""
+        conn = self._acquire()
+        with self._lock:
+            self.checkouts += 1
+        try:
+            with conn:
+                yield conn
+        finally:
+            self._pool.put(conn)
+
+    def close(self):
+        """Closes idle pooled connections."""
+        while True:
+            try:
+                conn = self._pool.get_nowait()
+            except queue.Empty:
+                return
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+    def stats(self):
+        return {"connections": self._opened, "idle": self._pool.qsize(), "checkouts": self.checkouts, "waits": self.waits}
+
     def init_db(self):
         """Initialize the SQLite database with tables."""
-        conn = sqlite3.connect(self.db_name)
-        c = conn.cursor()
+        with self.connection() as conn:
+            # Persistent: stored in the database file, so set once here
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._create_tables(conn.cursor())
+
+    def _create_tables(self, c):
         
         # Interactions Table (tracks every Q&A)
         c.execute('''
@@ -24,32 +104,256 @@ class DBHandler:
                 answer TEXT,
                 feedback TEXT,
                 rating INTEGER,
-                type TEXT
+                type TEXT,
+                candidate_id TEXT
             )
         ''')
-        conn.commit()
-        conn.close()
+        # Databases created before candidate_id existed
+        columns = [row[1] for row in c.execute("PRAGMA table_info(interactions)")]
+        if "candidate_id" not in columns:
+            c.execute("ALTER TABLE interactions ADD COLUMN candidate_id TEXT")
+        c.execute("CREATE INDEX IF NOT EXISTS idx_interactions_candidate ON interactions(candidate_id)")
+
+        # Quiz Question Bank (pre-generated MCQs per skill)
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS quiz_questions (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                skill TEXT,
+                question TEXT,
+                options TEXT,
+                correct_answer TEXT,
+                explanation TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE(skill, question)
+            )
+        ''')
+        c.execute("CREATE INDEX IF NOT EXISTS idx_quiz_skill ON quiz_questions(skill)")
 
-    def save_interaction(self, session_id, role, difficulty, question, answer, feedback, rating, q_type="General"):
-        """Save a single interaction result."""
+        # Resume digests keyed by content hash (see resume_digest.py); keeps the raw resume text indefinitely
+        c.execute('''
+            CREATE TABLE IF NOT EXISTS resume_digests (
+                resume_id TEXT PRIMARY KEY,
+                resume_text TEXT,
+                digest TEXT,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+
+    _INSERT_INTERACTION = '''
+        INSERT INTO interactions (session_id, role, difficulty, question, answer, feedback, rating, type, candidate_id)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    '''
+
+    @staticmethod
+    def _interaction_row(session_id, role, difficulty, question, answer, feedback, rating, q_type="General",
+                         candidate_id=None):
+        return (str(session_id), role, difficulty, question, answer, feedback, rating, q_type, candidate_id)
+
+    def save_interaction(self, session_id, role, difficulty, question, answer, feedback, rating, q_type="General",
+                         candidate_id=None):
+        """Save a single interaction result. `candidate_id` (the resume id) links a candidate's sessions."""
         try:
-            conn = sqlite3.connect(self.db_name)
-            c = conn.cursor()
-            c.execute('''
-                INSERT INTO interactions (session_id, role, difficulty, question, answer, feedback, rating, type)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (str(session_id), role, difficulty, question, answer, feedback, rating, q_type))
-            conn.commit()
-            conn.close()
+            with self.connection() as conn:
+                conn.execute(self._INSERT_INTERACTION, self._interaction_row(
+                    session_id, role, difficulty, question, answer, feedback, rating, q_type, candidate_id))
         except Exception as e:
             print(f"DB Error: {e}")
 
+    def save_interactions(self, records):
+        """Save many interactions (dicts of save_interaction arguments) in one transaction. Returns how many."""
+        try:
+            rows = [self._interaction_row(**record) for record in records]
+            with self.connection() as conn:
+                conn.executemany(self._INSERT_INTERACTION, rows)
+            return len(rows)
+        except Exception as e:
+            print(f"DB Error: {e}")
+            return 0
+
+    async def asave_interaction(self, *args, **kwargs):
+        await asyncio.to_thread(self.save_interaction, *args, **kwargs)
+
     def get_analytics(self):
         """Fetch all data for analytics."""
         try:
-            conn = sqlite3.connect(self.db_name)
-            df = pd.read_sql_query("SELECT * FROM interactions", conn)
-            conn.close()
-            return df
+            with self.connection() as conn:
+                return pd.read_sql_query("SELECT * FROM interactions", conn)
         except Exception:
             return pd.DataFrame()
+
+    async def aget_analytics(self):
+        return await asyncio.to_thread(self.get_analytics)
+
+    def get_asked_questions(self, candidate_id):
+        """Every question already asked to a candidate, oldest first."""
+        try:
+            with self.connection() as conn:
+                rows = conn.execute(
+                    "SELECT question FROM interactions WHERE candidate_id = ? AND question IS NOT NULL ORDER BY id",
+                    (candidate_id,)).fetchall()
+            return [row[0] for row in rows]
+        except Exception as e:
+            print(f"DB Error: {e}")
+            return []
+
+    def get_rated_questions(self, min_rating, types, after_id=0, skip_questions=()):
+        """
+        (id, question, difficulty, type, rating) rows of one of `types`, rated
+        at least `min_rating`, with id > `after_id` and a question not in `skip_questions`.
+        """
+        types, skip_questions = list(types), list(skip_questions)
+        try:
+            with self.connection() as conn:
+                return conn.execute(
+                    "SELECT id, question, difficulty, type, rating FROM interactions "
+                    "WHERE id > ? AND rating >= ? AND question IS NOT NULL "
+                    f"AND type IN ({', '.join('?' * len(types))}) "
+                    f"AND question NOT IN ({', '.join('?' * len(skip_questions))}) ORDER BY id",
+                    (after_id, min_rating, *types, *skip_questions)).fetchall()
+        except Exception as e:
+            print(f"DB Error: {e}")
+            return []
+
+    def add_quiz_questions(self, skill, questions):
+        """Store generated MCQs in the pool for `skill`. Returns how many were new."""
+        try:
+            with self.connection() as conn:
+                cursor = conn.executemany('''
+                    INSERT OR IGNORE INTO quiz_questions (skill, question, options, correct_answer, explanation)
+                    VALUES (?, ?, ?, ?, ?)
+                ''', [(skill.lower(), q.get('question', ''), json.dumps(q.get('options', [])),
+                       q.get('correct_answer', ''), q.get('explanation', ''))
+                      for q in questions if q.get('question')])
+                return cursor.rowcount
+        except Exception as e:
+            print(f"DB Error: {e}")
+            return 0
+
+    def quiz_pool_sizes(self, skills):
+        """Number of pooled MCQs per skill."""
+        sizes = {skill.lower(): 0 for skill in skills}
+        if not sizes:
+            return sizes
+        try:
+            placeholders = ",".join("?" * len(sizes))
+            with self.connection() as conn:
+                rows = conn.execute(
+                    f"SELECT skill, COUNT(*) FROM quiz_questions WHERE skill IN ({placeholders}) GROUP BY skill",
+                    list(sizes)).fetchall()
+            sizes.update(dict(rows))
+        except Exception as e:
+            print(f"DB Error: {e}")
+        return sizes
+
+    def sample_quiz_questions(self, skills, count, exclude_ids=()):
+        """Random MCQs for any of `skills`, skipping ids already served."""
+        skills = [s.lower() for s in skills]
+        if not skills:
+            return []
+        try:
+            exclude_ids = list(exclude_ids)
+            query = f"SELECT id, question, options, correct_answer, explanation FROM quiz_questions WHERE skill IN ({','.join('?' * len(skills))})"
+            if exclude_ids:
+                query += f" AND id NOT IN ({','.join('?' * len(exclude_ids))})"
+            query += " ORDER BY RANDOM() LIMIT ?"
+            with self.connection() as conn:
+                rows = conn.execute(query, skills + exclude_ids + [count]).fetchall()
+            return [{
+                "id": row[0],
+                "question": row[1],
+                "options": json.loads(row[2]),
+                "correct_answer": row[3],
+                "explanation": row[4]
+            } for row in rows]
+        except Exception as e:
+            print(f"DB Error: {e}")
+            return []
+
+    def save_resume_digest(self, resume_id, resume_text, digest):
+        try:
+            with self.connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO resume_digests (resume_id, resume_text, digest) VALUES (?, ?, ?)",
+                    (resume_id, resume_text, json.dumps(digest)))
+        except Exception as e:
+            print(f"DB Error: {e}")
+
+    def get_resume_digest(self, resume_id):
+        """{"text": ..., "digest": {...}} for a stored resume, or None."""
+        try:
+            with self.connection() as conn:
+                row = conn.execute(
+                    "SELECT resume_text, digest FROM resume_digests WHERE resume_id = ?", (resume_id,)).fetchone()
+            return {"text": row[0], "digest": json.loads(row[1])} if row else None
+        except Exception as e:
+            print(f"DB Error: {e}")
+            return None
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import tempfile
+    import time
+
+    parser = argparse.ArgumentParser(description="Benchmark pooled WAL DBHandler against per-call connections")
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=500, help="operations per thread")
+    parser.add_argument("--read-ratio", type=float, default=0.5)
+    args = parser.parse_args()
+
+    def save_per_call(db_name, *row):
+        """save_interaction as it was: a new connection per call, rollback journal."""
+        conn = sqlite3.connect(db_name)
+        conn.execute('''
+            INSERT INTO interactions (session_id, role, difficulty, question, answer, feedback, rating, type, candidate_id)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', row)
+        conn.commit()
+        conn.close()
+
+    def read_per_call(db_name, candidate_id):
+        conn = sqlite3.connect(db_name)
+        conn.execute("SELECT question FROM interactions WHERE candidate_id = ? AND question IS NOT NULL ORDER BY id",
+                     (candidate_id,)).fetchall()
+        conn.close()
+
+    def run(label, save, read):
+        errors = []
+
+        def worker(n):
+            try:
+                for i in range(args.ops):
+                    candidate = f"c{n}-{i % 20}"
+                    if (i * 7919 % 100) < args.read_ratio * 100:
+                        read(candidate)
+                    else:
+                        save(f"s{n}", "SWE", "Medium", f"Question {i}?", "answer", "feedback", 7, "Interview", candidate)
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(args.threads)]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+        total = args.threads * args.ops
+        print(f"{label:<24} {total / elapsed:8.0f} ops/s  ({elapsed:.2f}s, {len(errors)} errors)")
+        return elapsed
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.db")
+        DBHandler(legacy_path).close()
+        conn = sqlite3.connect(legacy_path)
+        conn.execute("PRAGMA journal_mode=DELETE")
+        conn.close()
+        pooled = DBHandler(os.path.join(tmp, "pooled.db"), pool_size=args.threads)
+
+        print(f"{args.threads} threads x {args.ops} ops, {args.read_ratio:.0%} reads")
+        legacy_s = run("per-call, rollback journal",
+                       lambda *row: save_per_call(legacy_path, *row), lambda c: read_per_call(legacy_path, c))
+        pooled_s = run("pooled, WAL", pooled.save_interaction, pooled.get_asked_questions)
+        print(f"speedup: {legacy_s / pooled_s:.1f}x, pool: {pooled.stats()}")
+        pooled.close()
@@ -95,8 +95,10 @@ export default function InterviewPage() {
             const resumeData = JSON.parse(localStorage.getItem("resumeData") || "{}")
             const apiUrl = process.env.NEXT_PUBLIC_API_URL || "http://127.0.0.1:8000"
 
+            // The server keeps the uploaded resume; send only its id when we have one
             const response = await axios.post(`${apiUrl}/api/interview/next`, {
-                resume_text: resumeData.text,
+                resume_id: resumeData.resume_id,
+                resume_text: resumeData.resume_id ? "" : resumeData.text,
                 history: history,
                 last_answer: userAnswer,
                 skipped: skip
@@ -282,7 +284,9 @@ export default function InterviewPage() {
                                     <motion.div
                                         initial={{ opacity: 0, y: 10 }}
                                         animate={{ opacity: 1, y: 0 }}
-                                        className={`rounded-none p-6 backdrop-blur-md border ${feedback.rating >= 7
+                                        className={`rounded-none p-6 backdrop-blur-md border ${feedback.pending
+                                            ? 'bg-cyan-950/30 border-cyan-500/50'
+                                            : feedback.rating >= 7
                                             ? 'bg-green-950/30 border-green-500/50'
                                             : 'bg-red-950/30 border-red-500/50'
                                             }`}
@@ -292,7 +296,10 @@ export default function InterviewPage() {
                                                 ? <CheckCircle2 className={`w-5 h-5 text-green-400`} />
                                                 : <AlertTriangle className={`w-5 h-5 text-red-400`} />
                                             }
-                                            <span className={`font-bold font-mono ${feedback.rating >= 7 ? 'text-green-400' : 'text-red-400'}`}>ANALYSIS_RESULT (SCORE: {feedback.rating}/10)</span>
+                                            {feedback.pending
+                                                ? <span className="font-bold font-mono text-cyan-400">ANALYSIS_PENDING</span>
+                                                : <span className={`font-bold font-mono ${feedback.rating >= 7 ? 'text-green-400' : 'text-red-400'}`}>ANALYSIS_RESULT (SCORE: {feedback.rating}/10)</span>
+                                            }
                                         </div>
                                         <p className={`text-sm leading-relaxed text-slate-300 font-mono`}>{feedback.feedback}</p>
                                     </motion.div>
@@ -67,7 +67,8 @@ export default function QuizPage() {
 
             try {
                 const apiUrl = process.env.NEXT_PUBLIC_API_URL || "http://127.0.0.1:8000"
-                const response = await axios.post(`${apiUrl}/api/quiz`, { skills })
+                // resume_id keeps pooled questions from repeating across this candidate's quizzes
+                const response = await axios.post(`${apiUrl}/api/quiz`, { skills, resume_id: data.resume_id })
                 // Fallback mock if API returns empty or fails structure
                 const questionsData = response.data.questions
 
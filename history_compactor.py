@@ -0,0 +1,171 @@
+"""
+Rolling per-session compaction of interview history for continue_interview.
+
+Benchmark (prompt size and latency per turn over a 30-turn interview against
+mock_llm_server):
+
+    python history_compactor.py --turns 30
+"""
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List
+
+from text_budget import CHARS_PER_TOKEN, clip, estimate_tokens
+
+
+def _turn_fingerprint(turn: Dict[str, Any]) -> str:
+    return hashlib.sha1(json.dumps(turn, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _clip_fields(value: Any, limit: int) -> Any:
+    """Copy of a turn with every string in it (also nested) clipped to `limit` characters."""
+    if isinstance(value, str):
+        return clip(value, limit)
+    if isinstance(value, dict):
+        return {key: _clip_fields(item, limit) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_clip_fields(item, limit) for item in value]
+    return value
+
+
+def summarize_turn(turn: Dict[str, Any]) -> str:
+    """One compact line per interview turn: question, answer gist and rating."""
+    feedback = turn.get("feedback") or turn.get("evaluation") or {}
+    rating = feedback.get("rating") if isinstance(feedback, dict) else turn.get("rating")
+    line = f"- Q: {clip(turn.get('question'), 100)} | A: {clip(turn.get('answer'), 60)}"
+    if rating is not None:
+        line += f" | rated {rating}/10"
+    return line
+
+
+class _SessionSummary:
+    def __init__(self):
+        self.folded = 0      # number of leading turns folded into `lines`
+        self.tail = None     # fingerprint of the last folded turn
+        self.lines = []
+
+
+class HistoryCompactor:
+    """
+    Keeps interview prompts flat as a session grows: the last `keep_turns`
+    turns are sent verbatim, older turns are folded into a one-line-per-turn
+    summary that is updated incrementally and stored per session, and the
+    whole history block is held under `token_budget` tokens.
+    """
+    def __init__(self, keep_turns: int = 4, token_budget: int = 1500, max_sessions: int = 1000):
+        self.keep_turns = keep_turns
+        self.token_budget = token_budget
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def session_key(resume_text: str, history: List[Dict[str, Any]]) -> str:
+        """Stable per-interview key for clients that do not send a session id."""
+        first = history[0].get("question", "") if history else ""
+        return hashlib.sha1(f"{resume_text}\x00{first}".encode("utf-8")).hexdigest()
+
+    def compact(self, session_id: str, history: List[Dict[str, Any]]) -> str:
+        split = max(len(history) - self.keep_turns, 0)
+        older, recent = history[:split], history[split:]
+        lines = self._fold(session_id, older)
+
+        budget = self.token_budget * CHARS_PER_TOKEN
+        # Recent turns take priority, but always leave up to a quarter of the
+        # budget for the summary; overflowing recent turns are folded as well
+        reserved = min(sum(len(line) + 1 for line in lines), budget // 4)
+        recent_str = json.dumps(recent)
+        while len(recent) > 1 and len(recent_str) > budget - reserved:
+            lines = lines + [summarize_turn(recent[0])]
+            recent = recent[1:]
+            recent_str = json.dumps(recent)
+            reserved = min(sum(len(line) + 1 for line in lines), budget // 4)
+        # A single oversized turn: shorten its fields (never the JSON text, which must stay valid)
+        limit = 1000
+        while len(recent_str) > budget - reserved and limit >= 16:
+            recent_str = json.dumps(_clip_fields(recent, limit))
+            limit //= 2
+        if len(recent_str) > budget - reserved:
+            lines = lines + [summarize_turn(turn) for turn in recent]
+            recent_str = "[]"
+
+        # Fill what is left (minus room for the section headers) with the newest summary lines
+        remaining = budget - len(recent_str) - 64
+        kept = []
+        for line in reversed(lines):
+            if len(line) + 1 > remaining:
+                break
+            kept.append(line)
+            remaining -= len(line) + 1
+        kept.reverse()
+
+        if not kept:
+            return recent_str
+        omitted = len(lines) - len(kept)
+        header = f"Earlier turns ({omitted} older omitted):" if omitted else "Earlier turns:"
+        return header + "\n" + "\n".join(kept) + "\nRecent turns: " + recent_str
+
+    def forget(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _fold(self, session_id: str, older: List[Dict[str, Any]]) -> List[str]:
+        with self._lock:
+            state = self._sessions.get(session_id)
+            if state is None:
+                state = self._sessions[session_id] = _SessionSummary()
+                while len(self._sessions) > self.max_sessions:
+                    self._sessions.popitem(last=False)
+            self._sessions.move_to_end(session_id)
+
+            # The client owns the history; rebuild if it no longer matches what we folded
+            if state.folded > len(older) or (
+                    state.folded and _turn_fingerprint(older[state.folded - 1]) != state.tail):
+                state.folded, state.tail, state.lines = 0, None, []
+
+            for turn in older[state.folded:]:
+                state.lines.append(summarize_turn(turn))
+            if len(older) > state.folded:
+                state.folded = len(older)
+                state.tail = _turn_fingerprint(older[-1])
+            return list(state.lines)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    from config import Config
+    from llm_handler import LLMHandler
+    from mock_llm_server import create_app, parse_latency, serve_in_thread
+
+    parser = argparse.ArgumentParser(description="Prompt size and latency per continue_interview turn")
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--latency", default="constant:0.05", help="mock LLM time-to-first-token distribution")
+    args = parser.parse_args()
+
+    Config.GROQ_BASE_URL, server = serve_in_thread(create_app(parse_latency(args.latency)))
+    Config.LLM_CACHE_ENABLED = False
+    Config.LLM_CASSETTE_MODE = ""
+    llm = LLMHandler("mock")
+    llm.asked.threshold = 2.0  # the mock asks the same next question every turn; do not regenerate it
+    prompts = []
+    chat = llm._chat
+    llm._chat = lambda prompt, **kwargs: prompts.append(prompt) or chat(prompt, **kwargs)
+
+    resume = "Backend engineer, 6 years. Python, Go, PostgreSQL, Kafka, Kubernetes. " * 20
+    answer = ("I would start by measuring where the time goes, then add a cache in front of the slowest "
+              "query, shard the write path by customer and put the batch jobs on a queue. ") * 4
+    history, question = [], {"question": "Tell me about yourself."}
+    print(f"{'turn':>4} {'prompt chars':>12} {'~tokens':>8} {'raw history chars':>17} {'latency ms':>10}")
+    for turn in range(1, args.turns + 1):
+        started = time.perf_counter()
+        result = llm.continue_interview(resume, history, answer, session_id="benchmark") or {}
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        prompt = prompts[-1]
+        print(f"{turn:>4} {len(prompt):>12} {estimate_tokens(prompt):>8} {len(json.dumps(history)):>17} {elapsed_ms:>10.1f}")
+        history.append({"question": question.get("question"), "answer": answer, "feedback": result.get("evaluation", {})})
+        question = result.get("next_question") or question
+    server.should_exit = True
@@ -0,0 +1,209 @@
+"""
+Write-behind logging of interview interactions.
+
+Endpoints hand a record to `InteractionLog.enqueue` and return without
+waiting for SQLite; a background task writes queued records in batches, one
+transaction (and one commit) per batch instead of one per request.
+
+Benchmark (per-request latency and throughput against inline writes):
+
+    python interaction_log.py --requests 5000
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List
+
+from metrics import INTERACTION_FLUSH_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class InteractionLog:
+    """
+    Queue of pending `DBHandler.save_interaction` records. The writer flushes
+    once `batch_size` records are waiting or `flush_interval_s` after the
+    first one arrived, whichever comes first. When `max_queue` records are
+    pending, `enqueue` waits for the writer to make room (backpressure) rather
+    than dropping records. A batch that fails to write is kept and retried
+    with the next one, up to `max_attempts` writes; then its records are
+    logged and dropped. `stop` writes everything still queued; before `start`
+    and after `stop`, records are written directly.
+    """
+    def __init__(self, db, batch_size: int = 50, flush_interval_s: float = 1.0, max_queue: int = 5000,
+                 max_attempts: int = 3):
+        self.db = db
+        self.batch_size = batch_size
+        self.flush_interval_s = flush_interval_s
+        self.max_attempts = max_attempts
+        self._queue = asyncio.Queue(maxsize=max_queue)
+        self._retry = []                 # records of the last failed write
+        self._attempts = 0               # failed writes of those records so far
+        self._pending = asyncio.Event()  # something is queued
+        self._full = asyncio.Event()     # a whole batch is queued
+        self._lock = asyncio.Lock()      # one batch written at a time
+        self._task = None
+        self._closing = False
+        self.written = 0
+        self.failed = 0
+        self.flushes = 0
+        self.backpressure_waits = 0
+        self.last_flush_ms = 0.0
+
+    def start(self):
+        if self._task is None:
+            self._closing = False
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        """Stops the writer after it has written every queued record."""
+        if self._task is None:
+            return
+        self._closing = True
+        self._pending.set()
+        self._full.set()
+        try:
+            await self._task
+        finally:
+            self._task = None
+
+    async def enqueue(self, **record):
+        """Queues the keyword arguments of one `DBHandler.save_interaction` call."""
+        if self._task is None or self._closing:
+            await asyncio.to_thread(self.db.save_interaction, **record)
+            return
+        if self._queue.full():
+            self.backpressure_waits += 1
+        await self._queue.put(record)
+        self._pending.set()
+        if self._queue.qsize() >= self.batch_size:
+            self._full.set()
+
+    async def flush(self):
+        """Writes everything queued so far, e.g. before reading interactions back."""
+        async with self._lock:
+            while not self._queue.empty():
+                await self._write(self._drain())
+            if self._retry:
+                await self._write([])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queued": self._queue.qsize(),
+            "retrying": len(self._retry),
+            "max_queue": self._queue.maxsize,
+            "written": self.written,
+            "failed": self.failed,
+            "flushes": self.flushes,
+            "backpressure_waits": self.backpressure_waits,
+            "last_flush_ms": self.last_flush_ms,
+        }
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        batch = []
+        while len(batch) < self.batch_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _write(self, batch: List[Dict[str, Any]]):
+        batch, self._retry = self._retry + batch, []
+        if not batch:
+            return
+        started = time.perf_counter()
+        try:
+            written = await asyncio.to_thread(self.db.save_interactions, batch)
+        except Exception as e:
+            logger.error(f"Interaction log write error: {e}")
+            written = 0
+        elapsed = time.perf_counter() - started
+        INTERACTION_FLUSH_SECONDS.observe(elapsed)
+        self.last_flush_ms = round(elapsed * 1000, 2)
+        self.flushes += 1
+        self.written += written
+        if written == len(batch):
+            self._attempts = 0
+            return
+        # save_interactions writes a batch in one transaction: all of it or none
+        self._attempts += 1
+        if self._attempts < self.max_attempts:
+            self._retry = batch
+            logger.warning(f"Interaction log: write of {len(batch)} records failed, will retry")
+            return
+        self._attempts = 0
+        self.failed += len(batch)
+        logger.error(f"Interaction log: dropped {len(batch)} records after {self.max_attempts} failed writes: {batch}")
+
+    async def _run(self):
+        while not (self._closing and self._queue.empty() and not self._retry):
+            await self._pending.wait()
+            if not self._closing and self._queue.qsize() < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._full.wait(), timeout=self.flush_interval_s)
+                except asyncio.TimeoutError:
+                    pass
+            self._full.clear()
+            try:
+                async with self._lock:
+                    batch = self._drain()
+                    await self._write(batch)
+                    # A failed batch keeps the writer awake to retry it after the flush interval
+                    if self._queue.empty() and not self._retry:
+                        self._pending.clear()
+            except Exception as e:
+                logger.error(f"Interaction log flush error: {e}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import statistics
+    import tempfile
+
+    from db_handler import DBHandler
+
+    parser = argparse.ArgumentParser(description="Benchmark InteractionLog against inline save_interaction")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+
+    record = {"session_id": "s", "role": "SWE", "difficulty": "Medium", "question": "Question?", "answer": "answer",
+              "feedback": "feedback", "rating": 7, "q_type": "Interview", "candidate_id": "c"}
+
+    async def load(save):
+        """`concurrency` clients issuing `requests` saves; returns per-call latencies (ms) and total seconds."""
+        latencies, remaining = [], iter(range(args.requests))
+
+        async def client():
+            for _ in remaining:
+                started = time.perf_counter()
+                await save()
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(client() for _ in range(args.concurrency)))
+        return latencies, time.perf_counter() - started
+
+    def report(label, latencies, total_s, rows):
+        latencies.sort()
+        print(f"{label:<16} median {statistics.median(latencies):.3f}ms  p99 {latencies[int(len(latencies) * 0.99) - 1]:.3f}ms  "
+              f"{args.requests / total_s:.0f} req/s  ({rows} rows)")
+
+    async def main():
+        with tempfile.TemporaryDirectory() as tmp:
+            db = DBHandler(os.path.join(tmp, "inline.db"))
+            latencies, total_s = await load(lambda: db.asave_interaction(**record))
+            report("inline", latencies, total_s, len(db.get_analytics()))
+            db.close()
+
+            db = DBHandler(os.path.join(tmp, "queued.db"))
+            log = InteractionLog(db)
+            log.start()
+            latencies, total_s = await load(lambda: log.enqueue(**record))
+            started = time.perf_counter()
+            await log.stop()
+            total_s += time.perf_counter() - started  # count the final flush
+            report("write-behind", latencies, total_s, len(db.get_analytics()))
+            print(log.stats())
+            db.close()
+
+    asyncio.run(main())
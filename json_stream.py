@@ -0,0 +1,88 @@
+import json
+from typing import Any, List, Tuple
+
+
+class IncrementalJSONObjectParser:
+    """
+    Parses a JSON object that arrives in chunks (e.g. a streamed LLM completion)
+    and reports each top-level field as soon as its value is complete.
+
+        parser = IncrementalJSONObjectParser()
+        for chunk in stream:
+            for key, value in parser.feed(chunk):
+                ...
+    """
+    def __init__(self):
+        self._text = ""
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._key = None
+        self._key_start = None
+        self._value_start = None
+        self.done = False
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        self._text += chunk
+        text = self._text
+        fields = []
+        while self._pos < len(text):
+            i = self._pos
+            ch = text[i]
+            self._pos += 1
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == '\\':
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1:
+                        if self._key is None:
+                            self._key = json.loads(text[self._key_start:i + 1])
+                        elif self._value_start is not None and text[self._value_start] == '"':
+                            self._emit(fields, i + 1)
+                continue
+
+            if self._depth == 0:
+                # Ignore anything before the outer object (or after it closes)
+                if ch == '{' and not self.done:
+                    self._depth = 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    if self._key is None:
+                        self._key_start = i
+                    elif self._value_start is None:
+                        self._value_start = i
+            elif ch in '{[':
+                if self._depth == 1 and self._value_start is None:
+                    self._value_start = i
+                self._depth += 1
+            elif ch in '}]':
+                self._depth -= 1
+                if self._depth == 1 and self._value_start is not None:
+                    self._emit(fields, i + 1)
+                elif self._depth == 0:
+                    if self._value_start is not None:
+                        self._emit(fields, i)  # trailing number/literal
+                    self.done = True
+            elif ch == ',' and self._depth == 1:
+                if self._value_start is not None:
+                    self._emit(fields, i)
+            elif self._depth == 1 and self._key is not None and self._value_start is None and ch not in ' \t\r\n:':
+                self._value_start = i
+        return fields
+
+    def _emit(self, fields: List[Tuple[str, Any]], end: int):
+        try:
+            fields.append((self._key, json.loads(self._text[self._value_start:end])))
+        except ValueError:
+            pass  # malformed value: drop it, the caller still gets the other fields
+        self._key = None
+        self._key_start = None
+        self._value_start = None
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+
+def prompt_fingerprint(model: str, prompt: str, temperature: float, system: str = "") -> str:
+    """Content address of a completion request."""
+    payload = json.dumps([model, system, prompt, round(float(temperature), 3)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    Two-tier cache for LLM JSON responses: an in-memory LRU in front of a
+    SQLite table. Both tiers expire entries after `ttl_s` seconds and are
+    bounded by entry count (least recently used entries are evicted first).
+
+    `_lock` guards only the in-memory LRU and counters, and `_db_lock` the
+    SQLite connection, so memory lookups on the event loop never wait
+    behind a disk commit running in a worker thread.
+    """
+    TOUCH_BATCH = 100
+    def __init__(self, db_path: str = "llm_cache.db", ttl_s: float = 7 * 24 * 3600,
+                 memory_items: int = 512, disk_items: int = 20000):
+        self.db_path = db_path
+        self.ttl_s = ttl_s
+        self.memory_items = memory_items
+        self.disk_items = disk_items
+        self._memory = OrderedDict()  # key -> (expires_at, serialized value)
+        self._lock = threading.Lock()     # _memory and the counters
+        self._db_lock = threading.Lock()  # _conn, _touched and _writes_since_prune
+        self._writes_since_prune = 0
+        self._touched = {}  # key -> last disk read not yet written to accessed_at
+        self.hits_memory = 0
+        self.hits_disk = 0
+        self.misses = 0
+        self.sets = 0
+        self._conn = None
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute('''
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT,
+                    expires_at REAL,
+                    accessed_at REAL
+                )
+            ''')
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed_at)")
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[Any]:
+        value = self.get_memory(key)
+        return value if value is not None else self.get_disk(key)
+
+    def get_memory(self, key: str) -> Optional[Any]:
+        """In-memory tier only; a miss here is not counted (the disk tier may still hit)."""
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self.hits_memory += 1
+                    return json.loads(entry[1])
+                del self._memory[key]
+        return None
+
+    def get_disk(self, key: str) -> Optional[Any]:
+        """
+        SQLite tier (blocking; async callers run it in a thread). A read only
+        records the access time in memory; those are written in batches with
+        the next `set_disk` (or every `TOUCH_BATCH` reads), so reads do not commit.
+        """
+        now = time.time()
+        row = None
+        if self._conn is not None:
+            with self._db_lock:
+                row = self._conn.execute(
+                    "SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+                # Expired rows are left for _prune_disk
+                if row is not None and row[1] > now:
+                    self._touched[key] = now
+                    if len(self._touched) >= self.TOUCH_BATCH:
+                        self._write_touches()
+                        self._conn.commit()
+                else:
+                    row = None
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            value, expires_at = row
+            self._remember(key, expires_at, value)
+            self.hits_disk += 1
+        return json.loads(value)
+
+    def set(self, key: str, value: Any):
+        self.set_memory(key, value)
+        self.set_disk(key, value)
+
+    def set_memory(self, key: str, value: Any):
+        serialized = json.dumps(value)
+        with self._lock:
+            self._remember(key, time.time() + self.ttl_s, serialized)
+            self.sets += 1
+
+    def set_disk(self, key: str, value: Any):
+        """SQLite tier (blocking; async callers run it in a thread)."""
+        if self._conn is None:
+            return
+        now = time.time()
+        serialized = json.dumps(value)
+        with self._db_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, serialized, now + self.ttl_s, now))
+            self._touched.pop(key, None)
+            self._write_touches()
+            self._writes_since_prune += 1
+            if self._writes_since_prune >= 100:
+                self._prune_disk(now)
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+        if self._conn is not None:
+            with self._db_lock:
+                self._touched.clear()
+                self._conn.execute("DELETE FROM llm_cache")
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits_memory + self.hits_disk + self.misses
+        return {
+            "hits_memory": self.hits_memory,
+            "hits_disk": self.hits_disk,
+            "misses": self.misses,
+            "sets": self.sets,
+            "memory_items": len(self._memory),
+            "hit_rate": (self.hits_memory + self.hits_disk) / lookups if lookups else 0.0,
+        }
+
+    def _remember(self, key: str, expires_at: float, serialized: str):
+        self._memory[key] = (expires_at, serialized)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_items:
+            self._memory.popitem(last=False)
+
+    def _write_touches(self):
+        # Caller holds the db lock and commits
+        if self._touched:
+            self._conn.executemany("UPDATE llm_cache SET accessed_at = ? WHERE key = ?",
+                                   [(accessed_at, key) for key, accessed_at in self._touched.items()])
+            self._touched.clear()
+
+    def _prune_disk(self, now: float):
+        # Caller holds the db lock
+        self._writes_since_prune = 0
+        self._conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (now,))
+        self._conn.execute('''
+            DELETE FROM llm_cache WHERE key IN (
+                SELECT key FROM llm_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+        ''', (self.disk_items,))
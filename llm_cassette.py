@@ -0,0 +1,60 @@
+import asyncio
+import json
+import os
+import threading
+from typing import Optional
+
+
+class CassetteMissError(Exception):
+    """Replay mode found no recorded response for a request."""
+
+
+class Cassette:
+    """
+    Record/replay store for raw LLM completions, keyed by prompt fingerprint.
+
+    mode="record": real completions are appended to `path` (JSON lines).
+    mode="replay": completions are served from `path`; a request that was
+                   never recorded raises CassetteMissError instead of going
+                   to the network, so replays are deterministic.
+    """
+    def __init__(self, path: str, mode: str = "replay"):
+        if mode not in ("record", "replay"):
+            raise ValueError("Cassette mode must be 'record' or 'replay'")
+        self.path = path
+        self.mode = mode
+        self._entries = {}
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        entry = json.loads(line)
+                        self._entries[entry["key"]] = entry["content"]
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    def replay(self, key: str) -> Optional[str]:
+        """Recorded content for `key` in replay mode; None in record mode."""
+        if not self.replaying:
+            return None
+        try:
+            return self._entries[key]
+        except KeyError:
+            raise CassetteMissError(f"No recorded LLM response for {key[:12]} in {self.path}")
+
+    def record(self, key: str, content: str, task: str = ""):
+        if self.mode != "record":
+            return
+        with self._lock:
+            self._entries[key] = content
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"key": key, "task": task, "content": content}) + "\n")
+
+    async def arecord(self, key: str, content: str, task: str = ""):
+        """`record` with the file append off the event loop."""
+        if self.mode == "record":
+            await asyncio.to_thread(self.record, key, content, task)
@@ -1,27 +1,169 @@
-from groq import Groq
+from groq import Groq, AsyncGroq
+import asyncio
+import httpx
 import json
-from typing import List, Dict, Any
+import logging
+import time
+from types import SimpleNamespace
+from typing import List, Dict, Any, AsyncIterator, Tuple
 from config import Config
+from llm_cache import ResponseCache, prompt_fingerprint
+from json_stream import IncrementalJSONObjectParser
+from single_flight import SingleFlight, AsyncSingleFlight
+from history_compactor import HistoryCompactor
+from text_budget import CHARS_PER_TOKEN, estimate_tokens
+from llm_scheduler import LLMScheduler, CircuitBreaker
+from llm_cassette import Cassette
+from model_router import ModelRouter
+from resume_digest import ResumeDigestStore, build_digest, render_digest, resume_id
+from metrics import LLM_CALL_SECONDS, LLM_QUEUE_SECONDS, LLM_TOKENS, LLM_RESULTS
+from question_dedup import QuestionIndex
+
+logger = logging.getLogger(__name__)
+
+JSON_SYSTEM_PROMPT = "You are a helpful AI assistant that ALWAYS returns valid JSON."
+ROLE_SYSTEM_PROMPT = "You are an expert HR recruiter."
+
+class _CallTimer:
+    """When a request was made and when its latest provider attempt started."""
+    def __init__(self):
+        self.requested = time.perf_counter()
+        self.started = None
+
+    def start(self):
+        # Called right before the provider request, so scheduler queueing, retry
+        # backoff and the concurrency limit are not counted as provider latency
+        self.started = time.perf_counter()
 
 class LLMHandler:
-    def __init__(self, api_key: str):
+    _single_flight = SingleFlight
+
+    def __init__(self, api_key: str, db=None):
         self.api_key = api_key
         if api_key:
-            self.client = Groq(api_key=api_key)
+            self.client = self._make_client(api_key)
             self.model_name = Config.DEFAULT_MODEL # "llama3-70b-8192"
         else:
             self.client = None
+        self.cache = self._make_cache()
+        self.flights = self._single_flight()
+        self.scheduler = self._make_scheduler()
+        self.history = self._make_history_compactor()
+        self.cassette = self._make_cassette()
+        self.router = self._make_router()
+        self.digests = ResumeDigestStore(db, Config.RESUME_DIGEST_MAX_ITEMS)
+        self.asked = QuestionIndex(db, threshold=Config.QUESTION_DEDUP_THRESHOLD,
+                                   max_candidates=Config.QUESTION_DEDUP_MAX_CANDIDATES)
+
+    def _make_client(self, api_key: str):
+        # Retries are owned by the scheduler, not the SDK
+        return Groq(api_key=api_key, base_url=Config.GROQ_BASE_URL, timeout=Config.LLM_TIMEOUT_S, max_retries=0)
+
+    @staticmethod
+    def _make_cassette():
+        if not Config.LLM_CASSETTE_MODE:
+            return None
+        return Cassette(Config.LLM_CASSETTE_PATH, Config.LLM_CASSETTE_MODE)
+
+    @staticmethod
+    def _make_router():
+        return ModelRouter(Config.MODEL_TIERS, Config.MODEL_ROUTES, Config.MODEL_PRICES,
+                           window=Config.MODEL_ROUTER_WINDOW,
+                           min_samples=Config.MODEL_ROUTER_MIN_SAMPLES,
+                           recovery_s=Config.MODEL_ROUTER_RECOVERY_S)
+
+    @staticmethod
+    def _make_cache():
+        if not Config.LLM_CACHE_ENABLED:
+            return None
+        return ResponseCache(Config.LLM_CACHE_DB, ttl_s=Config.LLM_CACHE_TTL_S,
+                             memory_items=Config.LLM_CACHE_MEMORY_ITEMS,
+                             disk_items=Config.LLM_CACHE_DISK_ITEMS)
+
+    @staticmethod
+    def _make_scheduler():
+        return LLMScheduler(
+            rpm=Config.LLM_RPM, tpm=Config.LLM_TPM,
+            priorities=Config.LLM_TASK_PRIORITY,
+            max_retries=Config.LLM_MAX_RETRIES,
+            retry_base_s=Config.LLM_RETRY_BASE_S,
+            retry_max_s=Config.LLM_RETRY_MAX_S,
+            queue_timeout_s=Config.LLM_QUEUE_TIMEOUT_S,
+            breaker=CircuitBreaker(Config.LLM_BREAKER_THRESHOLD, Config.LLM_BREAKER_COOLDOWN_S))
+
+    @staticmethod
+    def _make_history_compactor():
+        return HistoryCompactor(keep_turns=Config.HISTORY_KEEP_TURNS,
+                                token_budget=Config.HISTORY_TOKEN_BUDGET,
+                                max_sessions=Config.HISTORY_MAX_SESSIONS)
 
     def is_configured(self):
         return self.client is not None
 
-    def generate_questions(self, resume_text: str, role: str, difficulty: str, count: int = 3) -> List[Dict[str, Any]]:
-        if not self.is_configured(): return []
-        prompt = f"""
+    def register_metrics(self, registry):
+        """Exports cache, single-flight, scheduler and routing counters on /metrics."""
+        if self.cache is not None:
+            registry.register_collector("llm_cache", self.cache.stats)
+        registry.register_collector("llm_single_flight", self.flights.stats)
+        registry.register_collector("llm_scheduler", self.scheduler.stats)
+        registry.register_collector("llm_router", lambda: {"downgrades": self.router.downgrades})
+        registry.register_collector("question_dedup", self.asked.stats)
+
+    # --- Repeated-question suppression (shared by the sync and async handlers) ---
+
+    def _repeated_next_question(self, rid: str, result: Dict[str, Any]) -> str:
+        """Text of the result's next question if the candidate was already asked something like it, else ""."""
+        question = ((result or {}).get("next_question") or {}).get("question", "")
+        return question if question and self.asked.is_duplicate(rid, question) else ""
+
+    def _with_next_question(self, rid: str, result: Dict[str, Any], retry: Dict[str, Any]) -> Dict[str, Any]:
+        """`result` with the regenerated next question, unless that one is a repeat as well."""
+        if not retry or not retry.get("next_question") or self._repeated_next_question(rid, retry):
+            return result
+        return dict(result, next_question=retry["next_question"])
+
+    def _record_asked(self, rid: str, questions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        for question in questions:
+            self.asked.add(rid, question.get("question", ""))
+        return questions
+
+    # --- Prompt builders (shared by the sync and async handlers) ---
+
+    def _resume_context(self, resume_text: str) -> str:
+        """The stored digest of this resume, or its head when none was built; both within the same token budget."""
+        digest = self.digests.get(resume_id(resume_text))
+        if digest:
+            return render_digest(digest, Config.RESUME_DIGEST_TOKEN_BUDGET)
+        return resume_text[:Config.RESUME_DIGEST_TOKEN_BUDGET * CHARS_PER_TOKEN]
+
+    def _summary_prompt(self, resume_text: str) -> str:
+        return f"""
+        Summarize this resume for an interviewer.
+        Resume: {resume_text[:12000]}
+
+        Return JSON:
+        {{
+            "headline": "<role, seniority, years, core stack in one line>",
+            "summary": "<2-3 sentences>",
+            "key_experience": ["<most relevant positions and achievements, with numbers>"],
+            "projects": ["<notable projects, one line each>"]
+        }}
+        """
+
+    @staticmethod
+    def _avoid_block(avoid: List[str]) -> str:
+        """Prompt lines listing questions the candidate was already asked, for regeneration."""
+        if not avoid:
+            return ""
+        listed = "\n".join(f"        - {question}" for question in avoid)
+        return f"\n        Already asked (do not repeat these or rephrase them):\n{listed}"
+
+    def _questions_prompt(self, resume_text: str, role: str, difficulty: str, count: int, avoid: List[str] = ()) -> str:
+        return f"""
         Act as a professional Interviewer for a {role} position.
         Analyze the following resume text and generate {count} {difficulty}-level interview questions.
-        Resume: {resume_text[:4000]}
-        
+        Resume: {self._resume_context(resume_text)}{self._avoid_block(avoid)}
+
         Return a JSON Object with a key "questions" containing an array of objects.
         Format:
         {{
@@ -30,54 +172,65 @@ class LLMHandler:
             ]
         }}
         """
-        response = self._generate_json(prompt)
-        return response.get("questions", []) if response else []
 
-    def evaluate_answer(self, question: str, user_answer: str) -> Dict[str, Any]:
-        if not self.is_configured(): return {"feedback": "LLM not configured.", "rating": 0}
-        prompt = f"""
+    def _evaluate_prompt(self, question: str, user_answer: str) -> str:
+        return f"""
         Question: "{question}"
         Candidate's Answer: "{user_answer}"
         Evaluate the answer.
         Return JSON: {{ "rating": <0-10>, "feedback": "...", "better_answer": "..." }}
         """
-        return self._generate_json(prompt)
 
-    def start_interview(self, resume_text: str, role: str) -> Dict[str, Any]:
-        if not self.is_configured(): return None
-        prompt = f"""
+    def _start_prompt(self, resume_text: str, role: str) -> str:
+        return f"""
         Act as a {role} Interviewer. Start with an ice-breaker or technical question based on this resume:
-        {resume_text[:2000]}
+        {self._resume_context(resume_text)}
         Return JSON: {{ "question": "...", "type": "Behavioral", "topic": "Intro", "hints": ["..."] }}
         """
-        return self._generate_json(prompt)
 
-    def continue_interview(self, resume_text: str, history: List[Dict], last_answer: str) -> Dict[str, Any]:
-        if not self.is_configured(): return None
-        history_str = json.dumps(history)
-        prompt = f"""
-        Resume: {resume_text[:1000]}
+    def _continue_prompt(self, resume_text: str, history: List[Dict], last_answer: str, session_id: str = None,
+                         avoid: List[str] = ()) -> str:
+        # Older turns are folded into a per-session summary so the prompt stays flat
+        session_id = session_id or self.history.session_key(resume_text, history)
+        history_str = self.history.compact(session_id, history)
+        return f"""
+        Resume: {self._resume_context(resume_text)}
         History: {history_str}
-        Last Answer: {last_answer}
-        
+        Last Answer: {last_answer}{self._avoid_block(avoid)}
+
         1. Evaluate last answer.
         2. Generate NEXT question (adaptive).
-        Return JSON: 
+        Return JSON:
         {{
             "evaluation": {{ "feedback": "...", "rating": 8, "better_answer": "..." }},
             "next_question": {{ "question": "...", "type": "...", "topic": "...", "hints": ["..."] }}
         }}
         """
-        return self._generate_json(prompt)
 
-    def generate_quiz(self, skills: List[str]) -> List[Dict[str, Any]]:
-        if not self.is_configured(): return []
+    def _follow_ups_prompt(self, resume_text: str, history: List[Dict], question: str) -> str:
+        history_str = self.history.compact(self.history.session_key(resume_text, history), history)
+        return f"""
+        Resume: {self._resume_context(resume_text)}
+        History: {history_str}
+        Current Question: {question}
+
+        The candidate is still answering the current question. Prepare the NEXT question for both outcomes:
+        1. "deeper": a harder follow-up if they answer well.
+        2. "pivot": a question on fundamentals if they struggle.
+        Return JSON:
+        {{
+            "deeper": {{ "question": "...", "type": "...", "topic": "...", "hints": ["..."] }},
+            "pivot": {{ "question": "...", "type": "...", "topic": "...", "hints": ["..."] }}
+        }}
+        """
+
+    def _quiz_prompt(self, skills: List[str]) -> str:
         skills_str = ", ".join(skills[:5])
-        prompt = f"""
+        return f"""
         Act as a Senior Technical Interviewer.
         Generate 5 TOUGH, Scenario-based Multiple Choice Questions (MCQ) testing these skills: {skills_str}.
         Focus on: Edge cases, System Design trade-offs, and Debugging scenarios. Avoid usage definitions.
-        
+
         Return JSON Object with key "questions":
         {{
             "questions": [
@@ -90,16 +243,13 @@ class LLMHandler:
             ]
         }}
         """
-        response = self._generate_json(prompt)
-        return response.get("questions", []) if response else []
 
-    def generate_coding_problem(self, resume_text: str, role: str) -> Dict[str, Any]:
-        if not self.is_configured(): return {}
-        prompt = f"""
+    def _coding_problem_prompt(self, resume_text: str, role: str) -> str:
+        return f"""
         Generate a coding interview problem for a {role} candidate based on this resume:
-        {resume_text[:2000]}
-        
-        Return JSON: 
+        {self._resume_context(resume_text)}
+
+        Return JSON:
         {{
             "title": "Problem Title",
             "description": "Detailed problem description...",
@@ -107,78 +257,516 @@ class LLMHandler:
             "starter_code": "def solution():\\n    pass"
         }}
         """
-        return self._generate_json(prompt)
 
-    def review_code(self, problem: str, user_code: str) -> Dict[str, Any]:
-        if not self.is_configured(): return {}
-        prompt = f"""
+    def _review_prompt(self, problem: str, user_code: str) -> str:
+        return f"""
         Review this code for: "{problem}".
         Code: {user_code}
         Return JSON: {{ "is_correct": bool, "rating": int, "feedback": "...", "time_complexity": "...", "optimized_code": "..." }}
         """
-        return self._generate_json(prompt)
 
-    def analyze_jd_gap(self, resume_text: str, jd_text: str) -> Dict[str, Any]:
-        if not self.is_configured(): return {}
-        prompt = f"""
+    def _jd_gap_prompt(self, resume_text: str, jd_text: str) -> str:
+        return f"""
         Compare Resume and JD.
-        Resume: {resume_text[:2000]}
+        Resume: {self._resume_context(resume_text)}
         JD: {jd_text[:2000]}
         Identify 3 gaps and questions.
         Return JSON: {{ "missing_skills": [], "analysis": "...", "questions": [] }}
         """
-        return self._generate_json(prompt)
-    
-    def analyze_star(self, question: str, answer: str) -> Dict[str, Any]:
-        if not self.is_configured(): return {}
-        prompt = f"""
+
+    def _star_prompt(self, question: str, answer: str) -> str:
+        return f"""
         Analyze if answer follows STAR format.
         Question: {question}
         Answer: {answer}
         Return JSON: {{ "star_score": int, "missing_components": [], "feedback": "..." }}
         """
-        return self._generate_json(prompt)
+
+    def _role_prompt(self, resume_text: str) -> str:
+        return f"""
+        Analyze the following resume text and identify the single most appropriate job role title for this candidate.
+        Examples: "Frontend Engineer", "Data Scientist", "DevOps Engineer", "Project Manager", "Python Developer".
+        Return ONLY the role title, nothing else.
+
+        Resume Text:
+        {self._resume_context(resume_text)}
+        """
+
+    @staticmethod
+    def _clean_role(role: str) -> str:
+        # Cleanup if the model returns extra chars
+        return role.strip().split('\n')[0].replace('"', '').strip()
+
+    # --- Public API ---
+
+    def generate_questions(self, resume_text: str, role: str, difficulty: str, count: int = 3) -> List[Dict[str, Any]]:
+        """
+        Questions the candidate has not been asked before. Near-duplicates are
+        regenerated once; those still repeated are dropped, so fewer than `count`
+        questions may come back.
+        """
+        if not self.is_configured(): return []
+        rid = resume_id(resume_text)
+        response = self._generate_json(self._questions_prompt(resume_text, role, difficulty, count), "generate_questions")
+        questions = response.get("questions", []) if response else []
+        kept, repeated = self.asked.filter(rid, questions)
+        if repeated:
+            avoid = [q.get("question", "") for q in repeated]
+            response = self._generate_json(
+                self._questions_prompt(resume_text, role, difficulty, len(repeated), avoid), "generate_questions")
+            kept, _ = self.asked.filter(rid, kept + (response.get("questions", []) if response else []))
+        return self._record_asked(rid, kept[:count])
+
+    def evaluate_answer(self, question: str, user_answer: str) -> Dict[str, Any]:
+        if not self.is_configured(): return {"feedback": "LLM not configured.", "rating": 0}
+        return self._generate_json(self._evaluate_prompt(question, user_answer), "evaluate_answer")
+
+    def start_interview(self, resume_text: str, role: str) -> Dict[str, Any]:
+        if not self.is_configured(): return None
+        return self._generate_json(self._start_prompt(resume_text, role), "start_interview")
+
+    def continue_interview(self, resume_text: str, history: List[Dict], last_answer: str, session_id: str = None) -> Dict[str, Any]:
+        if not self.is_configured(): return None
+        rid = resume_id(resume_text)
+        result = self._generate_json(self._continue_prompt(resume_text, history, last_answer, session_id), "continue_interview")
+        repeated = self._repeated_next_question(rid, result)
+        if repeated:
+            retry = self._generate_json(
+                self._continue_prompt(resume_text, history, last_answer, session_id, [repeated]), "continue_interview")
+            result = self._with_next_question(rid, result, retry)
+        if result and result.get("next_question"):
+            self._record_asked(rid, [result["next_question"]])
+        return result
+
+    def generate_follow_ups(self, resume_text: str, history: List[Dict], question: str) -> Dict[str, Any]:
+        if not self.is_configured(): return {}
+        return self._generate_json(self._follow_ups_prompt(resume_text, history, question), "generate_follow_ups")
+
+    def generate_quiz(self, skills: List[str], fresh: bool = False) -> List[Dict[str, Any]]:
+        """`fresh` bypasses the response cache (used to fill the quiz bank with new questions)."""
+        if not self.is_configured(): return []
+        response = self._generate_json(self._quiz_prompt(skills), "refill_quiz" if fresh else "generate_quiz")
+        return response.get("questions", []) if response else []
+
+    def generate_coding_problem(self, resume_text: str, role: str) -> Dict[str, Any]:
+        if not self.is_configured(): return {}
+        return self._generate_json(self._coding_problem_prompt(resume_text, role), "generate_coding_problem")
+
+    def review_code(self, problem: str, user_code: str) -> Dict[str, Any]:
+        if not self.is_configured(): return {}
+        return self._generate_json(self._review_prompt(problem, user_code), "review_code")
+
+    def analyze_jd_gap(self, resume_text: str, jd_text: str) -> Dict[str, Any]:
+        if not self.is_configured(): return {}
+        return self._generate_json(self._jd_gap_prompt(resume_text, jd_text), "analyze_jd_gap")
+
+    def analyze_star(self, question: str, answer: str) -> Dict[str, Any]:
+        if not self.is_configured(): return {}
+        return self._generate_json(self._star_prompt(question, answer), "analyze_star")
+
+    def summarize_resume(self, resume_text: str) -> Dict[str, Any]:
+        if not self.is_configured(): return {}
+        return self._generate_json(self._summary_prompt(resume_text), "summarize_resume")
+
+    def build_resume_digest(self, resume_text: str, parsed: Dict[str, List[str]]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Computes (once per resume content) the digest used by every prompt in
+        place of raw resume text. Returns (resume id, digest).
+        """
+        rid = resume_id(resume_text)
+        digest = self.digests.get(rid)
+        if digest is None:
+            digest = build_digest(parsed, self.summarize_resume(resume_text))
+            self.digests.put(rid, resume_text, digest)
+        return rid, digest
 
     def detect_role_from_resume(self, resume_text: str) -> str:
         """
         Analyzes the resume text to determine the candidate's primary job role.
         """
         if not self.is_configured(): return "Software Engineer"
-        prompt = f"""
-        Analyze the following resume text and identify the single most appropriate job role title for this candidate.
-        Examples: "Frontend Engineer", "Data Scientist", "DevOps Engineer", "Project Manager", "Python Developer".
-        Return ONLY the role title, nothing else.
+        prompt = self._role_prompt(resume_text)
+        key = self._fingerprint(prompt, ROLE_SYSTEM_PROMPT, 0.1, task="detect_role")
+        cached = self._cache_get(key, "detect_role")
+        if cached is not None:
+            return cached
 
-        Resume Text:
-        {resume_text[:2000]}
+        def detect():
+            role = self._clean_role(self._chat(prompt, system=ROLE_SYSTEM_PROMPT, temperature=0.1, json_mode=False, task="detect_role"))
+            self._cache_store(key, "detect_role", role)
+            return role
+        try:
+            return self.flights.do(key, detect)
+        except Exception as e:
+            logger.error(f"Role detection error: {e}")
+            return "Software Engineer"
+
+    # --- Transport ---
+
+    def _completion_kwargs(self, prompt: str, system: str, temperature: float, json_mode: bool, model: str) -> Dict[str, Any]:
+        kwargs = {
+            "messages": [
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ],
+            "model": model,
+            "temperature": temperature,
+        }
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+        return kwargs
+
+    @staticmethod
+    def _estimate_cost(prompt: str, system: str) -> int:
+        # Tokens charged against the TPM bucket: prompt plus a typical completion
+        return estimate_tokens(system) + estimate_tokens(prompt) + Config.LLM_EXPECTED_COMPLETION_TOKENS
+
+    def _record_call(self, task: str, model: str, timer: _CallTimer, usage=None, error: bool = False):
+        """Feeds the provider time of one call into the router statistics and the metrics registry."""
+        now = time.perf_counter()
+        if timer.started is None:
+            # Never reached the provider (queue timeout, open circuit): all of it was waiting
+            LLM_QUEUE_SECONDS.observe(now - timer.requested, task)
+            return
+        LLM_QUEUE_SECONDS.observe(timer.started - timer.requested, task)
+        elapsed_s = now - timer.started
+        LLM_CALL_SECONDS.observe(elapsed_s, task, model, "error" if error else "ok")
+        total = 0
+        if usage is not None:
+            prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+            completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+            LLM_TOKENS.inc(task, model, "prompt", amount=prompt_tokens)
+            LLM_TOKENS.inc(task, model, "completion", amount=completion_tokens)
+            total = prompt_tokens + completion_tokens
+        self.router.record(task, model, elapsed_s * 1000, total, error=error)
+
+    def _replay(self, prompt: str, system: str, temperature: float, task: str):
+        """Returns (cassette key, recorded content or None)."""
+        if self.cassette is None:
+            return None, None
+        key = self._fingerprint(prompt, system, temperature, task)
+        return key, self.cassette.replay(key)
+
+    def _chat(self, prompt: str, system: str = JSON_SYSTEM_PROMPT, temperature: float = 0.7, json_mode: bool = True, task: str = "default") -> str:
+        cassette_key, replayed = self._replay(prompt, system, temperature, task)
+        if replayed is not None:
+            return replayed
+        cost = self._estimate_cost(prompt, system)
+        model = self.router.pick(task, cost)
+        kwargs = self._completion_kwargs(prompt, system, temperature, json_mode, model)
+        timer = _CallTimer()
+
+        def send():
+            timer.start()
+            return self.client.chat.completions.create(**kwargs)
+        try:
+            completion = self.scheduler.call(task, cost, send)
+        except Exception:
+            self._record_call(task, model, timer, error=True)
+            raise
+        self._record_call(task, model, timer, getattr(completion, "usage", None))
+        content = completion.choices[0].message.content
+        if self.cassette is not None:
+            self.cassette.record(cassette_key, content, task)
+        return content
+
+    def _fingerprint(self, prompt: str, system: str = JSON_SYSTEM_PROMPT, temperature: float = 0.7, task: str = "default") -> str:
+        # Keyed on the route's primary model so temporary downgrades keep cache keys stable
+        return prompt_fingerprint(self.router.primary_model(task), prompt, temperature, system)
+
+    def _cache_get(self, key: str, task: str) -> Any:
+        if self.cache is None or not Config.LLM_CACHE_TASKS.get(task, False):
+            return None
+        return self.cache.get(key)
+
+    def _cache_store(self, key: str, task: str, value: Any):
+        # Empty results are usually API errors; never pin them in the cache
+        if value and self.cache is not None and Config.LLM_CACHE_TASKS.get(task, False):
+            self.cache.set(key, value)
+
+    def _generate_json(self, prompt: str, task: str = "default") -> Any:
+        key = self._fingerprint(prompt, task=task)
+        cached = self._cache_get(key, task)
+        if cached is not None:
+            LLM_RESULTS.inc(task, "cache_hit")
+            return cached
+        try:
+            # Identical prompts already in flight share a single completion
+            result = self.flights.do(key, lambda: self._complete_json(prompt, key, task))
+        except json.JSONDecodeError as e:
+            LLM_RESULTS.inc(task, "parse_error")
+            logger.error(f"Groq API Error: invalid JSON: {e}")
+            return {}
+        except Exception as e:
+            LLM_RESULTS.inc(task, "error")
+            logger.error(f"Groq API Error: {e}")
+            return {}
+        LLM_RESULTS.inc(task, "ok" if result else "empty")
+        return result
+
+    def _complete_json(self, prompt: str, key: str, task: str) -> Any:
+        result = json.loads(self._chat(prompt, task=task))
+        self._cache_store(key, task, result)
+        return result
+
+
+class AsyncLLMHandler(LLMHandler):
+    """
+    Non-blocking variant of LLMHandler for the FastAPI backends.
+    Every public method is a coroutine. All calls share one pooled HTTP
+    connection and at most `max_concurrency` completions are in flight at once.
+    """
+    _single_flight = AsyncSingleFlight
+
+    def __init__(self, api_key: str, max_concurrency: int = None, db=None):
+        self._http = None
+        self._semaphore = asyncio.Semaphore(max_concurrency or Config.LLM_MAX_CONCURRENCY)
+        super().__init__(api_key, db=db)
+
+    def _make_client(self, api_key: str):
+        self._http = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=Config.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=Config.LLM_MAX_CONNECTIONS,
+            ),
+            timeout=Config.LLM_TIMEOUT_S,
+        )
+        return AsyncGroq(api_key=api_key, base_url=Config.GROQ_BASE_URL, http_client=self._http, max_retries=0)
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+
+    async def _acache_get(self, key: str, task: str) -> Any:
+        """_cache_get with the SQLite tier read in a worker thread."""
+        if self.cache is None or not Config.LLM_CACHE_TASKS.get(task, False):
+            return None
+        value = self.cache.get_memory(key)
+        if value is None:
+            value = await asyncio.to_thread(self.cache.get_disk, key)
+        return value
+
+    async def _acache_store(self, key: str, task: str, value: Any):
+        if value and self.cache is not None and Config.LLM_CACHE_TASKS.get(task, False):
+            self.cache.set_memory(key, value)
+            await asyncio.to_thread(self.cache.set_disk, key, value)
+
+    async def _aload_digest(self, resume_text: str) -> str:
+        """Loads the resume's digest off the event loop, so `_resume_context` reads it from memory."""
+        rid = resume_id(resume_text)
+        await self.digests.aget(rid)
+        return rid
+
+    async def generate_questions(self, resume_text: str, role: str, difficulty: str, count: int = 3) -> List[Dict[str, Any]]:
+        """See LLMHandler.generate_questions; repeats are never returned."""
+        if not self.is_configured(): return []
+        rid = await self._aload_digest(resume_text)
+        response = await self._generate_json(self._questions_prompt(resume_text, role, difficulty, count), "generate_questions")
+        questions = response.get("questions", []) if response else []
+        # The first lookup for a candidate loads their history from the DB
+        kept, repeated = await asyncio.to_thread(self.asked.filter, rid, questions)
+        if repeated:
+            avoid = [q.get("question", "") for q in repeated]
+            response = await self._generate_json(
+                self._questions_prompt(resume_text, role, difficulty, len(repeated), avoid), "generate_questions")
+            kept, _ = await asyncio.to_thread(
+                self.asked.filter, rid, kept + (response.get("questions", []) if response else []))
+        return await asyncio.to_thread(self._record_asked, rid, kept[:count])
+
+    async def evaluate_answer(self, question: str, user_answer: str) -> Dict[str, Any]:
+        if not self.is_configured(): return {"feedback": "LLM not configured.", "rating": 0}
+        return await self._generate_json(self._evaluate_prompt(question, user_answer), "evaluate_answer")
+
+    async def start_interview(self, resume_text: str, role: str) -> Dict[str, Any]:
+        if not self.is_configured(): return None
+        await self._aload_digest(resume_text)
+        return await self._generate_json(self._start_prompt(resume_text, role), "start_interview")
+
+    async def continue_interview(self, resume_text: str, history: List[Dict], last_answer: str, session_id: str = None) -> Dict[str, Any]:
+        if not self.is_configured(): return None
+        rid = await self._aload_digest(resume_text)
+        result = await self._generate_json(self._continue_prompt(resume_text, history, last_answer, session_id), "continue_interview")
+        repeated = await asyncio.to_thread(self._repeated_next_question, rid, result)
+        if repeated:
+            retry = await self._generate_json(
+                self._continue_prompt(resume_text, history, last_answer, session_id, [repeated]), "continue_interview")
+            result = await asyncio.to_thread(self._with_next_question, rid, result, retry)
+        if result and result.get("next_question"):
+            await asyncio.to_thread(self._record_asked, rid, [result["next_question"]])
+        return result
+
+    async def stream_continue_interview(self, resume_text: str, history: List[Dict], last_answer: str, session_id: str = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Streaming variant of continue_interview: yields ("evaluation", {...}) and
+        ("next_question", {...}) as soon as each field of the completion is complete.
         """
+        if not self.is_configured(): return
+        rid = await self._aload_digest(resume_text)
+        prompt = self._continue_prompt(resume_text, history, last_answer, session_id)
+        key = self._fingerprint(prompt, task="continue_interview")
+        cached = await self._acache_get(key, "continue_interview")
+        if cached is not None:
+            LLM_RESULTS.inc("continue_interview", "cache_hit")
+            for field, value in cached.items():
+                yield field, value
+            return
+        parser = IncrementalJSONObjectParser()
+        result = {}
         try:
-            role = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": "You are an expert HR recruiter."},
-                    {"role": "user", "content": prompt}
-                ],
-                model="llama-3.3-70b-versatile",
-                temperature=0.1,
-            ).choices[0].message.content.strip()
-            # Cleanup if the model returns extra chars
-            return role.split('\n')[0].replace('"', '').strip()
+            async for chunk in self._chat_stream(prompt, task="continue_interview"):
+                for field, value in parser.feed(chunk):
+                    result[field] = value
+                    yield field, value
+        except Exception:
+            LLM_RESULTS.inc("continue_interview", "error")
+            raise
+        if result.get("next_question"):
+            # Already streamed, so it cannot be regenerated; record it so later questions avoid it
+            await asyncio.to_thread(self._record_asked, rid, [result["next_question"]])
+        # A truncated or malformed completion is not cached: continue_interview would serve it on a hit
+        if not (result.get("evaluation") and result.get("next_question")):
+            LLM_RESULTS.inc("continue_interview", "empty" if parser.done else "parse_error")
+            return
+        LLM_RESULTS.inc("continue_interview", "ok")
+        await self._acache_store(key, "continue_interview", result)
+
+    async def generate_follow_ups(self, resume_text: str, history: List[Dict], question: str) -> Dict[str, Any]:
+        if not self.is_configured(): return {}
+        await self._aload_digest(resume_text)
+        return await self._generate_json(self._follow_ups_prompt(resume_text, history, question), "generate_follow_ups")
+
+    async def generate_quiz(self, skills: List[str], fresh: bool = False) -> List[Dict[str, Any]]:
+        if not self.is_configured(): return []
+        response = await self._generate_json(self._quiz_prompt(skills), "refill_quiz" if fresh else "generate_quiz")
+        return response.get("questions", []) if response else []
+
+    async def generate_coding_problem(self, resume_text: str, role: str) -> Dict[str, Any]:
+        if not self.is_configured(): return {}
+        await self._aload_digest(resume_text)
+        return await self._generate_json(self._coding_problem_prompt(resume_text, role), "generate_coding_problem")
+
+    async def review_code(self, problem: str, user_code: str) -> Dict[str, Any]:
+        if not self.is_configured(): return {}
+        return await self._generate_json(self._review_prompt(problem, user_code), "review_code")
+
+    async def analyze_jd_gap(self, resume_text: str, jd_text: str) -> Dict[str, Any]:
+        if not self.is_configured(): return {}
+        await self._aload_digest(resume_text)
+        return await self._generate_json(self._jd_gap_prompt(resume_text, jd_text), "analyze_jd_gap")
+
+    async def analyze_star(self, question: str, answer: str) -> Dict[str, Any]:
+        if not self.is_configured(): return {}
+        return await self._generate_json(self._star_prompt(question, answer), "analyze_star")
+
+    async def summarize_resume(self, resume_text: str) -> Dict[str, Any]:
+        if not self.is_configured(): return {}
+        return await self._generate_json(self._summary_prompt(resume_text), "summarize_resume")
+
+    async def build_resume_digest(self, resume_text: str, parsed: Dict[str, List[str]]) -> Tuple[str, Dict[str, Any]]:
+        rid = resume_id(resume_text)
+        digest = await self.digests.aget(rid)
+        if digest is None:
+            digest = build_digest(parsed, await self.summarize_resume(resume_text))
+            await asyncio.to_thread(self.digests.put, rid, resume_text, digest)
+        return rid, digest
+
+    async def detect_role_from_resume(self, resume_text: str) -> str:
+        if not self.is_configured(): return "Software Engineer"
+        await self._aload_digest(resume_text)
+        prompt = self._role_prompt(resume_text)
+        key = self._fingerprint(prompt, ROLE_SYSTEM_PROMPT, 0.1, task="detect_role")
+        cached = await self._acache_get(key, "detect_role")
+        if cached is not None:
+            return cached
+
+        async def detect():
+            role = self._clean_role(await self._chat(prompt, system=ROLE_SYSTEM_PROMPT, temperature=0.1, json_mode=False, task="detect_role"))
+            await self._acache_store(key, "detect_role", role)
+            return role
+        try:
+            return await self.flights.do(key, detect)
         except Exception as e:
-            print(f"Role detection error: {e}")
+            logger.error(f"Role detection error: {e}")
             return "Software Engineer"
 
-    def _generate_json(self, prompt: str) -> Any:
+    async def _chat(self, prompt: str, system: str = JSON_SYSTEM_PROMPT, temperature: float = 0.7, json_mode: bool = True, task: str = "default") -> str:
+        cassette_key, replayed = self._replay(prompt, system, temperature, task)
+        if replayed is not None:
+            return replayed
+        cost = self._estimate_cost(prompt, system)
+        model = self.router.pick(task, cost)
+        kwargs = self._completion_kwargs(prompt, system, temperature, json_mode, model)
+
+        timer = _CallTimer()
+
+        async def send():
+            async with self._semaphore:
+                timer.start()
+                return await self.client.chat.completions.create(**kwargs)
+        try:
+            completion = await self.scheduler.acall(task, cost, send)
+        except Exception:
+            self._record_call(task, model, timer, error=True)
+            raise
+        self._record_call(task, model, timer, getattr(completion, "usage", None))
+        content = completion.choices[0].message.content
+        if self.cassette is not None:
+            await self.cassette.arecord(cassette_key, content, task)
+        return content
+
+    async def _chat_stream(self, prompt: str, system: str = JSON_SYSTEM_PROMPT, temperature: float = 0.7, json_mode: bool = True, task: str = "default") -> AsyncIterator[str]:
+        cassette_key, replayed = self._replay(prompt, system, temperature, task)
+        if replayed is not None:
+            for i in range(0, len(replayed), 16):
+                yield replayed[i:i + 16]
+            return
+        cost = self._estimate_cost(prompt, system)
+        model = self.router.pick(task, cost)
+        kwargs = self._completion_kwargs(prompt, system, temperature, json_mode, model)
+        parts = []
+        timer = _CallTimer()
+
+        async def open_stream():
+            timer.start()
+            return await self.client.chat.completions.create(stream=True, **kwargs)
+        async with self._semaphore:
+            try:
+                # Only opening the stream is retried; a stream that breaks midway surfaces to the caller
+                stream = await self.scheduler.acall(task, cost, open_stream)
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        parts.append(chunk.choices[0].delta.content)
+                        yield parts[-1]
+            except Exception:
+                self._record_call(task, model, timer, error=True)
+                raise
+        # Streams report no usage object here; approximate from the text
+        usage = SimpleNamespace(prompt_tokens=estimate_tokens(system) + estimate_tokens(prompt),
+                                completion_tokens=estimate_tokens("".join(parts)))
+        self._record_call(task, model, timer, usage)
+        if self.cassette is not None:
+            await self.cassette.arecord(cassette_key, "".join(parts), task)
+
+    async def _generate_json(self, prompt: str, task: str = "default") -> Any:
+        key = self._fingerprint(prompt, task=task)
+        cached = await self._acache_get(key, task)
+        if cached is not None:
+            LLM_RESULTS.inc(task, "cache_hit")
+            return cached
         try:
-            completion = self.client.chat.completions.create(
-                messages=[
-                    {"role": "system", "content": "You are a helpful AI assistant that ALWAYS returns valid JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                model=self.model_name,
-                response_format={"type": "json_object"},
-                temperature=0.7
-            )
-            return json.loads(completion.choices[0].message.content)
+            result = await self.flights.do(key, lambda: self._complete_json(prompt, key, task))
+        except json.JSONDecodeError as e:
+            LLM_RESULTS.inc(task, "parse_error")
+            logger.error(f"Groq API Error: invalid JSON: {e}")
+            return {}
         except Exception as e:
-            print(f"Groq API Error: {e}")
+            LLM_RESULTS.inc(task, "error")
+            logger.error(f"Groq API Error: {e}")
             return {}
+        LLM_RESULTS.inc(task, "ok" if result else "empty")
+        return result
+
+    async def _complete_json(self, prompt: str, key: str, task: str) -> Any:
+        result = json.loads(await self._chat(prompt, task=task))
+        await self._acache_store(key, task, result)
+        return result
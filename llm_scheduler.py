@@ -0,0 +1,249 @@
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+import groq
+
+# Provider-side failures worth retrying; anything else (bad request, auth) fails immediately
+RETRYABLE_ERRORS = (groq.RateLimitError, groq.InternalServerError, groq.APIConnectionError, groq.APITimeoutError)
+
+
+class CircuitOpenError(Exception):
+    """Raised without calling the provider while the circuit breaker is open."""
+
+
+class QueueTimeoutError(Exception):
+    """Raised when a call waited longer than the scheduler's queue timeout for a slot."""
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `per_minute / 60` tokens per second."""
+    def __init__(self, per_minute: float):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until `amount` tokens are available (0 if they are now)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        return 0.0 if self.tokens >= amount else (amount - self.tokens) / self.rate
+
+    def take(self, amount: float):
+        self.tokens -= min(amount, self.capacity)
+
+
+class CircuitBreaker:
+    """
+    Opens after `threshold` consecutive provider failures and rejects calls for
+    `cooldown_s`; then lets a single trial call through (half-open) and closes
+    again on success.
+    """
+    def __init__(self, threshold: int = 5, cooldown_s: float = 30):
+        self.threshold = threshold
+        self.cooldown_s = cooldown_s
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+        self.rejected = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        return "half_open" if time.monotonic() - self.opened_at >= self.cooldown_s else "open"
+
+    def before_call(self):
+        with self._lock:
+            state = self.state
+            if state == "closed":
+                return
+            if state == "half_open" and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            self.rejected += 1
+        raise CircuitOpenError("LLM provider circuit is open")
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def release(self):
+        """The call ended without telling us anything about provider health."""
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.threshold:
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+class LLMScheduler:
+    """
+    Central gate in front of every LLM call (sync and async):
+      * request/token-per-minute buckets sized to the provider quota
+        (0 disables a bucket),
+      * priority classes: while a higher-priority call waits for quota, lower
+        priorities are not admitted (lower number = more urgent, FIFO within a class),
+      * jittered exponential retries for rate limits / 5xx / connection errors,
+      * a circuit breaker that fails fast while the provider is down.
+    """
+    def __init__(self, rpm: float = 0, tpm: float = 0, priorities: Dict[str, int] = None,
+                 default_priority: int = 1, max_retries: int = 3, retry_base_s: float = 0.5,
+                 retry_max_s: float = 8.0, queue_timeout_s: float = 30.0, breaker: CircuitBreaker = None):
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.priorities = priorities or {}
+        self.default_priority = default_priority
+        self.max_retries = max_retries
+        self.retry_base_s = retry_base_s
+        self.retry_max_s = retry_max_s
+        self.queue_timeout_s = queue_timeout_s
+        self.breaker = breaker or CircuitBreaker()
+        self._lock = threading.Lock()
+        self._waiting = []  # heap of (priority, seq)
+        self._seq = itertools.count()
+        self.admitted = 0
+        self.retries = 0
+        self.failures = 0
+
+    # --- Admission ---
+
+    def _enqueue(self, task: str):
+        ticket = (self.priorities.get(task, self.default_priority), next(self._seq))
+        with self._lock:
+            heapq.heappush(self._waiting, ticket)
+        return ticket
+
+    def _try_admit(self, ticket, cost: float) -> float:
+        """Admits `ticket` if it is first in line and quota allows; else returns seconds to wait."""
+        with self._lock:
+            if self._waiting[0] != ticket:
+                return 0.01
+            now = time.monotonic()
+            wait = max(self.requests.wait_time(1, now) if self.requests else 0.0,
+                       self.tokens.wait_time(cost, now) if self.tokens else 0.0)
+            if wait > 0:
+                return wait
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(cost)
+            heapq.heappop(self._waiting)
+            self.admitted += 1
+            return 0.0
+
+    def _abandon(self, ticket):
+        with self._lock:
+            self._waiting.remove(ticket)
+            heapq.heapify(self._waiting)
+
+    def acquire(self, task: str, cost: float):
+        ticket = self._enqueue(task)
+        deadline = time.monotonic() + self.queue_timeout_s
+        try:
+            while True:
+                wait = self._try_admit(ticket, cost)
+                if not wait:
+                    return
+                if time.monotonic() + wait > deadline:
+                    raise QueueTimeoutError(f"No LLM quota for '{task}' within {self.queue_timeout_s}s")
+                time.sleep(min(wait, 0.25))
+        except BaseException:
+            self._abandon(ticket)
+            raise
+
+    async def aacquire(self, task: str, cost: float):
+        ticket = self._enqueue(task)
+        deadline = time.monotonic() + self.queue_timeout_s
+        try:
+            while True:
+                wait = self._try_admit(ticket, cost)
+                if not wait:
+                    return
+                if time.monotonic() + wait > deadline:
+                    raise QueueTimeoutError(f"No LLM quota for '{task}' within {self.queue_timeout_s}s")
+                await asyncio.sleep(min(wait, 0.25))
+        except BaseException:
+            self._abandon(ticket)
+            raise
+
+    # --- Execution ---
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        retry_after = None
+        response = getattr(error, "response", None)
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+        try:
+            if retry_after is not None:
+                return min(float(retry_after), self.retry_max_s)
+        except ValueError:
+            pass
+        # Full jitter: uniform(0, base * 2^attempt), capped
+        return random.uniform(0, min(self.retry_max_s, self.retry_base_s * (2 ** attempt)))
+
+    def call(self, task: str, cost: float, fn: Callable[[], Any]) -> Any:
+        for attempt in range(self.max_retries + 1):
+            self.breaker.before_call()
+            try:
+                self.acquire(task, cost)
+                result = fn()
+            except RETRYABLE_ERRORS as e:
+                self.breaker.record_failure()
+                self.failures += 1
+                if attempt == self.max_retries:
+                    raise
+                self.retries += 1
+                time.sleep(self._backoff(attempt, e))
+                continue
+            except BaseException:
+                self.breaker.release()
+                raise
+            self.breaker.record_success()
+            return result
+
+    async def acall(self, task: str, cost: float, fn: Callable[[], Awaitable[Any]]) -> Any:
+        for attempt in range(self.max_retries + 1):
+            self.breaker.before_call()
+            try:
+                await self.aacquire(task, cost)
+                result = await fn()
+            except RETRYABLE_ERRORS as e:
+                self.breaker.record_failure()
+                self.failures += 1
+                if attempt == self.max_retries:
+                    raise
+                self.retries += 1
+                await asyncio.sleep(self._backoff(attempt, e))
+                continue
+            except BaseException:
+                self.breaker.release()
+                raise
+            self.breaker.record_success()
+            return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "admitted": self.admitted,
+            "waiting": len(self._waiting),
+            "retries": self.retries,
+            "failures": self.failures,
+            "breaker_state": self.breaker.state,
+            "breaker_rejected": self.breaker.rejected,
+        }
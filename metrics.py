@@ -0,0 +1,175 @@
+import bisect
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds; LLM completions run far longer than ordinary requests
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[Any], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount: float = 1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for values, total in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labels, values)} {total}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram; `observe` is one bisect plus a few adds under a lock."""
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series = {}  # label values -> [per-bucket counts..., +Inf count, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(label_values)
+            if series is None:
+                series = self._series[label_values] = [0] * (len(self.buckets) + 2)
+            series[index] += 1
+            series[-1] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for values, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + ("+Inf",), series[:-1]):
+                    cumulative += count
+                    labels = _format_labels(self.labels, values, f'le="{bound}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labels, values)
+                lines.append(f"{self.name}_sum{labels} {series[-1]}")
+                lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Holds the process's counters and histograms and renders them in the
+    Prometheus text exposition format. Components that already keep their own
+    counters (cache, scheduler, quiz bank, ...) are exported through
+    collectors: callables returning a stats dict whose numeric values are
+    rendered as gauges named `<prefix>_<key>` at scrape time.
+    """
+    def __init__(self):
+        self._metrics = {}
+        self._collectors = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, help_text: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labels))
+
+    def histogram(self, name: str, help_text: str, labels: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labels, buckets))
+
+    def register_collector(self, prefix: str, collect: Callable[[], Dict[str, Any]]):
+        with self._lock:
+            self._collectors[prefix] = collect
+
+    @staticmethod
+    def _flatten(prefix: str, stats: Dict[str, Any]) -> List[Tuple[str, float]]:
+        samples = []
+        for key, value in stats.items():
+            name = f"{prefix}_{key}"
+            if isinstance(value, bool):
+                samples.append((name, int(value)))
+            elif isinstance(value, (int, float)):
+                samples.append((name, value))
+            elif isinstance(value, dict):
+                samples.extend(MetricsRegistry._flatten(name, value))
+        return samples
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors.items())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        for prefix, collect in collectors:
+            try:
+                samples = self._flatten(prefix, collect() or {})
+            except Exception as e:
+                logger.error(f"Metrics collector '{prefix}' failed: {e}")
+                continue
+            for name, value in samples:
+                name = "".join(c if c.isalnum() or c == "_" else "_" for c in name)
+                lines.append(f"# TYPE {name} gauge")
+                lines.append(f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+LLM_CALL_SECONDS = REGISTRY.histogram(
+    "llm_call_seconds", "Provider latency of the final attempt of each LLM call.",
+    ("task", "model", "outcome"))
+LLM_QUEUE_SECONDS = REGISTRY.histogram(
+    "llm_queue_seconds", "Time from an LLM request to its final provider attempt: "
+    "scheduler queueing, concurrency limit and retry backoff.", ("task",))
+LLM_TOKENS = REGISTRY.counter(
+    "llm_tokens_total", "Tokens reported by the provider.", ("task", "model", "kind"))
+LLM_RESULTS = REGISTRY.counter(
+    "llm_results_total", "Outcome of each LLMHandler JSON call: ok, cache_hit, empty, parse_error or error.",
+    ("task", "outcome"))
+INTERACTION_FLUSH_SECONDS = REGISTRY.histogram(
+    "interaction_flush_seconds", "Time to write one batch of queued interactions to the database.",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5))
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "http_request_seconds", "Request latency per endpoint.", ("method", "path", "status"))
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+async def observe_request(request, call_next):
+    """
+    HTTP middleware: records latency per route template (not raw path, to keep
+    label cardinality bounded). For streaming responses this is time to headers.
+    """
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        path = getattr(route, "path", None) or "unmatched"
+        HTTP_REQUEST_SECONDS.observe(time.perf_counter() - started, request.method, path, status)
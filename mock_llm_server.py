@@ -0,0 +1,170 @@
+"""
+Local stand-in for the Groq/OpenAI chat-completions API, for offline
+development, load tests and benchmarks. Point the backend at it with:
+
+    python mock_llm_server.py --port 8100 --latency lognormal:-0.5,0.4
+    GROQ_BASE_URL=http://127.0.0.1:8100 GROQ_API_KEY=mock uvicorn server:app
+
+Supports JSON mode (canned answers shaped like each LLMHandler prompt),
+plain text completions and `stream: true` (SSE chunks).
+"""
+import argparse
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+import uuid
+from typing import Any, Callable, Dict, List
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+
+def parse_latency(spec: str) -> Callable[[], float]:
+    """
+    Latency distribution in seconds:
+      constant:0.5 | uniform:0.2,1.5 | normal:0.8,0.2 | lognormal:mu,sigma
+    """
+    kind, _, args = spec.partition(":")
+    params = [float(x) for x in args.split(",") if x]
+    if kind == "constant":
+        return lambda: params[0] if params else 0.0
+    if kind == "uniform":
+        return lambda: random.uniform(params[0], params[1])
+    if kind == "normal":
+        return lambda: max(0.0, random.gauss(params[0], params[1]))
+    if kind == "lognormal":
+        return lambda: random.lognormvariate(params[0], params[1])
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def canned_response(prompt: str, json_mode: bool) -> str:
+    """Plausible content for each LLMHandler prompt, recognised by its requested JSON shape."""
+    if not json_mode:
+        return "Software Engineer"
+    question = {"question": "How would you design a rate limiter for a public API?",
+                "type": "Technical", "topic": "System Design", "hints": ["Token bucket", "Distributed state"]}
+    if '"evaluation"' in prompt and '"next_question"' in prompt:
+        body = {"evaluation": {"feedback": "Solid answer, add concrete numbers.", "rating": 7,
+                               "better_answer": "Quantify the impact and mention trade-offs."},
+                "next_question": question}
+    elif '"key_experience"' in prompt:
+        body = {"headline": "Backend engineer, 5 years, Python and distributed systems",
+                "summary": "Builds and operates high-throughput APIs; led a migration to Kubernetes.",
+                "key_experience": ["Senior Engineer at Acme: cut p99 latency 40%"],
+                "projects": ["Rate limiter service handling 20k rps"]}
+    elif '"deeper"' in prompt:
+        body = {"deeper": question,
+                "pivot": {"question": "What is the difference between a process and a thread?",
+                          "type": "Technical", "topic": "Fundamentals", "hints": ["Memory isolation"]}}
+    elif '"options"' in prompt:
+        body = {"questions": [{"question": f"Scenario {i}: which approach is best?",
+                               "options": ["A", "B", "C", "D"], "correct_answer": "A",
+                               "explanation": "A avoids the race condition."} for i in range(5)]}
+    elif '"questions"' in prompt and '"missing_skills"' not in prompt:
+        body = {"questions": [question]}
+    elif '"starter_code"' in prompt:
+        body = {"title": "Two Sum", "description": "Return indices of two numbers adding up to target.",
+                "difficulty": "Easy", "starter_code": "def solution(nums, target):\n    pass"}
+    elif '"is_correct"' in prompt:
+        body = {"is_correct": True, "rating": 8, "feedback": "Correct and readable.",
+                "time_complexity": "O(n)", "optimized_code": ""}
+    elif '"missing_skills"' in prompt:
+        body = {"missing_skills": ["Kubernetes"], "analysis": "Strong backend, little infra.",
+                "questions": ["How would you deploy this service?"]}
+    elif '"star_score"' in prompt:
+        body = {"star_score": 6, "missing_components": ["Result"], "feedback": "State the outcome."}
+    elif '"rating"' in prompt:
+        body = {"rating": 7, "feedback": "Good answer.", "better_answer": "Add an example."}
+    else:
+        body = question
+    return json.dumps(body)
+
+
+def _usage(messages: List[Dict[str, Any]], content: str) -> Dict[str, int]:
+    prompt_tokens = sum(len(str(m.get("content", ""))) for m in messages) // 4
+    completion_tokens = len(content) // 4
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens}
+
+
+def create_app(latency: Callable[[], float] = lambda: 0.0, chunk_size: int = 16,
+               chunk_delay_s: float = 0.01) -> FastAPI:
+    app = FastAPI(title="Mock LLM")
+    app.state.requests = 0
+
+    @app.post("/openai/v1/chat/completions")
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        app.state.requests += 1
+        messages = body.get("messages", [])
+        prompt = str(messages[-1].get("content", "")) if messages else ""
+        json_mode = (body.get("response_format") or {}).get("type") == "json_object"
+        model = body.get("model", "mock")
+        content = canned_response(prompt, json_mode)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+
+        # Time to first token
+        await asyncio.sleep(latency())
+
+        if not body.get("stream"):
+            return JSONResponse({
+                "id": completion_id, "object": "chat.completion", "created": created, "model": model,
+                "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                             "finish_reason": "stop"}],
+                "usage": _usage(messages, content),
+            })
+
+        async def events():
+            for i in range(0, len(content), chunk_size):
+                chunk = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                         "choices": [{"index": 0, "delta": {"content": content[i:i + chunk_size]},
+                                      "finish_reason": None}]}
+                yield f"data: {json.dumps(chunk)}\n\n"
+                await asyncio.sleep(chunk_delay_s)
+            final = {"id": completion_id, "object": "chat.completion.chunk", "created": created, "model": model,
+                     "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                     "x_groq": {"usage": _usage(messages, content)}}
+            yield f"data: {json.dumps(final)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    @app.get("/stats")
+    async def stats():
+        return {"requests": app.state.requests}
+
+    return app
+
+
+def serve_in_thread(app: FastAPI):
+    """Runs `app` on a free local port in a daemon thread. Returns (base URL, uvicorn server); set `should_exit` to stop it."""
+    import uvicorn
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return f"http://127.0.0.1:{port}", server
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Mock Groq/OpenAI chat-completions server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    parser.add_argument("--latency", default="constant:0.3", help="time-to-first-token distribution")
+    parser.add_argument("--chunk-size", type=int, default=16, help="characters per streamed chunk")
+    parser.add_argument("--chunk-delay", type=float, default=0.01, help="seconds between streamed chunks")
+    args = parser.parse_args()
+
+    uvicorn.run(create_app(parse_latency(args.latency), args.chunk_size, args.chunk_delay),
+                host=args.host, port=args.port, log_level="warning")
@@ -0,0 +1,111 @@
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class RouteStats:
+    def __init__(self, window: int):
+        self.latencies_ms = deque(maxlen=window)
+        self.calls = 0
+        self.errors = 0
+        self.tokens = 0
+        self.cost_usd = 0.0
+
+    def p95(self) -> float:
+        if not self.latencies_ms:
+            return 0.0
+        ordered = sorted(self.latencies_ms)
+        return ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+
+
+class ModelRouter:
+    """
+    Maps each LLMHandler task to a model tier (Config.MODEL_ROUTES).
+    A route may name a `fallback` tier; traffic moves to it when
+      * the primary model's observed p95 latency for the task exceeds
+        `p95_budget_ms` (for `recovery_s`, after which the primary is probed again), or
+      * the estimated cost of the call on the primary exceeds `cost_budget_usd`.
+    Latency, token and cost statistics are kept per (task, model).
+    """
+    def __init__(self, tiers: Dict[str, str], routes: Dict[str, Dict[str, Any]], prices: Dict[str, float],
+                 default_tier: str = "large", window: int = 100, min_samples: int = 20, recovery_s: float = 60):
+        self.tiers = tiers
+        self.routes = routes
+        self.prices = prices
+        self.default_tier = default_tier
+        self.window = window
+        self.min_samples = min_samples
+        self.recovery_s = recovery_s
+        self._stats = {}
+        self._downgraded_until = {}
+        self.downgrades = 0
+        self._lock = threading.Lock()
+
+    def _route(self, task: str) -> Dict[str, Any]:
+        return self.routes.get(task) or {"tier": self.default_tier}
+
+    def primary_model(self, task: str) -> str:
+        return self.tiers[self._route(task)["tier"]]
+
+    def estimate_cost(self, model: str, tokens: float) -> float:
+        return tokens / 1_000_000 * self.prices.get(model, 0.0)
+
+    def pick(self, task: str, est_tokens: float = 0) -> str:
+        route = self._route(task)
+        primary = self.tiers[route["tier"]]
+        fallback = route.get("fallback")
+        if not fallback:
+            return primary
+
+        budget_usd = route.get("cost_budget_usd")
+        if budget_usd is not None and self.estimate_cost(primary, est_tokens) > budget_usd:
+            return self.tiers[fallback]
+
+        with self._lock:
+            until = self._downgraded_until.get(task)
+            if until is not None:
+                if time.monotonic() < until:
+                    return self.tiers[fallback]
+                # Probe the primary again with a fresh window
+                del self._downgraded_until[task]
+                self._stats.pop((task, primary), None)
+
+            budget_ms = route.get("p95_budget_ms")
+            stats = self._stats.get((task, primary))
+            if budget_ms and stats and len(stats.latencies_ms) >= self.min_samples and stats.p95() > budget_ms:
+                self._downgraded_until[task] = time.monotonic() + self.recovery_s
+                self.downgrades += 1
+                logger.warning(f"Model router: '{task}' p95 {stats.p95():.0f}ms > {budget_ms}ms, using {self.tiers[fallback]}")
+                return self.tiers[fallback]
+        return primary
+
+    def record(self, task: str, model: str, latency_ms: float, tokens: int = 0, error: bool = False):
+        with self._lock:
+            stats = self._stats.get((task, model))
+            if stats is None:
+                stats = self._stats[(task, model)] = RouteStats(self.window)
+            stats.calls += 1
+            if error:
+                stats.errors += 1
+                return
+            stats.latencies_ms.append(latency_ms)
+            stats.tokens += tokens
+            stats.cost_usd += self.estimate_cost(model, tokens)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            routes = {
+                f"{task}:{model}": {
+                    "calls": s.calls,
+                    "errors": s.errors,
+                    "p95_ms": round(s.p95(), 1),
+                    "tokens": s.tokens,
+                    "cost_usd": round(s.cost_usd, 6),
+                }
+                for (task, model), s in self._stats.items()
+            }
+            return {"downgrades": self.downgrades, "downgraded": sorted(self._downgraded_until), "routes": routes}
@@ -0,0 +1,137 @@
+import io
+import multiprocessing
+import time
+from typing import List, Tuple
+
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+
+try:
+    import resource
+except ImportError:  # Windows: no RLIMIT_AS
+    resource = None
+
+
+def layout_params(fast: bool = True) -> LAParams:
+    # boxes_flow=None skips the costly reading-order analysis of text boxes;
+    # plain resume text does not need it
+    return LAParams(boxes_flow=None, detect_vertical=False) if fast else LAParams()
+
+
+def iter_page_texts(data: bytes, max_pages: int = 0, fast_layout: bool = True):
+    """
+    Yields the text of each page in turn. Stops after `max_pages` pages
+    (0 = no limit) and then yields None if the document has more pages.
+    """
+    rsrcmgr = PDFResourceManager(caching=True)
+    output = io.StringIO()
+    device = TextConverter(rsrcmgr, output, laparams=layout_params(fast_layout))
+    interpreter = PDFPageInterpreter(rsrcmgr, device)
+    limit = max_pages + 1 if max_pages else 0
+    for number, page in enumerate(PDFPage.get_pages(io.BytesIO(data), maxpages=limit, caching=True)):
+        if max_pages and number >= max_pages:
+            yield None
+            return
+        interpreter.process_page(page)
+        yield output.getvalue()
+        output.seek(0)
+        output.truncate()
+
+
+def _extract_worker(conn, data: bytes, max_pages: int, fast_layout: bool, max_memory_mb: int):
+    """Child process: streams ("page", text) messages, then ("done" | "truncated" | "error", detail)."""
+    if resource is not None and max_memory_mb:
+        limit = max_memory_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+    try:
+        for text in iter_page_texts(data, max_pages, fast_layout):
+            if text is None:
+                conn.send(("truncated", max_pages))
+                return
+            conn.send(("page", text))
+        conn.send(("done", None))
+    except MemoryError:
+        conn.send(("error", f"memory limit of {max_memory_mb} MB reached"))
+    except Exception as e:
+        conn.send(("error", f"{type(e).__name__}: {e}"))
+    finally:
+        conn.close()
+
+
+class PDFExtractor:
+    """
+    pdfminer text extraction with hard limits for untrusted uploads: at most
+    `max_pages` pages, a wall-clock `timeout_s` enforced by running pdfminer in
+    a child process that is killed when it runs over, and an address-space cap
+    of `max_memory_mb` in that child. Pages are streamed back as they finish,
+    so hitting a limit returns the text extracted so far plus a warning.
+    With `isolated=False` extraction runs in-process (page limit only).
+    """
+    def __init__(self, max_pages: int = 20, timeout_s: float = 10, max_memory_mb: int = 512,
+                 fast_layout: bool = True, isolated: bool = True, start_method: str = None):
+        self.max_pages = max_pages
+        self.timeout_s = timeout_s
+        self.max_memory_mb = max_memory_mb
+        self.fast_layout = fast_layout
+        self.isolated = isolated
+        if start_method is None:
+            # forkserver: cheap per call and safe to use from a threaded server
+            start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        self._context = multiprocessing.get_context(start_method)
+
+    def extract(self, data: bytes) -> Tuple[str, List[str]]:
+        """Returns (text, warnings)."""
+        if not self.isolated:
+            return self._extract_inline(data)
+
+        receiver, sender = self._context.Pipe(duplex=False)
+        process = self._context.Process(
+            target=_extract_worker, args=(sender, data, self.max_pages, self.fast_layout, self.max_memory_mb),
+            daemon=True)
+        process.start()
+        sender.close()
+
+        pages, warnings = [], []
+        deadline = time.monotonic() + self.timeout_s
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not receiver.poll(remaining):
+                    warnings.append(f"PDF extraction timed out after {self.timeout_s}s; "
+                                    f"text is from the first {len(pages)} page(s)")
+                    break
+                try:
+                    kind, payload = receiver.recv()
+                except EOFError:
+                    # Child died without reporting (e.g. killed by the OS for memory)
+                    warnings.append(f"PDF extraction stopped unexpectedly after {len(pages)} page(s)")
+                    break
+                if kind == "page":
+                    pages.append(payload)
+                elif kind == "truncated":
+                    warnings.append(f"Only the first {payload} pages were read")
+                    break
+                elif kind == "error":
+                    if not pages:
+                        raise ValueError(f"Could not extract text from PDF: {payload}")
+                    warnings.append(f"PDF extraction stopped after {len(pages)} page(s): {payload}")
+                    break
+                else:
+                    break
+        finally:
+            receiver.close()
+            if process.is_alive():
+                process.kill()
+            process.join()
+        return "".join(pages), warnings
+
+    def _extract_inline(self, data: bytes) -> Tuple[str, List[str]]:
+        pages, warnings = [], []
+        for text in iter_page_texts(data, self.max_pages, self.fast_layout):
+            if text is None:
+                warnings.append(f"Only the first {self.max_pages} pages were read")
+                break
+            pages.append(text)
+        return "".join(pages), warnings
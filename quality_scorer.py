@@ -0,0 +1,140 @@
+"""
+Batch resume quality scoring for bulk screening.
+
+`score_resumes(texts)` gives the same score and feedback as
+`ResumeParser.analyze_quality()` for each text. It computes each check as
+a boolean column over all texts, then turns the columns into scores with
+NumPy arithmetic. The per-resume parser does more work than the score needs
+(sentence splitting, keyword positions for every category); the batch
+scorer only answers yes/no per check.
+
+Benchmark (also checks every row is identical to analyze_quality):
+
+    python quality_scorer.py --resumes 10000
+"""
+import re
+from itertools import compress
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from resume_parser import EMAIL_PATTERN, EXPERIENCE_PATTERN, PHONE_PATTERN, PROJECT_PATTERN
+from skill_taxonomy import get_taxonomy
+
+# (column that fails the check when True, penalty, feedback) in analyze_quality order
+CHECKS = (
+    ("too_short", 20, "Resume is too short (< 200 words). Add more details."),
+    ("too_long", 10, "Resume might be too long (> 2000 words). Consider summarizing."),
+    ("no_skills", 20, "No explicit 'Skills' detected. Make sure to list your technical skills."),
+    ("no_experience", 15, "Limited 'Experience' detected. Highlight your work history."),
+    ("no_projects", 10, "No 'Projects' detected. Adding projects can boost your profile."),
+    ("no_email", 5, "No Email address detected."),
+    ("no_phone", 5, "No Phone number detected."),
+)
+
+
+# Case-sensitive equivalents of the ResumeParser patterns, for ASCII text that
+# has been lowercased once: much cheaper than IGNORECASE scans of every text
+_EXPERIENCE_LOWER = re.compile(r"\b(?:experience|worked at|position|role|company)\b")
+_PROJECT_WORDS = ("project", "developed", "built", "created", "designed")
+_THREE_DIGITS = re.compile(r"\d{3}")
+
+
+def _contains(texts: pd.Series, pattern) -> np.ndarray:
+    return texts.map(lambda text: pattern.search(text) is not None).to_numpy(dtype=bool)
+
+
+def score_resumes(texts: Iterable[str]) -> pd.DataFrame:
+    """
+    One row per text: word_count, has_skills, has_experience, has_projects,
+    has_email, has_phone, score (0-100) and feedback (list of messages).
+    """
+    s = pd.Series(list(texts), dtype=object)
+    skills = get_taxonomy().matcher.presence_pattern("skills")
+    lower = s.map(str.lower)
+    # Non-ASCII text can lowercase to a different length ("İ"), so it keeps the original patterns
+    ascii_rows = s.map(str.isascii).to_numpy(dtype=bool)
+
+    # Sentence splitting only removes [.!?] and surrounding whitespace, which
+    # none of these patterns can match, so searching the whole text is the same
+    # as searching sentence by sentence
+    has_experience = lower.map(lambda text: _EXPERIENCE_LOWER.search(text) is not None)
+    has_projects = lower.map(lambda text: any(word in text for word in _PROJECT_WORDS))
+    has_experience = has_experience.to_numpy(dtype=bool, copy=True)
+    has_projects = has_projects.to_numpy(dtype=bool, copy=True)
+    if not ascii_rows.all():
+        other = s[~ascii_rows]
+        has_experience[~ascii_rows] = _contains(other, EXPERIENCE_PATTERN)
+        has_projects[~ascii_rows] = _contains(other, PROJECT_PATTERN)
+
+    df = pd.DataFrame({
+        "word_count": s.map(lambda text: len(text.split())).to_numpy(dtype=np.int64),
+        "has_skills": _contains(s, skills) if skills is not None else np.zeros(len(s), dtype=bool),
+        "has_experience": has_experience,
+        "has_projects": has_projects,
+        # Cheap necessary conditions first: an email has an "@", a phone number three digits in a row
+        "has_email": s.map(lambda text: "@" in text and EMAIL_PATTERN.search(text) is not None).to_numpy(dtype=bool),
+        "has_phone": s.map(lambda text: _THREE_DIGITS.search(text) is not None
+                           and PHONE_PATTERN.search(text) is not None).to_numpy(dtype=bool),
+    }, index=s.index)
+
+    words = df["word_count"].to_numpy()
+    failed = np.column_stack([
+        words < 200,
+        words > 2000,
+        ~df["has_skills"].to_numpy(),
+        ~df["has_experience"].to_numpy(),
+        ~df["has_projects"].to_numpy(),
+        ~df["has_email"].to_numpy(),
+        ~df["has_phone"].to_numpy(),
+    ]) if len(df) else np.zeros((0, len(CHECKS)), dtype=bool)
+    penalties = np.array([penalty for _, penalty, _ in CHECKS])
+    messages = [message for _, _, message in CHECKS]
+
+    df["score"] = np.maximum(0, 100 - failed @ penalties)
+    df["feedback"] = [list(compress(messages, row)) for row in failed.tolist()]
+    return df
+
+
+if __name__ == "__main__":
+    import argparse
+    import random
+    import time
+
+    from resume_parser import ResumeParser
+
+    parser = argparse.ArgumentParser(description="Benchmark score_resumes against ResumeParser.analyze_quality")
+    parser.add_argument("--resumes", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    skills = list(get_taxonomy().skills)
+    prose = ("the a team of users and to service platform latency customers improved reduced "
+             "migrated reliability across multiple led").split()
+    sections = ["Experience: worked at Acme as engineer.", "Built a data project!", "Designed the service.",
+                "Held a position at a large company.", "Contact: jane.doe@example.com", "Phone: (555) 123-4567"]
+    corpus = []
+    for _ in range(args.resumes):
+        n = rng.choice([50, 150, 400, 800, 2500])
+        words = [rng.choice(prose) if rng.random() > 0.03 else rng.choice(skills) for _ in range(n)]
+        parts = [" ".join(words)] + [section for section in sections if rng.random() < 0.7]
+        if rng.random() < 0.05:
+            parts.append("Based in Zürich.")  # non-ASCII text takes the fallback patterns
+        rng.shuffle(parts)
+        corpus.append(" ".join(parts))
+
+    started = time.perf_counter()
+    expected = [ResumeParser(text.encode("utf-8"), "resume.txt").analyze_quality() for text in corpus]
+    single_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scored = score_resumes(corpus)
+    batch_s = time.perf_counter() - started
+
+    got = [{"score": int(score), "feedback": feedback} for score, feedback in zip(scored["score"], scored["feedback"])]
+    assert got == expected, "results differ"
+    print(f"{args.resumes} resumes, {sum(len(t) for t in corpus) / 1e6:.1f} MB")
+    print(f"analyze_quality per resume: {single_s:.3f}s")
+    print(f"score_resumes:              {batch_s:.3f}s  ({single_s / batch_s:.1f}x)")
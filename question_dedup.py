@@ -0,0 +1,244 @@
+"""
+Near-duplicate detection for interview questions a candidate has already
+been asked, so "Tell me about yourself" or a rephrased Python question is
+not served again in a later session.
+
+Questions are compared by the Jaccard similarity of their character
+5-grams, estimated with MinHash signatures and looked up through LSH bands:
+a lookup touches only the few stored questions that share a band with the
+new one, independent of how many are stored. Only questions about the same
+skills (per the skill taxonomy) are compared, so "What is docker and why is
+it used?" does not suppress the same template asked about python.
+
+Benchmark (lookup latency with 100k stored questions):
+
+    python question_dedup.py --stored 100000
+"""
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from skill_taxonomy import get_taxonomy
+
+_WORDS = re.compile(r"[a-z0-9+#]+")
+SHINGLE_CHARS = 5
+
+
+def normalize(question: str) -> str:
+    """Lowercase words only, so punctuation and spacing do not affect similarity."""
+    return " ".join(_WORDS.findall(question.lower()))
+
+
+def shingles(question: str) -> np.ndarray:
+    """
+    Distinct character 5-grams of the normalized text as uint64 ids. Each id
+    packs the five UTF-8 bytes of a 5-gram exactly, so there are no collisions.
+    """
+    data = np.frombuffer(normalize(question).encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+    if len(data) < SHINGLE_CHARS:
+        data = np.concatenate([data, np.zeros(SHINGLE_CHARS - len(data), dtype=np.uint64)])
+    ids = np.zeros(len(data) - SHINGLE_CHARS + 1, dtype=np.uint64)
+    for offset in range(SHINGLE_CHARS):
+        ids = (ids << np.uint64(8)) | data[offset:len(data) - SHINGLE_CHARS + 1 + offset]
+    return np.unique(ids)
+
+
+class _CandidateQuestions:
+    def __init__(self, bands: int):
+        self.texts = []
+        self.signatures = []
+        self.buckets = [{} for _ in range(bands)]  # per band: (skills, band bytes) -> question numbers
+
+
+class QuestionIndex:
+    """
+    Per-candidate MinHash/LSH index of asked questions. A candidate's history
+    is loaded from the interactions table (when a DBHandler is given) on its
+    first lookup; questions served afterwards are added with `add`. At most
+    `max_candidates` histories are kept, least recently used evicted first.
+
+    With `num_perm` = bands x rows hash functions, two questions share a band
+    with high probability once their similarity passes about
+    (1 / bands) ** (1 / rows); with the defaults (32 x 3) that is ~0.3, so
+    questions at the duplicate `threshold` are almost always compared.
+    """
+    def __init__(self, db=None, threshold: float = 0.5, num_perm: int = 96, bands: int = 32, seed: int = 1,
+                 max_candidates: int = 1000):
+        if num_perm % bands:
+            raise ValueError("num_perm must be a multiple of bands")
+        self.db = db
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+        self.bands = bands
+        self.rows = num_perm // bands
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hashing: h(x) = (a * x + b) >> 32 with odd a, wrapping at 2**64
+        self._a = rng.integers(1, 2 ** 63, size=(num_perm, 1), dtype=np.uint64) | np.uint64(1)
+        self._b = rng.integers(0, 2 ** 63, size=(num_perm, 1), dtype=np.uint64)
+        self._candidates = OrderedDict()  # candidate id -> _CandidateQuestions, least recently used first
+        self._lock = threading.Lock()
+        self.lookups = 0
+        self.duplicates = 0
+
+    def signature(self, question: str) -> np.ndarray:
+        ids = shingles(question)
+        with np.errstate(over="ignore"):
+            hashed = (self._a * ids + self._b) >> np.uint64(32)
+        return hashed.min(axis=1).astype(np.uint32)
+
+    def _bands(self, skills: Tuple[str, ...], signature: np.ndarray) -> List[Tuple[Tuple[str, ...], bytes]]:
+        return [(skills, signature[i * self.rows:(i + 1) * self.rows].tobytes()) for i in range(self.bands)]
+
+    def _key(self, question: str) -> Tuple[Tuple[str, ...], np.ndarray]:
+        """(skills the question mentions, MinHash signature)."""
+        return tuple(sorted(get_taxonomy().match(question)["skills"])), self.signature(question)
+
+    def _questions(self, candidate_id: str) -> _CandidateQuestions:
+        with self._lock:
+            questions = self._candidates.get(candidate_id)
+            if questions is not None:
+                self._candidates.move_to_end(candidate_id)
+                return questions
+        history = self.db.get_asked_questions(candidate_id) if self.db is not None else []
+        questions = _CandidateQuestions(self.bands)
+        for text in history:
+            self._insert(questions, text, self._key(text))
+        with self._lock:
+            questions = self._candidates.setdefault(candidate_id, questions)
+            while len(self._candidates) > self.max_candidates:
+                self._candidates.popitem(last=False)
+            return questions
+
+    def _insert(self, questions: _CandidateQuestions, text: str, key: Tuple[Tuple[str, ...], np.ndarray]):
+        number = len(questions.texts)
+        questions.texts.append(text)
+        questions.signatures.append(key[1])
+        for bucket, band in zip(questions.buckets, self._bands(*key)):
+            bucket.setdefault(band, []).append(number)
+
+    def _best(self, questions: _CandidateQuestions, key: Tuple[Tuple[str, ...], np.ndarray]) -> Optional[Tuple[float, str]]:
+        numbers = set()
+        for bucket, band in zip(questions.buckets, self._bands(*key)):
+            numbers.update(bucket.get(band, ()))
+        if not numbers:
+            return None
+        numbers = list(numbers)
+        similarity = (np.stack([questions.signatures[n] for n in numbers]) == key[1]).mean(axis=1)
+        best = int(similarity.argmax())
+        return float(similarity[best]), questions.texts[numbers[best]]
+
+    def find(self, candidate_id: str, question: str) -> Optional[Tuple[float, str]]:
+        """(estimated similarity, stored question) of the closest near-duplicate, or None."""
+        if not candidate_id or not question:
+            return None
+        questions = self._questions(candidate_id)
+        key = self._key(question)
+        with self._lock:
+            best = self._best(questions, key)
+            self.lookups += 1
+            if best is not None and best[0] >= self.threshold:
+                self.duplicates += 1
+                return best
+        return None
+
+    def is_duplicate(self, candidate_id: str, question: str) -> bool:
+        return self.find(candidate_id, question) is not None
+
+    def add(self, candidate_id: str, question: str):
+        if not candidate_id or not question:
+            return
+        questions = self._questions(candidate_id)
+        key = self._key(question)
+        with self._lock:
+            self._insert(questions, question, key)
+
+    def filter(self, candidate_id: str, questions: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Splits question dicts into (new, repeated): a question is repeated when
+        it is a near-duplicate of the candidate's history or of an earlier
+        question in the same list. Kept questions are not added to the history.
+        """
+        if not candidate_id:
+            return list(questions), []
+        history = self._questions(candidate_id)
+        batch = _CandidateQuestions(self.bands)
+        kept, dropped = [], []
+        keys = [self._key(item.get("question", "")) for item in questions]
+        with self._lock:
+            for item, key in zip(questions, keys):
+                repeated = False
+                for index in (history, batch):
+                    best = self._best(index, key)
+                    if best is not None and best[0] >= self.threshold:
+                        repeated = True
+                        break
+                self.lookups += 1
+                if repeated:
+                    self.duplicates += 1
+                    dropped.append(item)
+                else:
+                    self._insert(batch, item.get("question", ""), key)
+                    kept.append(item)
+        return kept, dropped
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "candidates": len(self._candidates),
+                "questions": sum(len(q.texts) for q in self._candidates.values()),
+                "lookups": self.lookups,
+                "duplicates": self.duplicates,
+            }
+
+
+if __name__ == "__main__":
+    import argparse
+    import random
+    import statistics
+    import time
+
+    parser = argparse.ArgumentParser(description="Benchmark QuestionIndex lookups")
+    parser.add_argument("--stored", type=int, default=100000, help="questions stored for one candidate")
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    skills = list(get_taxonomy().skills)
+    # Pseudo-words so that stored questions are about as diverse as real ones
+    vocabulary = ["".join(rng.choice("bcdfghklmnprstvz") + rng.choice("aeiou") for _ in range(rng.randint(2, 4)))
+                  for _ in range(5000)]
+
+    def make_question():
+        words = rng.sample(vocabulary, rng.randint(6, 12))
+        words.insert(rng.randint(0, len(words)), rng.choice(skills))
+        return " ".join(words).capitalize() + "?"
+
+    index = QuestionIndex()
+    started = time.perf_counter()
+    stored = [make_question() for _ in range(args.stored)]
+    for question in stored:
+        index.add("candidate", question)
+    print(f"indexed {args.stored} questions in {time.perf_counter() - started:.1f}s")
+
+    # Half rephrased stored questions (one non-skill word swapped), half new ones
+    rephrased = []
+    for question in rng.sample(stored, args.lookups // 2):
+        words = question.rstrip("?").split()
+        position = rng.choice([i for i, word in enumerate(words) if word.lower() not in skills])
+        words[position] = rng.choice(vocabulary)
+        rephrased.append("Please, " + " ".join(words) + "?")
+    fresh = [make_question() for _ in range(args.lookups - len(rephrased))]
+    timings, found = [], {"rephrased": 0, "new": 0}
+    for label, probes in (("rephrased", rephrased), ("new", fresh)):
+        for probe in probes:
+            started = time.perf_counter()
+            found[label] += index.is_duplicate("candidate", probe)
+            timings.append((time.perf_counter() - started) * 1e6)
+    timings.sort()
+    print(f"{args.lookups} lookups: median {statistics.median(timings):.0f}us, "
+          f"p99 {timings[int(len(timings) * 0.99) - 1]:.0f}us")
+    print(f"flagged as near-duplicates: {found['rephrased']}/{len(rephrased)} rephrased, {found['new']}/{len(fresh)} new")
@@ -1,130 +1,175 @@
 import random
-from typing import List, Dict
+from itertools import islice
+from typing import Callable, Iterator, List, Dict
 import utils
-import nltk
+from skill_taxonomy import get_taxonomy
+
+# Question templates by difficulty, compiled to bound str.format methods once at import
+SKILL_TEMPLATES = {
+    'Easy': "What is {topic} and why is it used?",
+    'Medium': "How have you applied {topic} in your previous projects? Can you give a specific example?",
+    'Hard': "Describe a complex challenge you faced when working with {topic} and how you resolved it.",
+}
+TECHNOLOGY_TEMPLATES = {
+    'Easy': "Explain the basic concepts of {topic}.",
+    'Medium': "Compare {topic} with its main alternatives. Why would you choose one over the other?",
+    'Hard': "Discuss an advanced feature or optimization technique in {topic}.",
+}
+PROJECT_TEMPLATES = {
+    'Easy': ("Can you give a high-level overview of your project: '{topic}'?",
+             ["Goal of the project", "Your role", "Technologies used"]),
+    'Medium': ("What specific technologies did you choose for '{topic}' and why?",
+               ["Technical decision making", "Trade-offs", "Alternative considered"]),
+    'Hard': ("What was the most significant technical hurdle you overcame in '{topic}'?",
+             ["Problem definition", "Debugging process", "Solution implementation"]),
+}
+BEHAVIORAL_QUESTIONS = {
+    'Easy': [
+        {"q": "Tell me about yourself and your background.", "h": ["Elevator pitch", "Current role", "Key achievements"]},
+        {"q": "What motivates you to work in this field?", "h": ["Passion for technology", "Solving problems", "Impact"]}
+    ],
+    'Medium': [
+        {"q": "Describe a time you had to work with a difficult team member.", "h": ["STAR method (Situation, Task, Action, Result)", "Empathy", "Communication"]},
+        {"q": "How do you handle tight deadlines or pressure?", "h": ["Prioritization", "Communication", "Focus"]}
+    ],
+    'Hard': [
+        {"q": "Tell me about a significant failure you experienced. What did you learn?", "h": ["Honesty", "Growth mindset", "Resilience"]},
+        {"q": "Describe a situation where you had to lead a team through uncertainty.", "h": ["Leadership style", "Decision making", "Communication"]}
+    ]
+}
+
+_SKILL_FORMAT = {difficulty: template.format for difficulty, template in SKILL_TEMPLATES.items()}
+_TECHNOLOGY_FORMAT = {difficulty: template.format for difficulty, template in TECHNOLOGY_TEMPLATES.items()}
+_PROJECT_FORMAT = {difficulty: (template.format, hints) for difficulty, (template, hints) in PROJECT_TEMPLATES.items()}
+
+
+def _lazy_shuffle(items: List, rng: random.Random) -> Iterator:
+    """
+    Items in random order, one Fisher-Yates step per item taken: taking k
+    items costs O(k) no matter how long `items` is, and `items` is not copied.
+    """
+    swapped = {}  # index -> item moved there by an earlier step
+    for i in range(len(items) - 1, -1, -1):
+        j = rng.randint(0, i)
+        picked = swapped.get(j, items[j])
+        swapped[j] = swapped.get(i, items[i])
+        yield picked
 
-nltk.download('punkt', quiet=True)
-nltk.download('averaged_perceptron_tagger', quiet=True)
 
 class QuestionGenerator:
     def __init__(self, parsed_resume: Dict[str, List[str]]):
-        self.skills = parsed_resume.get('skills', [])
+        # Canonical names so "JS" and "javascript" are one topic with one set of hints
+        taxonomy = get_taxonomy()
+        self.skills = taxonomy.normalize(parsed_resume.get('skills', []))
         self.experience = parsed_resume.get('experience', [])
         self.projects = parsed_resume.get('projects', [])
-        self.technologies = parsed_resume.get('technologies', [])
+        self.technologies = taxonomy.normalize(parsed_resume.get('technologies', []))
         self.roles = parsed_resume.get('roles', [])
 
+    @staticmethod
+    def _technical_question(template, topic: str) -> Dict:
+        return {
+            "question": template(topic=topic),
+            "type": "Technical",
+            "topic": topic,
+            "hints": utils.get_answer_hints(topic)
+        }
+
+    @staticmethod
+    def _project_question(difficulty: str, project: str) -> Dict:
+        template, hints = _PROJECT_FORMAT[difficulty]
+        # Clean project name slightly
+        proj_name = project[:60] + "..." if len(project) > 60 else project
+        return {
+            "question": template(topic=proj_name),
+            "type": "Project",
+            "topic": "Project Experience",
+            "hints": list(hints)
+        }
+
+    @staticmethod
+    def _behavioral_question(item: Dict) -> Dict:
+        return {
+            "question": item['q'],
+            "type": "Behavioral",
+            "topic": "Behavioral",
+            "hints": list(item['h'])
+        }
+
     def generate_technical_questions(self, difficulty: str) -> List[Dict]:
-        questions = []
-        for skill in self.skills:
-            hints = utils.get_answer_hints(skill)
-            if difficulty == 'Easy':
-                questions.append({
-                    "question": f"What is {skill} and why is it used?",
-                    "type": "Technical",
-                    "topic": skill,
-                    "hints": hints
-                })
-            elif difficulty == 'Medium':
-                questions.append({
-                    "question": f"How have you applied {skill} in your previous projects? Can you give a specific example?",
-                    "type": "Technical",
-                    "topic": skill,
-                    "hints": hints
-                })
-            elif difficulty == 'Hard':
-                questions.append({
-                    "question": f"Describe a complex challenge you faced when working with {skill} and how you resolved it.",
-                    "type": "Technical",
-                    "topic": skill,
-                    "hints": hints
-                })
-        
+        if difficulty not in SKILL_TEMPLATES:
+            return []
+        questions = [self._technical_question(_SKILL_FORMAT[difficulty], skill) for skill in self.skills]
         # Avoid duplicate tech questions if coverd in skills
         processed_techs = set(self.skills)
-        for tech in self.technologies:
-            if tech in processed_techs:
-                continue
-            hints = utils.get_answer_hints(tech)
-            if difficulty == 'Easy':
-                 questions.append({
-                    "question": f"Explain the basic concepts of {tech}.",
-                    "type": "Technical",
-                    "topic": tech,
-                    "hints": hints
-                })
-            elif difficulty == 'Medium':
-                 questions.append({
-                    "question": f"Compare {tech} with its main alternatives. Why would you choose one over the other?",
-                    "type": "Technical",
-                    "topic": tech,
-                    "hints": hints
-                })
-            elif difficulty == 'Hard':
-                 questions.append({
-                    "question": f"Discuss an advanced feature or optimization technique in {tech}.",
-                    "type": "Technical",
-                    "topic": tech,
-                    "hints": hints
-                })
+        questions.extend(self._technical_question(_TECHNOLOGY_FORMAT[difficulty], tech)
+                         for tech in self.technologies if tech not in processed_techs)
         return questions
 
     def generate_behavioral_questions(self, difficulty: str) -> List[Dict]:
-        templates = {
-            'Easy': [
-                {"q": "Tell me about yourself and your background.", "h": ["Elevator pitch", "Current role", "Key achievements"]},
-                {"q": "What motivates you to work in this field?", "h": ["Passion for technology", "Solving problems", "Impact"]}
-            ],
-            'Medium': [
-                {"q": "Describe a time you had to work with a difficult team member.", "h": ["STAR method (Situation, Task, Action, Result)", "Empathy", "Communication"]},
-                {"q": "How do you handle tight deadlines or pressure?", "h": ["Prioritization", "Communication", "Focus"]}
-            ],
-            'Hard': [
-                {"q": "Tell me about a significant failure you experienced. What did you learn?", "h": ["Honesty", "Growth mindset", "Resilience"]},
-                {"q": "Describe a situation where you had to lead a team through uncertainty.", "h": ["Leadership style", "Decision making", "Communication"]}
-            ]
-        }
-        
-        selected = templates.get(difficulty, [])
-        return [{
-            "question": item['q'],
-            "type": "Behavioral",
-            "topic": "Behavioral",
-            "hints": item['h']
-        } for item in selected]
+        return [self._behavioral_question(item) for item in BEHAVIORAL_QUESTIONS.get(difficulty, [])]
 
     def generate_project_questions(self, difficulty: str) -> List[Dict]:
-        questions = []
-        for project in self.projects:
-            # Clean project name slightly
-            proj_name = project[:60] + "..." if len(project) > 60 else project
-            if difficulty == 'Easy':
-                questions.append({
-                    "question": f"Can you give a high-level overview of your project: '{proj_name}'?",
-                    "type": "Project",
-                    "topic": "Project Experience",
-                    "hints": ["Goal of the project", "Your role", "Technologies used"]
-                })
-            elif difficulty == 'Medium':
-                questions.append({
-                    "question": f"What specific technologies did you choose for '{proj_name}' and why?",
-                    "type": "Project",
-                    "topic": "Project Experience",
-                    "hints": ["Technical decision making", "Trade-offs", "Alternative considered"]
-                })
-            elif difficulty == 'Hard':
-                questions.append({
-                    "question": f"What was the most significant technical hurdle you overcame in '{proj_name}'?",
-                    "type": "Project",
-                    "topic": "Project Experience",
-                    "hints": ["Problem definition", "Debugging process", "Solution implementation"]
-                })
-        return questions
+        if difficulty not in PROJECT_TEMPLATES:
+            return []
+        return [self._project_question(difficulty, project) for project in self.projects]
+
+    def iter_questions(self, difficulty: str, seed: int = None,
+                       exclude: Callable[[str], bool] = None) -> Iterator[Dict]:
+        """
+        Yields questions lazily, each built only when it is taken. Types are
+        interleaved (stratified): every round yields one Technical, one
+        Behavioral and one Project question, in random order, until a type
+        runs out. No topic and no question text is yielded twice, nor any
+        question for which `exclude(text)` is true (e.g. one the candidate
+        was already asked). The same `seed` gives the same sequence.
+        """
+        if difficulty not in SKILL_TEMPLATES:
+            return
+        rng = random.Random(seed)
+        skills = set(self.skills)
+        # Each stratum yields (question, dedupe key); skills and technologies
+        # together make up the Technical stratum
+        technical = self._merge(
+            ((self._technical_question(_SKILL_FORMAT[difficulty], skill), skill)
+             for skill in _lazy_shuffle(self.skills, rng)),
+            ((self._technical_question(_TECHNOLOGY_FORMAT[difficulty], tech), tech)
+             for tech in _lazy_shuffle(self.technologies, rng) if tech not in skills),
+            rng)
+        behavioral = ((self._behavioral_question(item), item['q'])
+                      for item in _lazy_shuffle(BEHAVIORAL_QUESTIONS[difficulty], rng))
+        projects = ((self._project_question(difficulty, project), project[:60])
+                    for project in _lazy_shuffle(self.projects, rng))
+        strata = [technical, behavioral, projects]
+        seen = set()
+        while strata:
+            rng.shuffle(strata)
+            for stratum in list(strata):
+                for question, key in stratum:
+                    if key.lower() not in seen:
+                        seen.add(key.lower())
+                        if exclude is not None and exclude(question["question"]):
+                            continue
+                        yield question
+                        break
+                else:
+                    strata.remove(stratum)
+
+    @staticmethod
+    def _merge(first: Iterator, second: Iterator, rng: random.Random) -> Iterator:
+        sources = [first, second]
+        while sources:
+            source = rng.choice(sources)
+            item = next(source, None)
+            if item is None:
+                sources.remove(source)
+            else:
+                yield item
+
+    def sample(self, difficulty: str, count: int, seed: int = None,
+               exclude: Callable[[str], bool] = None) -> List[Dict]:
+        """The first `count` questions of iter_questions; cost depends on `count`, not resume size."""
+        return list(islice(self.iter_questions(difficulty, seed, exclude), count))
 
     def generate_all_questions(self, difficulty: str) -> List[Dict]:
-        questions = []
-        questions.extend(self.generate_technical_questions(difficulty))
-        questions.extend(self.generate_behavioral_questions(difficulty))
-        questions.extend(self.generate_project_questions(difficulty))
-        random.shuffle(questions)
-        return questions
+        return list(self.iter_questions(difficulty))
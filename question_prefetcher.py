@@ -0,0 +1,103 @@
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class _Prefetch:
+    def __init__(self, question: Dict[str, Any], task: asyncio.Task):
+        self.question = question
+        self.task = task
+
+
+class QuestionPrefetcher:
+    """
+    Speculatively generates follow-up questions while the candidate is still
+    answering. As soon as a question is served, `schedule` starts a background
+    completion for a "deeper" and a "pivot" follow-up (they depend only on the
+    resume and history, not on the unknown answer). On submit, `take` returns
+    those candidates if they are ready; otherwise the caller falls back to the
+    regular adaptive path.
+    """
+    def __init__(self, llm, max_sessions: int = 1000):
+        self.llm = llm
+        self.max_sessions = max_sessions
+        self._pending = OrderedDict()
+        self.scheduled = 0
+        self.hits = 0
+        self.misses = 0
+        self.wasted = 0
+        self._hit_ms = 0.0
+        self._fallback_ms = 0.0
+        self._fallback_count = 0
+
+    @staticmethod
+    def turn_key(session_id: Optional[str], resume_text: str, turn: int) -> str:
+        """Key of the prefetch for the answer to question number `turn` of an interview."""
+        owner = session_id or hashlib.sha1(resume_text.encode("utf-8")).hexdigest()
+        return f"{owner}:{turn}"
+
+    def schedule(self, key: str, resume_text: str, history: List[Dict], question: Dict[str, Any]):
+        if not question or not self.llm.is_configured():
+            return
+        self.discard(key)
+        task = asyncio.ensure_future(self.llm.generate_follow_ups(resume_text, history, question.get("question", "")))
+        self._pending[key] = _Prefetch(question, task)
+        self.scheduled += 1
+        while len(self._pending) > self.max_sessions:
+            _, stale = self._pending.popitem(last=False)
+            self._cancel(stale)
+
+    def take(self, key: str) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Returns (served question, {"deeper": {...}, "pivot": {...}}) for `key`.
+        The candidates are None on a miss (nothing prefetched, not ready yet, or failed).
+        """
+        prefetch = self._pending.pop(key, None)
+        if prefetch is None:
+            self.misses += 1
+            return None, None
+        task = prefetch.task
+        if not task.done():
+            self._cancel(prefetch)
+        elif not task.cancelled() and task.exception() is None:
+            candidates = task.result() or {}
+            if candidates.get("deeper") or candidates.get("pivot"):
+                self.hits += 1
+                return prefetch.question, candidates
+        self.misses += 1
+        return prefetch.question, None
+
+    def discard(self, key: str):
+        stale = self._pending.pop(key, None)
+        if stale is not None:
+            self._cancel(stale)
+
+    def record_latency(self, hit: bool, elapsed_ms: float):
+        if hit:
+            self._hit_ms += elapsed_ms
+        else:
+            self._fallback_ms += elapsed_ms
+            self._fallback_count += 1
+
+    def stats(self) -> Dict[str, Any]:
+        taken = self.hits + self.misses
+        avg_hit = self._hit_ms / self.hits if self.hits else None
+        avg_fallback = self._fallback_ms / self._fallback_count if self._fallback_count else None
+        saved = (avg_fallback - avg_hit) if avg_hit is not None and avg_fallback is not None else None
+        return {
+            "scheduled": self.scheduled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "wasted": self.wasted,
+            "pending": len(self._pending),
+            "hit_rate": self.hits / taken if taken else 0.0,
+            "avg_hit_ms": avg_hit,
+            "avg_fallback_ms": avg_fallback,
+            "avg_saved_ms_per_hit": saved,
+        }
+
+    def _cancel(self, prefetch: _Prefetch):
+        # Either cancelled mid-flight or finished but never used: tokens spent for nothing
+        self.wasted += 1
+        prefetch.task.cancel()
@@ -0,0 +1,204 @@
+"""
+Offline question retrieval: serves a relevant, previously well-rated
+interview question from the interactions table when the LLM is down or
+misses its deadline.
+
+Questions are indexed by the canonical skills they mention (skill taxonomy)
+in an inverted index; a query with the resume's skills ranks candidates by
+TF-IDF, then prefers the requested difficulty and higher ratings.
+
+Benchmark (query latency over a synthetic history):
+
+    python question_retriever.py --questions 50000
+"""
+import math
+import threading
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+
+from skill_taxonomy import get_taxonomy
+
+GENERAL = "_general"  # index term for questions that mention no skill
+
+# Interaction types that hold real interview questions: the web app's "Interview", the
+# question types of the generators and the Streamlit interview modes. Quiz and Arena rows
+# are scores and coding problems, not questions to ask.
+INTERVIEW_TYPES = ("Interview", "Technical", "Behavioral", "Project", "Standard", "JD Matcher", "STAR Coach")
+# Question text saved for turns without a real question (e.g. the first /next turn)
+PLACEHOLDER_QUESTIONS = ("Intro", "Quiz Session")
+
+
+class QuestionRetriever:
+    """
+    Inverted index over distinct interview questions rated at least `min_rating`.
+    New interactions are picked up incrementally (by row id) at most every
+    `refresh_s` seconds, so the index never blocks on a full reload.
+    """
+    def __init__(self, db=None, min_rating: int = 7, refresh_s: float = 30, seed: int = None):
+        self.db = db
+        self.min_rating = min_rating
+        self.refresh_s = refresh_s
+        self.docs = []        # doc id -> {"question", "difficulty", "type", "topic", "rating"}
+        self.postings = {}    # term -> {doc id: term frequency}
+        self._by_text = {}    # normalized question text -> doc id
+        self._last_row = 0
+        self._refreshed_at = None
+        self._lock = threading.Lock()
+        self._rng = np.random.default_rng(seed)
+        self._dirty = True
+        self.served = 0
+        self.misses = 0
+
+    def add(self, question: str, difficulty: str = None, q_type: str = None, rating: float = 0):
+        """Indexes one question; a repeat of a known question only raises its rating."""
+        text = (question or "").strip()
+        if not text:
+            return
+        key = " ".join(text.lower().split())
+        with self._lock:
+            doc_id = self._by_text.get(key)
+            if doc_id is not None:
+                self.docs[doc_id]["rating"] = max(self.docs[doc_id]["rating"], rating or 0)
+                self._dirty = True
+                return
+            hits = get_taxonomy().match(text)["skills"]
+            terms = Counter({skill: len(positions) for skill, positions in hits.items()}) or Counter({GENERAL: 1})
+            doc_id = len(self.docs)
+            self.docs.append({
+                "question": text,
+                "difficulty": difficulty,
+                "type": q_type or "Technical",
+                "topic": max(terms, key=terms.get) if GENERAL not in terms else "General",
+                "rating": rating or 0,
+            })
+            self._by_text[key] = doc_id
+            for term, tf in terms.items():
+                self.postings.setdefault(term, {})[doc_id] = tf
+            self._dirty = True
+
+    def refresh(self, force: bool = False):
+        """Pulls rows added to the interactions table since the last refresh."""
+        if self.db is None:
+            return
+        now = time.monotonic()
+        if not force and self._refreshed_at is not None and now - self._refreshed_at < self.refresh_s:
+            return
+        self._refreshed_at = now
+        rows = self.db.get_rated_questions(self.min_rating, INTERVIEW_TYPES, self._last_row, PLACEHOLDER_QUESTIONS)
+        for row_id, question, difficulty, q_type, rating in rows:
+            self.add(question, difficulty, q_type, rating)
+            self._last_row = max(self._last_row, row_id)
+
+    def _arrays(self):
+        """NumPy views of the index, rebuilt after questions were added."""
+        if self._dirty:
+            self._term_arrays = {
+                term: (np.fromiter(postings.keys(), dtype=np.int64, count=len(postings)),
+                       1 + np.log(np.fromiter(postings.values(), dtype=np.float64, count=len(postings))))
+                for term, postings in self.postings.items()
+            }
+            self._ratings = np.array([doc["rating"] for doc in self.docs], dtype=np.float64)
+            self._difficulties = np.array([doc["difficulty"] or "" for doc in self.docs], dtype=object)
+            self._dirty = False
+        return self._term_arrays, self._ratings, self._difficulties
+
+    def retrieve(self, skills: Iterable[str], difficulty: str = None, count: int = 1,
+                 exclude: Callable[[str], bool] = None) -> List[Dict[str, Any]]:
+        """
+        Up to `count` questions for a resume with `skills`, best first. Skills
+        are canonicalized through the taxonomy; questions for which
+        `exclude(text)` is true (e.g. already asked) are skipped.
+        """
+        self.refresh()
+        taxonomy = get_taxonomy()
+        terms = {taxonomy.canonical(skill) or skill.lower() for skill in skills if skill}
+        with self._lock:
+            if not self.docs:
+                self.misses += 1
+                return []
+            term_arrays, ratings, difficulties = self._arrays()
+            total = len(self.docs)
+            scores = np.zeros(total)
+            matched = [term_arrays[term] for term in terms if term in term_arrays]
+            for doc_ids, weights in matched:
+                scores[doc_ids] += weights * math.log(1 + total / len(doc_ids))
+            if matched:
+                candidates = np.flatnonzero(scores)
+            else:
+                # No skill overlap: any well-rated general (e.g. behavioral) question
+                candidates = term_arrays[GENERAL][0] if GENERAL in term_arrays else np.array([], dtype=np.int64)
+
+            # Rank: TF-IDF (to 3 decimals), then requested difficulty, then rating
+            # (0-10); random tie-break so repeated fallbacks vary the question
+            key = (np.round(scores[candidates], 3) * 1e7 + (difficulties[candidates] == difficulty) * 1e3
+                   + ratings[candidates] * 10 + self._rng.random(len(candidates)) * 9)
+            results, start = [], 0
+            # Only the best few are sorted; widen the window when `exclude` rejects them
+            while start < len(candidates) and len(results) < count:
+                end = min(len(candidates), start + max(8, count * 4))
+                top = np.argpartition(-key, end - 1)[:end] if end < len(candidates) else np.arange(len(candidates))
+                window = top[np.argsort(-key[top])][start:end]
+                for index in window:
+                    doc = self.docs[int(candidates[index])]
+                    if exclude is not None and exclude(doc["question"]):
+                        continue
+                    results.append({
+                        "question": doc["question"],
+                        "type": doc["type"],
+                        "topic": doc["topic"],
+                        "hints": [],
+                        "source": "retrieval",
+                    })
+                    if len(results) >= count:
+                        break
+                start = end
+        if results:
+            self.served += 1
+        else:
+            self.misses += 1
+        return results
+
+    def retrieve_one(self, skills: Iterable[str], difficulty: str = None,
+                     exclude: Callable[[str], bool] = None) -> Optional[Dict[str, Any]]:
+        results = self.retrieve(skills, difficulty, 1, exclude)
+        return results[0] if results else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"questions": len(self.docs), "terms": len(self.postings), "served": self.served, "misses": self.misses}
+
+
+if __name__ == "__main__":
+    import argparse
+    import random
+    import statistics
+
+    parser = argparse.ArgumentParser(description="Benchmark QuestionRetriever queries")
+    parser.add_argument("--questions", type=int, default=50000)
+    parser.add_argument("--queries", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    skills = list(get_taxonomy().skills)
+    templates = ["How would you scale a {} service to {} users?", "What trade-offs did you make using {} in project {}?",
+                 "Explain how {} handles failure case {}.", "Describe debugging a {} issue that took {} hours."]
+    retriever = QuestionRetriever(seed=args.seed)
+    started = time.perf_counter()
+    for _ in range(args.questions):
+        question = rng.choice(templates).format(rng.choice(skills), rng.randint(1, 10 ** 6))
+        retriever.add(question, rng.choice(["Easy", "Medium", "Hard"]), "Technical", rng.randint(7, 10))
+    print(f"indexed {args.questions} questions in {time.perf_counter() - started:.1f}s")
+
+    timings = []
+    for _ in range(args.queries):
+        resume_skills = rng.sample(skills, rng.randint(3, 15))
+        started = time.perf_counter()
+        retriever.retrieve_one(resume_skills, "Medium")
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    print(f"{args.queries} queries: median {statistics.median(timings):.2f}ms, "
+          f"p99 {timings[int(len(timings) * 0.99) - 1]:.2f}ms")
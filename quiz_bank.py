@@ -0,0 +1,135 @@
+import asyncio
+import logging
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional
+
+from skill_taxonomy import get_taxonomy
+
+logger = logging.getLogger(__name__)
+
+
+class QuizBank:
+    """
+    Serves /api/quiz from a per-skill MCQ pool stored in the database.
+    A background worker keeps the pools of the most requested skills (plus
+    the opt-in `seed_skills`) above `low_water` questions by generating
+    batches with the LLM; requests only fall back to live generation when the
+    pool cannot supply a full quiz the session has not already seen.
+
+    Only skills known to the skill taxonomy are pooled and counted as demand
+    (at most `max_tracked` of them), so client-supplied strings cannot drive
+    background LLM spend.
+    """
+    def __init__(self, db, llm, seed_skills: List[str] = (), low_water: int = 10, high_water: int = 30,
+                 max_skills: int = 20, interval_s: float = 60, max_sessions: int = 1000, max_tracked: int = 200):
+        self.db = db
+        self.llm = llm
+        self.seed_skills = self._known(seed_skills)
+        self.low_water = low_water
+        self.high_water = high_water
+        self.max_skills = max_skills
+        self.interval_s = interval_s
+        self.max_sessions = max_sessions
+        self.max_tracked = max_tracked
+        self.demand = Counter()
+        self._served = OrderedDict()  # session_id -> set of served question ids
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self.pool_hits = 0
+        self.live_fallbacks = 0
+        self.generated = 0
+
+    def start(self):
+        if self._task is None and self.llm.is_configured():
+            self._task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def get_quiz(self, skills: List[str], count: int = 5, session_id: Optional[str] = None) -> List[Dict[str, Any]]:
+        """`session_id` (a session or the candidate's resume id) keeps pooled questions from repeating."""
+        requested = [s.strip() for s in skills if s and s.strip()][:5]
+        known = self._known(requested)
+        self._count_demand(known)
+        served = self._served_ids(session_id)
+
+        questions = await asyncio.to_thread(self.db.sample_quiz_questions, known, count, served) if known else []
+        if len(questions) >= count:
+            self.pool_hits += 1
+            served.update(q.pop("id") for q in questions)
+        else:
+            self.live_fallbacks += 1
+            questions = await self.llm.generate_quiz(requested)
+
+        self._wakeup.set()
+        return questions
+
+    def stats(self) -> Dict[str, Any]:
+        requests = self.pool_hits + self.live_fallbacks
+        return {
+            "pool_hits": self.pool_hits,
+            "live_fallbacks": self.live_fallbacks,
+            "pool_hit_rate": self.pool_hits / requests if requests else 0.0,
+            "generated": self.generated,
+            "tracked_skills": len(self.demand),
+        }
+
+    @staticmethod
+    def _known(skills: List[str]) -> List[str]:
+        """Canonical taxonomy names of `skills`; unknown skills are dropped."""
+        taxonomy = get_taxonomy()
+        return list(dict.fromkeys(name for name in map(taxonomy.canonical, skills) if name))
+
+    def _count_demand(self, skills: List[str]):
+        self.demand.update(skills)
+        if len(self.demand) > self.max_tracked:
+            self.demand = Counter(dict(self.demand.most_common(self.max_tracked)))
+
+    def _served_ids(self, session_id: Optional[str]) -> set:
+        if not session_id:
+            return set()
+        served = self._served.pop(session_id, None) or set()
+        self._served[session_id] = served
+        while len(self._served) > self.max_sessions:
+            self._served.popitem(last=False)
+        return served
+
+    def _hot_skills(self) -> List[str]:
+        hot = [skill for skill, _ in self.demand.most_common(self.max_skills)]
+        return list(dict.fromkeys(hot + self.seed_skills))
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refill()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Quiz bank refill error: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval_s)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def refill(self):
+        """Top up every hot skill below the low-water mark to the high-water mark."""
+        skills = self._hot_skills()
+        sizes = await asyncio.to_thread(self.db.quiz_pool_sizes, skills)
+        for skill in skills:
+            size = sizes.get(skill, 0)
+            if size >= self.low_water:
+                continue
+            while size < self.high_water:
+                batch = await self.llm.generate_quiz([skill], fresh=True)
+                added = await asyncio.to_thread(self.db.add_quiz_questions, skill, batch)
+                if not added:
+                    break  # LLM error or only duplicates; retry on the next cycle
+                size += added
+                self.generated += added
@@ -0,0 +1,117 @@
+import asyncio
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from text_budget import CHARS_PER_TOKEN, clip
+
+# Most relevant first: when the budget runs out, later sections are cut
+SECTIONS = (
+    ("headline", "Profile"),
+    ("summary", "Summary"),
+    ("roles", "Roles"),
+    ("skills", "Skills"),
+    ("key_experience", "Key experience"),
+    ("projects", "Projects"),
+)
+
+
+def resume_id(resume_text: str) -> str:
+    """Content hash identifying a resume across requests and restarts."""
+    return hashlib.sha256(resume_text.encode("utf-8")).hexdigest()
+
+
+def build_digest(parsed: Dict[str, List[str]], summary: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Merges ResumeParser.parse() output with the LLM summary. Rule-based
+    sentences are only used where the summary is missing a section.
+    """
+    summary = summary or {}
+    skills = list(dict.fromkeys(sorted(parsed.get("skills", [])) + sorted(parsed.get("technologies", []))))
+    return {
+        "headline": clip(summary.get("headline", ""), 200),
+        "summary": clip(summary.get("summary", ""), 600),
+        "roles": sorted(parsed.get("roles", [])),
+        "skills": skills,
+        "key_experience": [clip(s, 200) for s in summary.get("key_experience") or parsed.get("experience", [])[:8]],
+        "projects": [clip(s, 200) for s in summary.get("projects") or parsed.get("projects", [])[:6]],
+    }
+
+
+def render_digest(digest: Dict[str, Any], token_budget: int) -> str:
+    """Prompt block for a digest, cut to `token_budget` tokens section by section."""
+    remaining = token_budget * CHARS_PER_TOKEN
+    lines = []
+    for key, title in SECTIONS:
+        value = digest.get(key)
+        if not value or remaining <= 0:
+            continue
+        if isinstance(value, list):
+            if key in ("roles", "skills"):
+                block = [f"{title}: {', '.join(value)}"]
+            else:
+                block = [f"{title}:"] + [f"- {item}" for item in value]
+        else:
+            block = [f"{title}: {value}"]
+        for line in block:
+            if len(line) + 1 > remaining:
+                if remaining > 20:
+                    lines.append(clip(line, remaining - 1))
+                remaining = 0
+                break
+            lines.append(line)
+            remaining -= len(line) + 1
+    return "\n".join(lines)
+
+
+class ResumeDigestStore:
+    """
+    Resume digests keyed by content hash: an in-process LRU in front of the
+    `resume_digests` table (when a DBHandler is given), so a digest computed
+    once at upload is reused by every later prompt for that resume.
+
+    The table also keeps the raw resume text, so clients can send only the
+    resume id (see `text`). Rows are never expired: deleting a candidate's
+    data means deleting their `resume_digests` row as well.
+    """
+    def __init__(self, db=None, max_items: int = 256):
+        self.db = db
+        self.max_items = max_items
+        self._items = OrderedDict()  # resume id -> digest, or None when known to be absent
+        self._lock = threading.Lock()
+
+    def get(self, rid: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if rid in self._items:
+                self._items.move_to_end(rid)
+                return self._items[rid]
+        record = self.db.get_resume_digest(rid) if self.db is not None else None
+        digest = record["digest"] if record else None
+        self._remember(rid, digest)
+        return digest
+
+    async def aget(self, rid: str) -> Optional[Dict[str, Any]]:
+        """`get` with a miss loaded from SQLite in a worker thread."""
+        with self._lock:
+            if rid in self._items:
+                self._items.move_to_end(rid)
+                return self._items[rid]
+        return await asyncio.to_thread(self.get, rid)
+
+    def text(self, rid: str) -> Optional[str]:
+        """Raw resume text for clients that only send the resume id."""
+        record = self.db.get_resume_digest(rid) if self.db is not None else None
+        return record["text"] if record else None
+
+    def put(self, rid: str, resume_text: str, digest: Dict[str, Any]):
+        if self.db is not None:
+            self.db.save_resume_digest(rid, resume_text, digest)
+        self._remember(rid, digest)
+
+    def _remember(self, rid: str, digest: Optional[Dict[str, Any]]):
+        with self._lock:
+            self._items[rid] = digest
+            self._items.move_to_end(rid)
+            while len(self._items) > self.max_items:
+                self._items.popitem(last=False)
@@ -1,60 +1,136 @@
 import re
-from typing import List, Dict, Any
-from pdfminer.high_level import extract_text
-import utils
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import cached_property
+from typing import List, Dict, Any, BinaryIO, Union
+from config import Config
+from skill_taxonomy import get_taxonomy
+from pdf_extractor import PDFExtractor
+
+SENTENCE_SPLIT = re.compile(r'[.!?]+')
+EXPERIENCE_PATTERN = re.compile(r'(\bexperience\b|\bworked at\b|\bposition\b|\brole\b|\bcompany\b)', re.IGNORECASE)
+PROJECT_PATTERN = re.compile(r'(project|developed|built|created|designed)', re.IGNORECASE)
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'\b(?:\+?(\d{1,3}))?[-. (]*(\d{3})[-. )]*(\d{3})[-. ]*(\d{4})\b')
+
+_pdf_extractor = None
+
+def pdf_extractor() -> PDFExtractor:
+    global _pdf_extractor
+    if _pdf_extractor is None:
+        _pdf_extractor = PDFExtractor(max_pages=Config.PDF_MAX_PAGES, timeout_s=Config.PDF_TIMEOUT_S,
+                                      max_memory_mb=Config.PDF_MAX_MEMORY_MB, fast_layout=Config.PDF_FAST_LAYOUT,
+                                      isolated=Config.PDF_ISOLATED)
+    return _pdf_extractor
+
+# Parsed resumes by SHA-256 of the file bytes (see ResumeParser.load)
+_parsed_cache = OrderedDict()
+_parsed_cache_lock = threading.Lock()
 
 class ResumeParser:
-    def __init__(self, resume_path: str):
-        self.resume_path = resume_path
-        self.text = self._extract_text()
-
-    def _extract_text(self) -> str:
-        if self.resume_path.lower().endswith('.pdf'):
-            return extract_text(self.resume_path)
-        elif self.resume_path.lower().endswith('.txt'):
-            with open(self.resume_path, 'r', encoding='utf-8') as f:
-                return f.read()
+    """
+    Accepts a file path, the file's bytes or a binary file-like object; bytes
+    are parsed in memory (PDF through a BytesIO stream, TXT by decoding).
+    Derived fields (sentences, keyword hits, experience, projects, quality) are
+    computed lazily once per instance; `load` additionally reuses instances
+    across requests for identical files. PDF extraction is bounded in pages,
+    time and memory; when a limit cuts it short, `warnings` says so and
+    `text` holds what was extracted.
+    """
+    def __init__(self, resume: Union[str, bytes, BinaryIO], filename: str = None):
+        self.warnings = []
+        if isinstance(resume, str):
+            self.resume_path = resume
+            self.filename = filename or resume
+            self.text = self._extract_text()
         else:
+            self.resume_path = None
+            self.filename = filename
+            data = resume if isinstance(resume, (bytes, bytearray)) else resume.read()
+            self.text = self._extract_text(bytes(data))
+
+    @classmethod
+    def load(cls, resume: Union[str, bytes, BinaryIO], filename: str = None) -> "ResumeParser":
+        """Parser for `resume`, shared with earlier uploads of the same file content."""
+        if isinstance(resume, str):
+            filename = filename or resume
+            with open(resume, 'rb') as f:
+                data = f.read()
+        else:
+            data = bytes(resume if isinstance(resume, (bytes, bytearray)) else resume.read())
+        # Taxonomy version in the key: an edited taxonomy file re-parses old uploads
+        key = (hashlib.sha256(data).hexdigest(), cls._format(filename, data), get_taxonomy().version)
+        with _parsed_cache_lock:
+            parser = _parsed_cache.get(key)
+            if parser is not None:
+                _parsed_cache.move_to_end(key)
+                return parser
+        parser = cls(data, filename)
+        with _parsed_cache_lock:
+            _parsed_cache[key] = parser
+            while len(_parsed_cache) > Config.RESUME_PARSE_CACHE_ITEMS:
+                _parsed_cache.popitem(last=False)
+        return parser
+
+    @staticmethod
+    def _format(filename: str, data: bytes = None) -> str:
+        if filename:
+            if filename.lower().endswith('.pdf'):
+                return 'pdf'
+            if filename.lower().endswith('.txt'):
+                return 'txt'
             raise ValueError('Unsupported file format. Use PDF or TXT.')
+        # Bytes without a name: sniff the PDF header
+        return 'pdf' if data is not None and data.startswith(b'%PDF-') else 'txt'
+
+    def _extract_text(self, data: bytes = None) -> str:
+        fmt = self._format(self.filename, data)
+        if data is None:
+            with open(self.resume_path, 'rb') as f:
+                data = f.read()
+        if fmt == 'pdf':
+            text, self.warnings = pdf_extractor().extract(data)
+            return text
+        return data.decode('utf-8')
+
+    @cached_property
+    def sentences(self) -> List[str]:
+        # Split by . ! ?
+        return [sent.strip() for sent in SENTENCE_SPLIT.split(self.text) if sent.strip()]
+
+    @cached_property
+    def keyword_hits(self) -> Dict[str, Dict[str, List[int]]]:
+        # Canonical names: "k8s" and "Kubernetes" are both reported as "kubernetes"
+        return get_taxonomy().match(self.text)
+
+    @cached_property
+    def _experience(self) -> List[str]:
+        return [sent for sent in self.sentences if EXPERIENCE_PATTERN.search(sent)]
+
+    @cached_property
+    def _projects(self) -> List[str]:
+        return [sent for sent in self.sentences if PROJECT_PATTERN.search(sent)]
+
+    def match_keywords(self) -> Dict[str, Dict[str, List[int]]]:
+        """Skill / technology / role hits with their positions, from a single scan of the text."""
+        return self.keyword_hits
 
     def extract_skills(self) -> List[str]:
         # Simple rule-based extraction using common skill keywords
-        skill_keywords = utils.load_skill_keywords()
-        found_skills = set()
-        for skill in skill_keywords:
-            if re.search(r'\b' + re.escape(skill) + r'\b', self.text, re.IGNORECASE):
-                found_skills.add(skill)
-        return list(found_skills)
+        return list(self.keyword_hits['skills'])
 
     def extract_experience(self) -> List[str]:
         # Extract experience sentences using regex splitting
-        experience = []
-        # Split by . ! ?
-        sentences = re.split(r'[.!?]+', self.text)
-        for sent in sentences:
-            sent = sent.strip()
-            if sent and re.search(r'(\bexperience\b|\bworked at\b|\bposition\b|\brole\b|\bcompany\b)', sent, re.IGNORECASE):
-                experience.append(sent)
-        return experience
+        return list(self._experience)
 
     def extract_projects(self) -> List[str]:
         # Look for project sections or keywords
-        projects = []
-        sentences = re.split(r'[.!?]+', self.text)
-        for sent in sentences:
-            sent = sent.strip()
-            if sent and re.search(r'(project|developed|built|created|designed)', sent, re.IGNORECASE):
-                projects.append(sent)
-        return projects
+        return list(self._projects)
 
     def extract_technologies(self) -> List[str]:
         # Use a list of common technologies
-        tech_keywords = utils.load_technology_keywords()
-        found_tech = set()
-        for tech in tech_keywords:
-            if re.search(r'\b' + re.escape(tech) + r'\b', self.text, re.IGNORECASE):
-                found_tech.add(tech)
-        return list(found_tech)
+        return list(self.keyword_hits['technologies'])
 
     def extract_role_based_info(self):
          # Heuristic to guess role from resume
@@ -66,6 +142,10 @@ class ResumeParser:
         Analyzes the resume for structure and content quality.
         Returns a score (0-100) and feedback.
         """
+        return {"score": self._quality["score"], "feedback": list(self._quality["feedback"])}
+
+    @cached_property
+    def _quality(self) -> Dict[str, Any]:
         score = 100
         feedback = []
         
@@ -79,13 +159,13 @@ class ResumeParser:
             feedback.append("Resume might be too long (> 2000 words). Consider summarizing.")
 
         # 2. Section Checks
-        if not self.extract_skills():
+        if not self.keyword_hits['skills']:
             score -= 20
             feedback.append("No explicit 'Skills' detected. Make sure to list your technical skills.")
         
         # Simple heuristic for experience/projects presence
-        has_experience = len(self.extract_experience()) > 0
-        has_projects = len(self.extract_projects()) > 0
+        has_experience = len(self._experience) > 0
+        has_projects = len(self._projects) > 0
         
         if not has_experience:
             score -= 15
@@ -96,11 +176,8 @@ class ResumeParser:
             feedback.append("No 'Projects' detected. Adding projects can boost your profile.")
 
         # 3. Contact Info Check (Basic Regex)
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        phone_pattern = r'\b(?:\+?(\d{1,3}))?[-. (]*(\d{3})[-. )]*(\d{3})[-. ]*(\d{4})\b'
-        
-        has_email = re.search(email_pattern, self.text)
-        has_phone = re.search(phone_pattern, self.text)
+        has_email = EMAIL_PATTERN.search(self.text)
+        has_phone = PHONE_PATTERN.search(self.text)
 
         if not has_email:
             score -= 5
@@ -116,12 +193,7 @@ class ResumeParser:
 
     def extract_roles(self) -> List[str]:
         # Use a list of common roles
-        role_keywords = utils.load_role_keywords()
-        found_roles = set()
-        for role in role_keywords:
-            if re.search(r'\b' + re.escape(role) + r'\b', self.text, re.IGNORECASE):
-                found_roles.add(role)
-        return list(found_roles)
+        return list(self.keyword_hits['roles'])
 
     def parse(self) -> Dict[str, List[str]]:
         return {
@@ -131,5 +203,3 @@ class ResumeParser:
             'technologies': self.extract_technologies(),
             'roles': self.extract_roles(),
         }
-
-import utils
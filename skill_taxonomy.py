@@ -0,0 +1,148 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from config import Config
+from keyword_matcher import KeywordMatcher
+
+logger = logging.getLogger(__name__)
+
+
+class SkillTaxonomy:
+    """
+    Index over the skill taxonomy data file (Config.SKILL_TAXONOMY_PATH):
+
+        {"non_technical_categories": [...],
+         "skills": [{"name": "kubernetes", "category": "devops", "parent": "docker", "aliases": ["k8s"]}, ...],
+         "roles": [{"name": "software engineer", "aliases": ["swe"]}, ...]}
+
+    Lookups by name or alias are dict hits; `match` scans a text once with a
+    KeywordMatcher over every name and alias, and reports canonical names.
+    """
+    def __init__(self, data: Dict[str, Any]):
+        self.version = None  # mtime of the data file it was built from
+        self.non_technical = set(data.get("non_technical_categories", []))
+        self.skills = {}  # canonical name -> entry
+        self.roles = {}
+        self._aliases = {}  # lowercase name or alias -> canonical skill name
+        self._role_aliases = {}
+        for entry in data.get("skills", []):
+            self._add(entry, self.skills, self._aliases)
+        for entry in data.get("roles", []):
+            self._add(entry, self.roles, self._role_aliases)
+        self._children = {}
+        for name, entry in self.skills.items():
+            if entry.get("parent"):
+                self._children.setdefault(entry["parent"], []).append(name)
+
+        technical = [alias for alias, name in self._aliases.items() if self.is_technical(name)]
+        self.matcher = KeywordMatcher({
+            "skills": list(self._aliases),
+            "technologies": technical,
+            "roles": list(self._role_aliases),
+        })
+
+    @staticmethod
+    def _add(entry: Dict[str, Any], index: Dict[str, Dict], aliases: Dict[str, str]):
+        name = entry["name"].strip().lower()
+        if name in index:
+            logger.warning(f"Skill taxonomy: duplicate entry '{name}' ignored")
+            return
+        index[name] = dict(entry, name=name)
+        for alias in [name] + list(entry.get("aliases", [])):
+            alias = alias.strip().lower()
+            if aliases.setdefault(alias, name) != name:
+                logger.warning(f"Skill taxonomy: alias '{alias}' of '{name}' already belongs to '{aliases[alias]}'")
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillTaxonomy":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def canonical(self, term: str) -> Optional[str]:
+        """Canonical skill name for a name or alias ("k8s" -> "kubernetes"), or None."""
+        return self._aliases.get(term.strip().lower())
+
+    def canonical_role(self, term: str) -> Optional[str]:
+        return self._role_aliases.get(term.strip().lower())
+
+    def category(self, name: str) -> Optional[str]:
+        entry = self.skills.get(self.canonical(name) or "")
+        return entry.get("category") if entry else None
+
+    def parent(self, name: str) -> Optional[str]:
+        entry = self.skills.get(self.canonical(name) or "")
+        return entry.get("parent") if entry else None
+
+    def children(self, name: str) -> List[str]:
+        return list(self._children.get(self.canonical(name) or name, []))
+
+    def is_technical(self, name: str) -> bool:
+        entry = self.skills.get(name)
+        return entry is not None and entry.get("category") not in self.non_technical
+
+    def normalize(self, terms: Iterable[str]) -> List[str]:
+        """Canonical, de-duplicated names in input order; unknown terms are kept as given."""
+        return list(dict.fromkeys(self.canonical(term) or term for term in terms if term))
+
+    def match(self, text: str) -> Dict[str, Dict[str, List[int]]]:
+        """category -> {canonical name: [start positions]} for skills, technologies and roles."""
+        found = self.matcher.match(text)
+        result = {}
+        for category, hits in found.items():
+            lookup = self._role_aliases if category == "roles" else self._aliases
+            merged = {}
+            for alias, positions in hits.items():
+                merged.setdefault(lookup[alias.lower()], []).extend(positions)
+            result[category] = {name: sorted(positions) for name, positions in merged.items()}
+        return result
+
+
+class _TaxonomyCache:
+    """Process-wide taxonomy, rebuilt when the data file's mtime changes."""
+    def __init__(self):
+        self.taxonomy = None
+        self.path = None
+        self.mtime = None
+        self.checked_at = 0.0
+        self.lock = threading.Lock()
+
+
+_cache = _TaxonomyCache()
+
+
+def get_taxonomy(path: str = None) -> SkillTaxonomy:
+    """
+    The shared SkillTaxonomy. The file's mtime is checked at most every
+    Config.SKILL_TAXONOMY_CHECK_S seconds; an edited file is re-indexed without
+    a restart, and a file that fails to load keeps the previous index.
+    """
+    path = path or Config.SKILL_TAXONOMY_PATH
+    now = time.monotonic()
+    taxonomy = _cache.taxonomy
+    if taxonomy is not None and _cache.path == path and now - _cache.checked_at < Config.SKILL_TAXONOMY_CHECK_S:
+        return taxonomy
+    with _cache.lock:
+        _cache.checked_at = now
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError as e:
+            if _cache.taxonomy is None:
+                raise
+            logger.error(f"Skill taxonomy: cannot stat {path}: {e}")
+            return _cache.taxonomy
+        if _cache.taxonomy is not None and _cache.path == path and _cache.mtime == mtime:
+            return _cache.taxonomy
+        try:
+            taxonomy = SkillTaxonomy.from_file(path)
+        except (OSError, ValueError, KeyError) as e:
+            if _cache.taxonomy is None:
+                raise
+            logger.error(f"Skill taxonomy: reload of {path} failed, keeping previous index: {e}")
+            return _cache.taxonomy
+        taxonomy.version = mtime
+        _cache.taxonomy, _cache.path, _cache.mtime = taxonomy, path, mtime
+        return taxonomy
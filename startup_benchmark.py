@@ -0,0 +1,57 @@
+"""
+Cold-start import cost of the app entry points, each measured in a fresh
+interpreter so nothing is already cached in sys.modules:
+
+    python startup_benchmark.py                      # backend.server and main
+    python startup_benchmark.py question_generator --runs 10
+
+Prints the median wall time per module and the slowest imports it pulled in
+(from `python -X importtime`).
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def import_once(module: str):
+    """(wall seconds, [(self microseconds, imported module)]) for one cold import."""
+    started = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            cwd=ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr.strip().splitlines()[-1]}")
+    imports = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|", 2)
+        imports.append((int(self_us), name.strip()))
+    return elapsed, sorted(imports, reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold import time of the app entry points")
+    parser.add_argument("modules", nargs="*", default=["backend.server", "main"])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=5, help="slowest imports to list per module")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        try:
+            runs = [import_once(module) for _ in range(args.runs)]
+        except RuntimeError as e:
+            print(e)
+            continue
+        print(f"{module}: median {statistics.median(t for t, _ in runs) * 1000:.0f} ms over {args.runs} runs")
+        for self_us, name in runs[-1][1][:args.top]:
+            print(f"    {self_us / 1000:8.1f} ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+
+@pytest.fixture
+def mock_llm():
+    """
+    Starts mock_llm_server on a free local port: `mock_llm(**create_app kwargs)`
+    returns its base URL. Servers are stopped after the test.
+    """
+    from mock_llm_server import create_app, serve_in_thread
+
+    servers = []
+
+    def start(**kwargs):
+        base_url, server = serve_in_thread(create_app(**kwargs))
+        servers.append(server)
+        return base_url
+
+    yield start
+    for server in servers:
+        server.should_exit = True
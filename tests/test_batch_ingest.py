@@ -0,0 +1,30 @@
+import json
+import time
+
+import batch_ingest
+
+
+def test_run_parses_in_capped_workers(tmp_path):
+    (tmp_path / "a.txt").write_text("Python developer at Acme, built a Docker project.")
+    (tmp_path / "b.txt").write_text("Rust engineer.")
+    output = str(tmp_path / "parsed.jsonl")
+
+    stats = batch_ingest.run([str(tmp_path)], output, workers=2, timeout_s=5, max_memory_mb=1024)
+    assert stats["processed"] == 2 and stats["failed"] == 0
+    with open(output) as f:
+        records = {json.loads(line)["path"].rsplit("/", 1)[-1]: json.loads(line) for line in f}
+    assert "python" in records["a.txt"]["parsed"]["skills"]
+
+
+def test_slow_resume_times_out_in_the_worker(tmp_path, monkeypatch):
+    class SlowParser:
+        def __init__(self, data, filename=None):
+            time.sleep(2)
+    monkeypatch.setattr(batch_ingest, "ResumeParser", SlowParser)
+    path = tmp_path / "slow.txt"
+    path.write_text("text")
+
+    started = time.perf_counter()
+    record = batch_ingest.process_resume(str(path), "sha", timeout_s=0.1)
+    assert time.perf_counter() - started < 1
+    assert record["error"].startswith("TimeoutError")
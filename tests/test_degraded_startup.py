@@ -0,0 +1,42 @@
+import asyncio
+
+import httpx
+import pytest
+
+RESUME = "Python backend engineer with Docker and AWS."
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path):
+    """backend.server as left by a failed handler initialization."""
+    monkeypatch.chdir(tmp_path)  # interview.db, if the backend is first imported here
+    server = pytest.importorskip("backend.server")
+    for name in ("API_KEY", "llm", "prefetcher", "quiz_bank", "retriever"):
+        monkeypatch.setattr(server, name, None)
+    return server
+
+
+async def request(server, method, path, **kwargs):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://test") as client:
+        return await client.request(method, path, **kwargs)
+
+
+def test_upload_works_without_llm(server):
+    pytest.importorskip("python_multipart.multipart")
+    response = asyncio.run(request(server, "POST", "/api/upload", files={"file": ("resume.txt", RESUME.encode())}))
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["resume_id"] is None  # no digest stored; clients send the text
+    assert "python" in data["parsed"]["skills"]
+
+
+def test_interview_serves_offline_questions_without_llm(server):
+    start = asyncio.run(request(server, "POST", "/api/interview/start", json={"resume_text": RESUME, "role": "SWE"}))
+    assert start.status_code == 200 and start.json()["question"]
+
+    body = {"resume_text": RESUME, "history": [{"question": start.json()["question"], "answer": "a"}],
+            "last_answer": "a", "skipped": True}
+    following = asyncio.run(request(server, "POST", "/api/interview/next", json=body))
+    assert following.status_code == 200 and following.json()["next_question"]["question"]
+
+    assert asyncio.run(request(server, "GET", "/api/llm/routes")).json() == {"enabled": False}
@@ -0,0 +1,72 @@
+import asyncio
+import json
+import uuid
+
+import httpx
+import pytest
+
+DEADLINE_S = 0.05
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path, mock_llm):
+    """`server(**mock kwargs)`: backend.server on a mock LLM that is slower than the fallback deadline."""
+    monkeypatch.chdir(tmp_path)  # interview.db, if the backend is first imported here
+    server = pytest.importorskip("backend.server")
+    from config import Config
+    from llm_handler import AsyncLLMHandler
+
+    def make(**kwargs):
+        monkeypatch.setattr(Config, "GROQ_BASE_URL", mock_llm(**kwargs))
+        monkeypatch.setattr(Config, "LLM_CASSETTE_MODE", "")
+        monkeypatch.setattr(Config, "LLM_FALLBACK_DEADLINE_S", DEADLINE_S)
+        monkeypatch.setattr(server, "API_KEY", "mock")
+        monkeypatch.setattr(server, "prefetcher", None)
+        monkeypatch.setattr(server, "llm", AsyncLLMHandler("mock", db=server.db))
+        return server
+    return make
+
+
+def payload():
+    return {"resume_text": "Python backend engineer with Docker and AWS.",
+            "history": [{"question": "Tell me about yourself.", "answer": "I build APIs."}],
+            "last_answer": f"Token bucket per client ({uuid.uuid4().hex})", "session_id": "deadline-test"}
+
+
+async def post(server, path, body):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=server.app), base_url="http://test") as client:
+        response = await client.post(path, json=body)
+        response.raise_for_status()
+        # Let the late evaluation land before the loop closes
+        if server._background_tasks:
+            await asyncio.wait(set(server._background_tasks))
+        return response
+
+
+def saved(server, answer):
+    df = server.db.get_analytics()
+    return df[df["answer"] == answer].to_dict("records")
+
+
+def test_next_falls_back_but_keeps_the_evaluation(server):
+    server = server(latency=lambda: 0.3)
+    body = payload()
+    data = asyncio.run(post(server, "/api/interview/next", body)).json()
+
+    assert data["evaluation"]["pending"] is True
+    assert data["next_question"]["question"]
+    # The LLM's evaluation arrived after the response and was saved with the answer
+    [row] = saved(server, body["last_answer"])
+    assert row["rating"] == 7
+
+
+def test_stream_sends_offline_question_then_evaluation(server):
+    server = server(chunk_size=8, chunk_delay_s=0.02)
+    body = payload()
+    text = asyncio.run(post(server, "/api/interview/next/stream", body)).text
+    events = [(block.split("\n")[0][len("event: "):], json.loads(block.split("\n")[1][len("data: "):]))
+              for block in text.strip().split("\n\n")]
+
+    assert [name for name, _ in events] == ["next_question", "evaluation", "done"]
+    assert dict(events)["evaluation"]["rating"] == 7
+    assert saved(server, body["last_answer"])[0]["rating"] == 7
@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+
+from config import Config
+from llm_handler import AsyncLLMHandler, LLMHandler
+from resume_digest import resume_id
+
+RESUME = "Python backend engineer with Docker and AWS."
+ASKED = ["How would you shard a Postgres table?", "Explain how Docker layers are cached."]
+REPEATS = {"questions": [{"question": q, "type": "Technical"} for q in ASKED]}
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # llm_cache.db
+    monkeypatch.setattr(Config, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "LLM_CASSETTE_MODE", "")
+
+
+def asked_before(llm):
+    for question in ASKED:
+        llm.asked.add(resume_id(RESUME), question)
+    return llm
+
+
+def test_repeats_are_not_returned():
+    llm = asked_before(LLMHandler("mock"))
+    llm._generate_json = lambda prompt, task: REPEATS
+    assert llm.generate_questions(RESUME, "Software Engineer", "Medium", count=2) == []
+
+
+def test_async_repeats_are_not_returned():
+    llm = asked_before(AsyncLLMHandler("mock"))
+
+    async def generate_json(prompt, task):
+        return REPEATS
+    llm._generate_json = generate_json
+    assert asyncio.run(llm.generate_questions(RESUME, "Software Engineer", "Medium", count=2)) == []
@@ -0,0 +1,48 @@
+import asyncio
+import logging
+
+from interaction_log import InteractionLog
+
+
+class FlakyDB:
+    """save_interactions fails (writes nothing) for the first `failures` calls."""
+    def __init__(self, failures: int):
+        self.failures = failures
+        self.rows = []
+
+    def save_interactions(self, records):
+        if self.failures:
+            self.failures -= 1
+            return 0
+        self.rows.extend(records)
+        return len(records)
+
+
+def record(i):
+    return {"session_id": "s", "role": "SWE", "difficulty": "Medium", "question": f"Q{i}?", "answer": "a",
+            "feedback": "f", "rating": 7, "q_type": "Interview", "candidate_id": "c"}
+
+
+async def run(db, count, **kwargs):
+    log = InteractionLog(db, batch_size=4, flush_interval_s=0.01, **kwargs)
+    log.start()
+    for i in range(count):
+        await log.enqueue(**record(i))
+    await log.stop()
+    return log
+
+
+def test_failed_batch_is_retried():
+    db = FlakyDB(failures=2)
+    log = asyncio.run(run(db, 10))
+    assert [row["question"] for row in db.rows] == [f"Q{i}?" for i in range(10)]
+    assert log.stats()["failed"] == 0 and log.stats()["retrying"] == 0
+
+
+def test_records_are_logged_when_retries_run_out(caplog):
+    db = FlakyDB(failures=100)
+    with caplog.at_level(logging.ERROR, logger="interaction_log"):
+        log = asyncio.run(run(db, 3, max_attempts=2))
+    assert db.rows == []
+    assert log.stats()["failed"] == 3
+    assert "Q0?" in caplog.text and "Q2?" in caplog.text
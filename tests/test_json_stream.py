@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from json_stream import IncrementalJSONObjectParser
+
+DOCUMENT = {
+    "evaluation": {"feedback": "Say \"why\", not just {what}: C:\\temp\\n is a path", "rating": 8},
+    "next_question": {"question": "What does `a[1:]` return?", "hints": ["slices", "copies"]},
+    "score": 7.5,
+    "final": True,
+}
+
+
+def feed_all(chunks):
+    parser = IncrementalJSONObjectParser()
+    fields = []
+    for chunk in chunks:
+        fields.extend(parser.feed(chunk))
+    return parser, fields
+
+
+def test_whole_document():
+    parser, fields = feed_all([json.dumps(DOCUMENT)])
+    assert fields == list(DOCUMENT.items())
+    assert parser.done
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 5, 7, 16])
+def test_fixed_chunk_sizes(size):
+    text = json.dumps(DOCUMENT)
+    _, fields = feed_all(text[i:i + size] for i in range(0, len(text), size))
+    assert fields == list(DOCUMENT.items())
+
+
+def test_every_two_way_split():
+    # Covers boundaries inside keys, inside string values and between a backslash and the escaped char
+    text = json.dumps(DOCUMENT)
+    for split in range(1, len(text)):
+        _, fields = feed_all([text[:split], text[split:]])
+        assert fields == list(DOCUMENT.items()), f"split at {split}: {text[split - 5:split + 5]!r}"
+
+
+@pytest.mark.parametrize("value", ['"ends with a backslash \\\\"', '"quote \\" then brace }"', '"\\\\\\""'])
+def test_escapes_split_inside_string(value):
+    text = '{"a": ' + value + ', "b": 1}'
+    for split in range(1, len(text)):
+        _, fields = feed_all([text[:split], text[split:]])
+        assert fields == [("a", json.loads(value)), ("b", 1)]
+
+
+def test_fields_are_reported_as_soon_as_complete():
+    parser = IncrementalJSONObjectParser()
+    assert parser.feed('{"evaluation": {"rating": 8}') == [("evaluation", {"rating": 8})]
+    assert parser.feed(', "next_question": {"question": "Wh') == []
+    assert parser.feed('y?"}}') == [("next_question", {"question": "Why?"})]
+
+
+def test_trailing_number_before_close():
+    _, fields = feed_all(['{"a": 1, "b": 2', '3}'])
+    assert fields == [("a", 1), ("b", 23)]
+
+
+def test_code_fence_around_object():
+    text = "```json\n" + json.dumps(DOCUMENT, indent=2) + "\n```"
+    for size in (1, 4, 64):
+        parser, fields = feed_all(text[i:i + size] for i in range(0, len(text), size))
+        assert fields == list(DOCUMENT.items())
+        assert parser.done
+
+
+def test_text_after_object_is_ignored():
+    parser, fields = feed_all(['Here you go: {"a": 1}', ' and {"b": 2}'])
+    assert fields == [("a", 1)]
+    assert parser.done
+
+
+def test_malformed_value_is_dropped():
+    _, fields = feed_all(['{"a": nope, "b": 2}'])
+    assert fields == [("b", 2)]
@@ -0,0 +1,26 @@
+import threading
+
+from llm_cache import ResponseCache
+
+
+def test_memory_tier_does_not_wait_for_disk(tmp_path):
+    cache = ResponseCache(str(tmp_path / "llm_cache.db"))
+    cache.set("key", {"rating": 7})
+    with cache._db_lock:  # a disk read or commit in progress in another thread
+        result = []
+        reader = threading.Thread(target=lambda: (result.append(cache.get_memory("key")),
+                                                  cache.set_memory("other", 1)))
+        reader.start()
+        reader.join(timeout=1)
+        assert not reader.is_alive()
+    assert result == [{"rating": 7}]
+
+
+def test_disk_hit_refills_memory(tmp_path):
+    cache = ResponseCache(str(tmp_path / "llm_cache.db"), memory_items=1)
+    cache.set("a", 1)
+    cache.set("b", 2)  # evicts "a" from memory
+    assert cache.get_memory("a") is None
+    assert cache.get("a") == 1
+    assert cache.get_memory("a") == 1
+    assert cache.stats()["hits_disk"] == 1
@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+from config import Config
+from db_handler import DBHandler
+from llm_cassette import CassetteMissError
+from llm_handler import AsyncLLMHandler
+
+
+@pytest.fixture
+def handler(monkeypatch, tmp_path, mock_llm):
+    """`handler(mode)`: an AsyncLLMHandler on the mock LLM with the response cache off and a fresh cassette mode."""
+    monkeypatch.setattr(Config, "GROQ_BASE_URL", mock_llm())
+    monkeypatch.setattr(Config, "LLM_CACHE_ENABLED", False)
+    monkeypatch.setattr(Config, "LLM_CASSETTE_PATH", str(tmp_path / "cassettes" / "llm.jsonl"))
+    db = DBHandler(str(tmp_path / "interview.db"))
+
+    def make(mode):
+        monkeypatch.setattr(Config, "LLM_CASSETTE_MODE", mode)
+        return AsyncLLMHandler("mock", db=db)
+
+    yield make
+    db.close()
+
+
+async def star(llm, answer):
+    try:
+        return await llm.analyze_star("Tell me about a conflict.", answer)
+    finally:
+        await llm.aclose()
+
+
+def test_record_then_replay(handler, monkeypatch):
+    recorded = asyncio.run(star(handler("record"), "I talked to them."))
+    assert recorded["star_score"] == 6
+
+    # Replay must not touch the network: point the client at a closed port
+    monkeypatch.setattr(Config, "GROQ_BASE_URL", "http://127.0.0.1:9")
+    assert asyncio.run(star(handler("replay"), "I talked to them.")) == recorded
+
+
+def test_replay_miss_raises(handler):
+    asyncio.run(star(handler("record"), "I talked to them."))
+    llm = handler("replay")
+    with pytest.raises(CassetteMissError):
+        asyncio.run(llm._chat("A prompt that was never recorded", task="analyze_star"))
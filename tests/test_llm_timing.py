@@ -0,0 +1,74 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from config import Config
+from llm_handler import AsyncLLMHandler, LLMHandler
+
+QUEUE_S = 0.2
+PROVIDER_S = 0.02
+COMPLETION = SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content='{"rating": 7}'))],
+                             usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5))
+
+
+class SlowQueue:
+    """Scheduler stand-in whose admission takes QUEUE_S, as under rate-limit pressure."""
+    def call(self, task, cost, fn):
+        time.sleep(QUEUE_S)
+        return fn()
+
+    async def acall(self, task, cost, fn):
+        await asyncio.sleep(QUEUE_S)
+        return await fn()
+
+
+def create_sync(**kwargs):
+    time.sleep(PROVIDER_S)
+    return COMPLETION
+
+
+async def create_async(**kwargs):
+    await asyncio.sleep(PROVIDER_S)
+    return COMPLETION
+
+
+def p95_ms(llm):
+    [route] = llm.router.stats()["routes"].values()
+    return route["p95_ms"]
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # llm_cache.db
+    monkeypatch.setattr(Config, "LLM_CASSETTE_MODE", "")
+
+
+def test_router_sees_provider_time_only():
+    llm = LLMHandler("mock")
+    llm.scheduler = SlowQueue()
+    llm.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create_sync)))
+    llm._chat("prompt", task="evaluate_answer")
+    assert PROVIDER_S * 1000 <= p95_ms(llm) < QUEUE_S * 1000
+
+
+def test_async_router_sees_provider_time_only():
+    llm = AsyncLLMHandler("mock")
+    llm.scheduler = SlowQueue()
+    llm.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create_async)))
+    asyncio.run(llm._chat("prompt", task="evaluate_answer"))
+    assert PROVIDER_S * 1000 <= p95_ms(llm) < QUEUE_S * 1000
+
+
+def test_queue_wait_and_provider_time_are_split():
+    from metrics import LLM_CALL_SECONDS, LLM_QUEUE_SECONDS
+
+    llm = AsyncLLMHandler("mock")
+    llm.scheduler = SlowQueue()
+    llm.client = SimpleNamespace(chat=SimpleNamespace(completions=SimpleNamespace(create=create_async)))
+    asyncio.run(llm._chat("prompt", task="split_timing"))
+    queue_s = LLM_QUEUE_SECONDS._series[("split_timing",)][-1]
+    [provider_s] = [series[-1] for labels, series in LLM_CALL_SECONDS._series.items() if labels[0] == "split_timing"]
+    assert queue_s >= QUEUE_S
+    assert PROVIDER_S <= provider_s < QUEUE_S
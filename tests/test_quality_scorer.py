@@ -0,0 +1,38 @@
+import pytest
+
+from quality_scorer import score_resumes
+from resume_parser import ResumeParser
+
+FILLER = " ".join(["engineer"] * 210)
+
+EDGE_CASES = [
+    "",
+    "Python developer. " + FILLER,
+    # Non-ASCII: characters whose lowercase changes length or maps to ASCII
+    "İstanbul ROLE at a COMPANY, built tools in Python. " + FILLER,
+    "WORKED AT Acme on a PROKJECT in Zürich.",
+    "Ünïcödé only: señor développeur, naïve café résumé.",
+    # Email: no "@", "@" that is not an email, a real one
+    "Reach me at jane.doe(at)example.com, project lead.",
+    "Follow @jane on social media; experience with Docker.",
+    "jane.doe@example.com — Python, SQL. " + FILLER,
+    # Phone: short digit runs only, three-digit runs that are not phone numbers, real numbers
+    "Call 55-12 or ext 9, worked at Acme 2 yrs.",
+    "Room 123, building 456, 78 desks; created a dashboard.",
+    "Phone: (555) 123-4567, +44 555.123.4567",
+    "Tel 5551234567 developed APIs",
+]
+
+
+@pytest.mark.parametrize("text", EDGE_CASES)
+def test_matches_analyze_quality(text):
+    expected = ResumeParser(text.encode("utf-8"), "resume.txt").analyze_quality()
+    row = score_resumes([text]).iloc[0]
+    assert (row["score"], row["feedback"]) == (expected["score"], expected["feedback"])
+
+
+def test_batch_matches_row_by_row():
+    df = score_resumes(EDGE_CASES)
+    expected = [ResumeParser(text.encode("utf-8"), "resume.txt").analyze_quality() for text in EDGE_CASES]
+    assert df["score"].tolist() == [e["score"] for e in expected]
+    assert df["feedback"].tolist() == [e["feedback"] for e in expected]
@@ -0,0 +1,25 @@
+from db_handler import DBHandler
+from question_retriever import QuestionRetriever
+
+
+def save(db, question, q_type, rating=9):
+    db.save_interaction("s", "Software Engineer", "Medium", question, "answer", "feedback", rating, q_type, "c")
+
+
+def test_only_real_interview_questions_are_served(tmp_path):
+    db = DBHandler(str(tmp_path / "interview.db"))
+    save(db, "Quiz Session", "Quiz")
+    save(db, "Intro", "Interview")
+    save(db, "Two Sum in Python and Rust", "Arena")
+    save(db, "How do you profile a slow Python service?", "Interview")
+    save(db, "Why would you pick Rust over C++ for a parser?", "Technical")
+    save(db, "How would you shard a Python job queue?", "Interview", rating=3)
+
+    retriever = QuestionRetriever(db, min_rating=7, seed=0)
+    served = [q["question"] for q in retriever.retrieve(["python", "rust"], "Medium", count=10)]
+    # No skill overlap falls back to general questions: placeholders must not be among them either
+    served += [q["question"] for q in retriever.retrieve(["cobol"], "Medium", count=10)]
+    db.close()
+
+    assert sorted(set(served)) == ["How do you profile a slow Python service?",
+                                   "Why would you pick Rust over C++ for a parser?"]
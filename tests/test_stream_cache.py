@@ -0,0 +1,57 @@
+import asyncio
+import json
+
+import pytest
+
+from config import Config
+from db_handler import DBHandler
+from llm_handler import AsyncLLMHandler
+from resume_digest import resume_id
+
+RESUME = "Python backend engineer with Docker and AWS."
+HISTORY = [{"question": "Tell me about yourself.", "answer": "I build APIs."}]
+COMPLETE = {"evaluation": {"feedback": "Good.", "rating": 7},
+            "next_question": {"question": "How would you shard a Postgres table?", "type": "Technical"}}
+
+
+@pytest.fixture
+def llm(monkeypatch, tmp_path):
+    """AsyncLLMHandler with continue_interview caching on and `_chat_stream` replaced by canned chunks."""
+    monkeypatch.setattr(Config, "LLM_CACHE_ENABLED", True)
+    monkeypatch.setattr(Config, "LLM_CACHE_DB", str(tmp_path / "llm_cache.db"))
+    monkeypatch.setattr(Config, "LLM_CACHE_TASKS", dict(Config.LLM_CACHE_TASKS, continue_interview=True))
+    monkeypatch.setattr(Config, "LLM_CASSETTE_MODE", "")
+    db = DBHandler(str(tmp_path / "interview.db"))
+    handler = AsyncLLMHandler("mock", db=db)
+
+    def stream(text):
+        async def chat_stream(*args, **kwargs):
+            for i in range(0, len(text), 8):
+                yield text[i:i + 8]
+        monkeypatch.setattr(handler, "_chat_stream", chat_stream)
+    handler.stream = stream
+    yield handler
+    db.close()
+
+
+async def collect(llm):
+    return [field async for field, _ in llm.stream_continue_interview(RESUME, HISTORY, "Token bucket.", "s")]
+
+
+def cached(llm):
+    key = llm._fingerprint(llm._continue_prompt(RESUME, HISTORY, "Token bucket.", "s"), task="continue_interview")
+    return llm.cache.get(key)
+
+
+def test_complete_stream_is_cached_and_recorded(llm):
+    llm.stream(json.dumps(COMPLETE))
+    assert asyncio.run(collect(llm)) == ["evaluation", "next_question"]
+    assert cached(llm) == COMPLETE
+    assert llm.asked.is_duplicate(resume_id(RESUME), COMPLETE["next_question"]["question"])
+
+
+def test_truncated_stream_is_not_cached(llm):
+    text = json.dumps(COMPLETE)
+    llm.stream(text[:text.index('"next_question"') + 30])
+    assert asyncio.run(collect(llm)) == ["evaluation"]
+    assert cached(llm) is None
@@ -0,0 +1,57 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+
+CHUNK_DELAY_S = 0.02
+
+
+@pytest.fixture
+def server(monkeypatch, tmp_path, mock_llm):
+    """backend.server wired to a streaming mock LLM."""
+    monkeypatch.chdir(tmp_path)  # interview.db, if the backend is first imported here
+    server = pytest.importorskip("backend.server")
+    from config import Config
+    from llm_handler import AsyncLLMHandler
+
+    monkeypatch.setattr(Config, "GROQ_BASE_URL", mock_llm(chunk_size=16, chunk_delay_s=CHUNK_DELAY_S))
+    monkeypatch.setattr(Config, "LLM_CASSETTE_MODE", "")
+    monkeypatch.setattr(server, "API_KEY", "mock")
+    monkeypatch.setattr(server, "llm", AsyncLLMHandler("mock", db=server.db))
+    return server
+
+
+def parse_sse(body: str):
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+async def post_stream(app, payload):
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/api/interview/next/stream", json=payload)
+        response.raise_for_status()
+        return response.headers["content-type"], response.text
+
+
+def test_evaluation_arrives_before_done(server):
+    payload = {"resume_text": "Python backend engineer with Docker and AWS.",
+               "history": [{"question": "Tell me about yourself.", "answer": "I build APIs."}],
+               "last_answer": "I would use a token bucket per client.", "session_id": "stream-test"}
+    content_type, body = asyncio.run(post_stream(server.app, payload))
+    events = parse_sse(body)
+    names = [name for name, _ in events]
+
+    assert content_type.startswith("text/event-stream")
+    assert names == ["evaluation", "next_question", "done"]
+    evaluation = dict(events)["evaluation"]
+    assert evaluation["rating"] == 7 and evaluation["feedback"]
+
+    done = dict(events)["done"]
+    assert done["first_field_ms"] is not None
+    assert done["first_field_ms"] < done["total_ms"]
+    # The evaluation is complete several chunks before the end of the completion
+    assert done["total_ms"] - done["first_field_ms"] >= 2 * CHUNK_DELAY_S * 1000
@@ -0,0 +1,28 @@
+import asyncio
+import io
+
+import pytest
+from fastapi import HTTPException, UploadFile
+
+from config import Config
+from uploads import parse_upload, read_upload
+
+
+def upload(data: bytes, size=None) -> UploadFile:
+    return UploadFile(io.BytesIO(data), size=size, filename="resume.txt")
+
+
+def test_read_upload_rejects_oversized_bodies(monkeypatch):
+    monkeypatch.setattr(Config, "MAX_UPLOAD_BYTES", 100)
+    monkeypatch.setattr(Config, "UPLOAD_CHUNK_BYTES", 16)
+    assert asyncio.run(read_upload(upload(b"x" * 100))) == b"x" * 100
+    for file in (upload(b"x" * 101), upload(b"x", size=101)):  # streamed past the limit / declared too large
+        with pytest.raises(HTTPException) as error:
+            asyncio.run(read_upload(file))
+        assert error.value.status_code == 413
+
+
+def test_parse_upload_returns_parser_and_parsed():
+    parser, parsed = parse_upload(b"Python developer. Worked at Acme on a Docker project.", "resume.txt")
+    assert parsed == parser.parse()
+    assert "python" in parsed["skills"]
@@ -0,0 +1,17 @@
+"""
+Helpers for keeping prompt text within a token budget.
+"""
+from typing import Any
+
+# Rough chars-per-token ratio for English prompts; good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def clip(text: Any, limit: int) -> str:
+    """`text` with whitespace collapsed, cut to `limit` characters (ending in "...")."""
+    text = " ".join(str(text or "").split())
+    return text if len(text) <= limit else text[:limit - 3] + "..."
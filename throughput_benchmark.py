@@ -0,0 +1,101 @@
+"""
+Concurrent /api/interview/next throughput against a local mock LLM
+(mock_llm_server), once with the blocking LLMHandler called straight from the
+endpoint (how the backend used it before AsyncLLMHandler) and once with
+AsyncLLMHandler:
+
+    python throughput_benchmark.py --requests 200 --concurrency 32 --latency constant:0.3
+
+Prints requests/s and p50/p95 latency for each handler.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+class BlockingLLM:
+    """The pre-async backend: the sync LLMHandler awaited from the endpoint, blocking the event loop."""
+    def __init__(self, handler):
+        self.handler = handler
+
+    def __getattr__(self, name):
+        return getattr(self.handler, name)
+
+    async def continue_interview(self, *args, **kwargs):
+        return self.handler.continue_interview(*args, **kwargs)
+
+
+async def run_load(app, requests: int, concurrency: int):
+    """Latencies (seconds) of `requests` /next calls issued by `concurrency` clients, and the total wall time."""
+    import httpx
+
+    latencies, pending = [], iter(range(requests))
+
+    async def client(http):
+        for i in pending:
+            # Distinct candidates and answers, so no request is served from another's result
+            body = {"resume_text": f"Candidate {i}: Python backend engineer, 5 years, Docker and AWS.",
+                    "history": [{"question": "Tell me about yourself.", "answer": "I build APIs."}],
+                    "last_answer": f"Answer {i}: I would use a token bucket per client.",
+                    "session_id": f"bench-{i}"}
+            started = time.perf_counter()
+            response = await http.post("/api/interview/next", json=body)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - started)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench",
+                                 timeout=None) as http:
+        started = time.perf_counter()
+        await asyncio.gather(*(client(http) for _ in range(concurrency)))
+        return latencies, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /api/interview/next with the sync and async LLM handlers")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--latency", default="constant:0.3", help="mock LLM time-to-first-token distribution")
+    args = parser.parse_args()
+
+    from mock_llm_server import create_app, parse_latency, serve_in_thread
+
+    os.environ.update({
+        "GROQ_BASE_URL": serve_in_thread(create_app(parse_latency(args.latency)))[0],
+        "GROQ_API_KEY": "mock",
+        "LLM_CACHE_ENABLED": "0",
+        "SPECULATIVE_PREFETCH": "0",
+        "QUIZ_BANK_ENABLED": "0",
+        "LLM_MAX_CONCURRENCY": str(max(args.concurrency, 1)),
+        "LLM_FALLBACK_DEADLINE_S": "600",
+    })
+    sys.path.insert(0, ROOT)
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # interview.db for this run only
+        import backend.server as server
+        from llm_handler import LLMHandler
+
+        async_llm = server.llm
+        handlers = [("sync LLMHandler", BlockingLLM(LLMHandler(server.API_KEY, db=server.db))),
+                    ("AsyncLLMHandler", async_llm)]
+        print(f"{args.requests} requests, {args.concurrency} concurrent, mock LLM latency {args.latency}")
+        results = {}
+        for label, llm in handlers:
+            server.llm = llm
+            latencies, total_s = asyncio.run(run_load(server.app, args.requests, args.concurrency))
+            latencies.sort()
+            results[label] = args.requests / total_s
+            print(f"{label:<16} {results[label]:7.1f} req/s  p50 {statistics.median(latencies) * 1000:7.0f}ms  "
+                  f"p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:7.0f}ms")
+        server.llm = async_llm
+        print(f"speedup: {results['AsyncLLMHandler'] / results['sync LLMHandler']:.1f}x")
+        server.db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+Resume upload handling shared by the FastAPI apps (backend/server.py and
+backend/main.py).
+"""
+from typing import Any, Dict, List, Tuple
+
+from fastapi import HTTPException, UploadFile
+
+from config import Config
+from resume_parser import ResumeParser
+
+
+async def read_upload(file: UploadFile) -> bytes:
+    """Reads the upload body in chunks, rejecting it with 413 once it exceeds MAX_UPLOAD_BYTES."""
+    limit = Config.MAX_UPLOAD_BYTES
+    if file.size is not None and file.size > limit:
+        raise HTTPException(status_code=413, detail=f"File exceeds {limit} bytes")
+    data = bytearray()
+    while chunk := await file.read(Config.UPLOAD_CHUNK_BYTES):
+        data += chunk
+        if len(data) > limit:
+            raise HTTPException(status_code=413, detail=f"File exceeds {limit} bytes")
+    return bytes(data)
+
+
+def parse_upload(data: bytes, filename: str) -> Tuple[ResumeParser, Dict[str, List[str]]]:
+    """(parser, parser.parse()) for an uploaded file; blocking, so async callers run it in a thread."""
+    parser = ResumeParser.load(data, filename)
+    return parser, parser.parse()